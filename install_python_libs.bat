@@ -1,6 +1,7 @@
 py -m pip install pyserial
-py -m pip install pyusb
 py -m pip install matplotlib
 py -m pip install nltk
 py -m pip install numpy
+py -m pip install cryptography
+py -m pip install crc32c
 py -m pip install winregistry==0.8.3
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+
+# TrueRNG Command Line
+# 10/19/2026
+#
+# Requires Python 3.8 (each command needs the packages of the script it runs)
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+#
+# One entry point for the TrueRNG utilities.  Only the standard library is imported
+# here; each command runs its script, which loads pyserial, numpy or matplotlib
+# only when that command needs them.
+#
+# truerng.py COMMAND [OPTIONS ...]
+# Linux example:  python3 truerng.py find
+#                 python3 truerng.py test /dev/ttyACM0
+#                 python3 truerng.py analyze TrueRNGpro_20200614.120000.data
+
+import os
+import runpy
+import sys
+
+# Directory holding the scripts
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Command name: (script, description)
+COMMANDS = {
+    'find': ('truerng_find.py', 'list connected TrueRNG devices'),
+    'mode': ('truerng_mode.py', 'change the mode of a TrueRNGpro / TrueRNGproV2'),
+    'read': ('truerng_read_example.py', 'read random data from a TrueRNG to a file'),
+    'test': ('truerng_test.py', 'test connected TrueRNG devices'),
+    'fulltest': ('truerng_fulltest.py', 'capture a large file and run ent, rngtest and dieharder (Linux)'),
+    'runtests': ('truerng_runtests.py', 'run ent, rngtest and dieharder on a capture file (Linux)'),
+    'analyze': ('truerng_analyze.py', 'analyze a capture file on all CPU cores'),
+    'autocorr': ('truerng_autocorr.py', 'autocorrelation of a capture file'),
+    'password': ('truerng_generate_password.py', 'generate random passwords'),
+    'words': ('truerng_generate_words.py', 'generate random words'),
+    'wordlist': ('truerng_wordlist.py', 'build the wordlist index used by words'),
+    'benchmark': ('truerng_benchmark.py', 'run the performance benchmarks'),
+}
+
+
+def usage():
+    print('usage: truerng.py COMMAND [OPTIONS ...]')
+    print('')
+    print('commands:')
+    for name, (script, description) in COMMANDS.items():
+        print('  ' + name.ljust(10) + ' ' + description)
+    print('')
+    print('truerng.py COMMAND --help shows the options of commands that have them')
+
+
+#########################
+# Function: run_command #
+#########################
+# Runs a command's script as if it had been started directly
+def run_command(name, args):
+    script = os.path.join(SCRIPT_DIR, COMMANDS[name][0])
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    sys.argv = [script] + list(args)
+    runpy.run_path(script, run_name='__main__')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] in ('-h', '--help', 'help'):
+        usage()
+        sys.exit(0)
+    if sys.argv[1] not in COMMANDS:
+        print('Unknown command: ' + sys.argv[1])
+        usage()
+        sys.exit(1)
+    run_command(sys.argv[1], sys.argv[2:])
@@ -0,0 +1,605 @@
+#!/usr/bin/python3
+
+# TrueRNG Parallel Capture Analysis
+# 10/19/2026
+#
+# Requires Python 3.8, numpy
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Numpy package with:   python -m pip install numpy
+#
+# Analyzes a capture file (like the ones written by truerng_fulltest.py, or the
+# payload of a truerng_container.py container) using every core in the machine.
+# The file is split into slices which are memory mapped by worker processes, so
+# files larger than RAM are fine.  Each statistic is a "kernel" which produces a
+# partial result per slice and the partial results are merged exactly, so the
+# numbers match a single pass over the whole file.
+#
+# truerng_analyze.py FILENAME [-k histogram,entropy,pi,serial,fips] [-j WORKERS]
+# Linux example:  python3 truerng_analyze.py TrueRNGpro_20200614.120000.data -j 32
+
+import argparse
+import math
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+import truerng_container
+
+# Default size of the slice handed to each worker (rounded to the record alignment)
+SLICE_SIZE = 64*1024*1024
+
+# Size of the pieces a worker feeds to the kernels (keeps temporaries small)
+CHUNK_SIZE = 4*1024*1024
+
+# Kernels run when none are given on the command line
+DEFAULT_KERNELS = 'histogram,entropy,pi,serial,fips,ngram2'
+
+# Jobs per worker process (consecutive slices are grouped into jobs so large
+# partial results like the 3-gram counters are only sent back once per job)
+JOBS_PER_WORKER = 4
+
+
+##########################
+# Chi-square probability #
+##########################
+# Upper tail probability of the chi-square distribution.  Uses the Wilson-Hilferty
+# cube root transform which is very accurate for the large degrees of freedom
+# used here (255 and up).
+def chisquare_pvalue(chisq, df):
+    if df <= 0:
+        return 1.0
+    z = ((chisq / df) ** (1.0/3.0) - (1.0 - 2.0/(9.0*df))) / math.sqrt(2.0/(9.0*df))
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+# Chi-square test of counts against a uniform distribution.  When the expected
+# count per bin is small (3-grams of a short capture) the statistic is no longer
+# chi-square distributed, but for a uniform multinomial it has mean k-1 and
+# variance 2(k-1)(1-1/N) exactly, which is close to normal for many bins.
+def uniform_chisquare(counts):
+    n = float(counts.sum(dtype=np.int64))
+    k = len(counts)
+    if n == 0:
+        return 0.0, 1.0
+    expected = n / k
+    chisq = float(((counts - expected)**2).sum() / expected)
+    if expected >= 5.0:
+        return chisq, chisquare_pvalue(chisq, k - 1)
+    z = (chisq - (k - 1)) / math.sqrt(2.0 * (k - 1) * (1.0 - 1.0 / n))
+    return chisq, 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+###########
+# Kernels #
+###########
+# A kernel processes whole records of "block" bytes.  Slices handed to a kernel are
+# always a multiple of the alignment of every kernel except at the end of the file.
+# "overlap" is how many bytes past the end of a slice the kernel needs to see to
+# handle windows that span two slices (the next slice never counts those windows).
+#
+#   new()                          -> empty partial result
+#   update(state, data, lookahead) -> add a numpy uint8 array to the partial result
+#   merge(a, b)                    -> combine partial results (a comes before b)
+#   result(state)                  -> dictionary of final values
+
+class HistogramKernel:
+    name = 'histogram'
+    block = 1
+    overlap = 0
+
+    def new(self):
+        return np.zeros(256, dtype=np.int64)
+
+    def update(self, state, data, lookahead):
+        state += np.bincount(data, minlength=256)
+        return state
+
+    def merge(self, a, b):
+        return a + b
+
+    def result(self, state):
+        n = int(state.sum())
+        expected = n / 256.0
+        chisq = float(((state - expected)**2).sum() / expected) if n else 0.0
+        mean = float((state * np.arange(256)).sum() / n) if n else 0.0
+        return {'bytes': n, 'mean': mean, 'chisquare': chisq,
+                'chisquare_p': chisquare_pvalue(chisq, 255), 'counts': state.tolist()}
+
+
+class EntropyKernel(HistogramKernel):
+    name = 'entropy'
+
+    def result(self, state):
+        n = int(state.sum())
+        p = state[state > 0] / float(n) if n else np.zeros(0)
+        ent = float(-(p * np.log2(p)).sum())
+        return {'bytes': n, 'entropy': ent, 'compression': 100.0 * (8.0 - ent) / 8.0}
+
+
+# Monte Carlo estimate of pi exactly like ent: 6 bytes per point, 24 bit big endian
+# X and Y, inside if X^2 + Y^2 <= (2^24 - 1)^2
+class PiKernel:
+    name = 'pi'
+    block = 6
+    overlap = 0
+
+    def new(self):
+        return [0, 0]
+
+    def update(self, state, data, lookahead):
+        points = data[:len(data) - len(data) % 6].reshape(-1, 6).astype(np.int64)
+        x = (points[:, 0] << 16) | (points[:, 1] << 8) | points[:, 2]
+        y = (points[:, 3] << 16) | (points[:, 4] << 8) | points[:, 5]
+        state[0] += int(np.count_nonzero(x*x + y*y <= (2**24 - 1)**2))
+        state[1] += len(points)
+        return state
+
+    def merge(self, a, b):
+        return [a[0] + b[0], a[1] + b[1]]
+
+    def result(self, state):
+        inside, total = state
+        calcpi = 4.0 * inside / total if total else 0.0
+        return {'points': total, 'pi': calcpi,
+                'error_percent': 100.0 * math.fabs(calcpi - math.pi) / math.pi}
+
+
+# Serial correlation coefficient exactly like ent (circular, the last byte is
+# paired with the first).  Each slice pairs its last byte with the first byte of
+# the next slice using one byte of lookahead.
+class SerialKernel:
+    name = 'serial'
+    block = 1
+    overlap = 1
+
+    def new(self):
+        # n, sum(x), sum(x^2), sum(x[i]*x[i+1]), first byte, last byte
+        return [0, 0, 0, 0, None, None]
+
+    def update(self, state, data, lookahead):
+        if len(data) == 0:
+            return state
+        u = data.astype(np.int64)
+        state[0] += len(u)
+        state[1] += int(u.sum())
+        state[2] += int((u*u).sum())
+        state[3] += int((u[:-1]*u[1:]).sum())
+        if len(lookahead):
+            state[3] += int(u[-1]) * int(lookahead[0])
+        if state[4] is None:
+            state[4] = int(u[0])
+        state[5] = int(u[-1])
+        return state
+
+    def merge(self, a, b):
+        if a[4] is None:
+            return b
+        if b[4] is None:
+            return a
+        return [a[0] + b[0], a[1] + b[1], a[2] + b[2], a[3] + b[3], a[4], b[5]]
+
+    def result(self, state):
+        n, t1, t2, t3, first, last = state
+        if n < 2:
+            return {'serial_correlation': 0.0}
+        # The pair wrapping around from the last byte to the first
+        t3 += first * last
+        denom = n*t2 - t1*t1
+        scc = (n*t3 - t1*t1) / denom if denom else -100000.0
+        return {'serial_correlation': scc}
+
+
+# FIPS 140-2 tests on 20000 bit blocks, the same tests rngtest runs.  Blocks start at
+# byte 0 of the file (rngtest first consumes 32 bits) so counts can differ slightly.
+# The bit tests work on 64 bit words (313 per block, most significant bit first,
+# the last word padded with zeros).
+FIPS_BLOCK = 2500
+FIPS_WORDS = 313
+FIPS_RUNS = ((2315, 2685), (1114, 1386), (527, 723), (240, 384), (103, 209), (103, 209))
+
+# Bits per value for popcount on numpy versions without bitwise_count
+POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+# Number of set bits in each row of an (n, words) uint64 array
+def popcount_rows(w):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(w).sum(axis=1, dtype=np.int64)
+    return POPCOUNT_TABLE[w.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+# Each bit replaced by the bit k positions later in the block (zeros past the end)
+def later_bits(w, k):
+    following = np.zeros_like(w)
+    following[:, :-1] = w[:, 1:]
+    return (w << np.uint64(k)) | (following >> np.uint64(64 - k))
+
+
+# Each bit replaced by the bit before it in the block (zero before the start)
+def earlier_bit(w):
+    preceding = np.zeros_like(w)
+    preceding[:, 1:] = w[:, :-1]
+    return (w >> np.uint64(1)) | ((preceding & np.uint64(1)) << np.uint64(63))
+
+
+# Count runs of 1 bits of length 1-5 and 6+ per block and flag runs of 26 or more
+def count_runs(w):
+    run = w & ~earlier_bit(w)
+    counts = [popcount_rows(run)]
+    for length in range(1, 7):
+        run = run & later_bits(w, length)
+        counts.append(popcount_rows(run))
+    # runs of at least L minus runs of at least L+1 gives runs of exactly L
+    exact = [counts[i] - counts[i+1] for i in range(5)] + [counts[5]]
+
+    # Windows of 26 ones built by doubling
+    w2 = w & later_bits(w, 1)
+    w4 = w2 & later_bits(w2, 2)
+    w8 = w4 & later_bits(w4, 4)
+    w16 = w8 & later_bits(w8, 8)
+    w26 = w16 & later_bits(w8, 16) & later_bits(w2, 24)
+    return np.stack(exact, axis=1), w26.any(axis=1)
+
+
+class FipsKernel:
+    name = 'fips'
+    block = FIPS_BLOCK
+    overlap = 4
+
+    def new(self):
+        # blocks, monobit, poker, runs, long run, continuous run failures
+        return np.zeros(6, dtype=np.int64)
+
+    def update(self, state, data, lookahead):
+        nblocks = len(data) // FIPS_BLOCK
+        if nblocks == 0:
+            return state
+        blocks = data[:nblocks*FIPS_BLOCK].reshape(nblocks, FIPS_BLOCK)
+        padded = np.zeros((nblocks, FIPS_WORDS*8), dtype=np.uint8)
+        padded[:, :FIPS_BLOCK] = blocks
+        w = padded.view('>u8').astype(np.uint64)
+        valid = np.full(FIPS_WORDS, 0xFFFFFFFFFFFFFFFF, dtype=np.uint64)
+        valid[-1] = 0xFFFFFFFF00000000
+
+        # Monobit
+        ones = popcount_rows(w)
+        monobit = (ones <= 9725) | (ones >= 10275)
+
+        # Poker (4 bit nibbles)
+        nibbles = np.stack((blocks >> 4, blocks & 15), axis=2).reshape(nblocks, -1)
+        index = np.arange(nblocks)[:, None] * 16 + nibbles
+        f = np.bincount(index.ravel(), minlength=nblocks*16).reshape(nblocks, 16)
+        poker = 16.0/5000.0 * (f.astype(np.float64)**2).sum(axis=1) - 5000.0
+        poker = (poker <= 2.16) | (poker >= 46.17)
+
+        # Runs and long run, for ones and then zeros
+        ones_runs, ones_long = count_runs(w)
+        zeros_runs, zeros_long = count_runs(~w & valid)
+        low = np.array([r[0] for r in FIPS_RUNS])
+        high = np.array([r[1] for r in FIPS_RUNS])
+        runs = ((ones_runs < low) | (ones_runs > high) |
+                (zeros_runs < low) | (zeros_runs > high)).any(axis=1)
+        longrun = ones_long | zeros_long
+
+        # Continuous run (consecutive 32 bit words equal), the last word of the
+        # data is compared to the first word of the lookahead
+        flat = blocks.reshape(-1).view('>u4')
+        continuous = int(np.count_nonzero(flat[1:] == flat[:-1]))
+        if len(data) == nblocks*FIPS_BLOCK and len(lookahead) >= 4:
+            if lookahead[:4].view('>u4')[0] == flat[-1]:
+                continuous += 1
+
+        state += [nblocks, monobit.sum(), poker.sum(), runs.sum(), longrun.sum(), continuous]
+        return state
+
+    def merge(self, a, b):
+        return a + b
+
+    def result(self, state):
+        names = ('blocks', 'monobit', 'poker', 'runs', 'long_run', 'continuous_run')
+        return dict(zip(names, (int(v) for v in state)))
+
+
+# Distribution of non-overlapping n-grams (n consecutive bytes) so bytes that are
+# correlated with their neighbours show up even if the single byte histogram is
+# flat.  The 2-gram counters are uint64; the 3-gram table has 16M bins, so its
+# counters are uint32 (64 MiB) and an update or merge that would take a bin past
+# 2^32 - 1 raises OverflowError instead of wrapping around.
+class NGramKernel:
+    name = 'ngram'
+    n = 2
+    block = 2
+    overlap = 0
+    dtype = np.uint64
+
+    def new(self):
+        return np.zeros(256**self.n, dtype=self.dtype)
+
+    def check(self, state, counts):
+        if self.dtype == np.uint32 and int(state.max()) + int(counts.max()) > np.iinfo(np.uint32).max:
+            raise OverflowError(str(self.n) + '-gram counts would pass 2^32 - 1 (analyze less data at a time)')
+
+    def update(self, state, data, lookahead):
+        m = len(data) // self.n
+        if m == 0:
+            return state
+        grams = data[:m*self.n].reshape(m, self.n)
+        index = grams[:, 0].astype(np.int32)
+        for i in range(1, self.n):
+            index = (index << 8) | grams[:, i]
+        counts = np.bincount(index, minlength=len(state))
+        self.check(state, counts)
+        state += counts.astype(self.dtype)
+        return state
+
+    def merge(self, a, b):
+        self.check(a, b)
+        a += b
+        return a
+
+    def result(self, state):
+        chisq, p = uniform_chisquare(state)
+        return {'ngrams': int(state.sum(dtype=np.int64)), 'bins': len(state),
+                'chisquare': chisq, 'chisquare_p': p}
+
+
+class BigramKernel(NGramKernel):
+    name = 'ngram2'
+    n = 2
+    block = 2
+
+
+class TrigramKernel(NGramKernel):
+    name = 'ngram3'
+    n = 3
+    block = 3
+    dtype = np.uint32
+
+
+# Available kernels by name
+KERNELS = {k.name: k for k in (HistogramKernel, EntropyKernel, PiKernel, SerialKernel, FipsKernel,
+                               BigramKernel, TrigramKernel)}
+
+
+def get_kernels(names):
+    if isinstance(names, str):
+        names = [n.strip() for n in names.split(',') if n.strip()]
+    kernels = []
+    for name in names:
+        if name not in KERNELS:
+            raise ValueError('Unknown kernel: ' + name)
+        kernels.append(KERNELS[name]())
+    return kernels
+
+
+# Slices must be a multiple of every kernel's record size
+def alignment(kernels):
+    align = 1
+    for k in kernels:
+        align = align * k.block // math.gcd(align, k.block)
+    return align
+
+
+##################
+# Capture access #
+##################
+# Memory maps part of a raw capture file (or the size bytes at offset in a file,
+# like the payload of a truerng_container.py container).  view() returns a zero
+# copy numpy array.
+class RawCapture:
+    def __init__(self, path, offset=0, size=None):
+        self.path = path
+        self.fp = open(path, 'rb')
+        self.offset = offset
+        self.size = size if size is not None else os.fstat(self.fp.fileno()).st_size - offset
+        self.map = None
+        self.base = 0
+
+    def map_range(self, start, end):
+        self.unmap()
+        end = min(end, self.size)
+        if end <= start:
+            return
+        start += self.offset
+        end += self.offset
+        # mmap offsets must be a multiple of the allocation granularity
+        self.base = start - start % mmap.ALLOCATIONGRANULARITY
+        self.map = mmap.mmap(self.fp.fileno(), end - self.base,
+                             access=mmap.ACCESS_READ, offset=self.base)
+        if hasattr(self.map, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self.map.madvise(mmap.MADV_SEQUENTIAL)
+
+    def view(self, start, end):
+        end = min(end, self.size)
+        if end <= start:
+            return np.zeros(0, dtype=np.uint8)
+        return np.frombuffer(self.map, dtype=np.uint8, count=end - start, offset=self.offset + start - self.base)
+
+    def unmap(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    def close(self):
+        self.unmap()
+        self.fp.close()
+
+
+# Same interface for bytes already in memory
+class BufferCapture:
+    def __init__(self, data):
+        self.data = np.frombuffer(data, dtype=np.uint8)
+        self.size = len(self.data)
+
+    def map_range(self, start, end):
+        pass
+
+    def view(self, start, end):
+        return self.data[start:min(end, self.size)]
+
+    def unmap(self):
+        pass
+
+    def close(self):
+        pass
+
+
+# Containers (truerng_container.py) are mapped at their payload
+def open_capture(path):
+    if truerng_container.is_container(path):
+        return RawCapture(path, *truerng_container.payload_range(path))
+    return RawCapture(path)
+
+
+####################
+# Slice processing #
+####################
+# Runs the kernels over [start, end) of an open capture, CHUNK_SIZE at a time
+def run_kernels(kernels, capture, start, end, states=None):
+    if states is None:
+        states = [k.new() for k in kernels]
+    overlap = max([k.overlap for k in kernels] + [0])
+    chunk = max(CHUNK_SIZE // alignment(kernels), 1) * alignment(kernels)
+    capture.map_range(start, end + overlap)
+    for a in range(start, end, chunk):
+        b = min(a + chunk, end)
+        data = capture.view(a, b)
+        for i, k in enumerate(kernels):
+            states[i] = k.update(states[i], data, capture.view(b, b + k.overlap))
+    # The views must be released before the mapping can be closed
+    data = None
+    capture.unmap()
+    return states
+
+
+# Worker process entry point (kernels are pickled so they can carry parameters).
+# A job is a list of consecutive slices.
+def _analyze_slices(args):
+    path, kernels, slices = args
+    capture = open_capture(path)
+    try:
+        states = [k.new() for k in kernels]
+        for start, end in slices:
+            states = run_kernels(kernels, capture, start, end, states)
+        return states
+    finally:
+        capture.close()
+
+
+def make_slices(size, kernels, slice_size=SLICE_SIZE):
+    align = alignment(kernels)
+    slice_size = max(slice_size // align, 1) * align
+    return [(s, min(s + slice_size, size)) for s in range(0, size, slice_size)]
+
+
+##########################
+# Function: analyze_file #
+##########################
+# Analyzes a capture with a pool of worker processes and returns a dictionary of
+# results keyed by kernel name.
+def analyze_file(path, kernels=DEFAULT_KERNELS, workers=None, slice_size=SLICE_SIZE):
+    kernels = get_kernels(kernels) if not isinstance(kernels, list) else kernels
+    capture = open_capture(path)
+    size = capture.size
+    capture.close()
+
+    slices = make_slices(size, kernels, slice_size)
+    workers = workers or os.cpu_count() or 1
+    per_job = max(1, -(-len(slices) // (workers * JOBS_PER_WORKER)))
+    jobs = [(path, kernels, slices[i:i + per_job]) for i in range(0, len(slices), per_job)]
+
+    states = [k.new() for k in kernels]
+    if workers == 1 or len(jobs) <= 1:
+        partials = map(_analyze_slices, jobs)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(min(workers, len(jobs)))
+        partials = pool.imap(_analyze_slices, jobs)
+
+    # imap returns partial results in file order, which serial correlation needs
+    try:
+        for partial in partials:
+            states = [k.merge(s, p) for k, s, p in zip(kernels, states, partial)]
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return {k.name: k.result(s) for k, s in zip(kernels, states)}
+
+
+# Analyzes bytes already in memory (single process)
+def analyze_buffer(data, kernels=DEFAULT_KERNELS):
+    kernels = get_kernels(kernels) if not isinstance(kernels, list) else kernels
+    capture = BufferCapture(data)
+    states = run_kernels(kernels, capture, 0, capture.size)
+    return {k.name: k.result(s) for k, s in zip(kernels, states)}
+
+
+def print_results(results):
+    if 'entropy' in results:
+        r = results['entropy']
+        print('Entropy = ' + '{:1.6f}'.format(r['entropy']) + ' bits per byte.')
+        print('Optimum compression would reduce the size of this ' + str(r['bytes']) +
+              ' byte file by ' + '{:1.0f}'.format(r['compression']) + ' percent.')
+    if 'histogram' in results:
+        r = results['histogram']
+        print('Chi square distribution for ' + str(r['bytes']) + ' samples is ' +
+              '{:1.2f}'.format(r['chisquare']) + ', and randomly would exceed this value ' +
+              '{:1.2f}'.format(r['chisquare_p']*100) + ' percent of the times.')
+        print('Arithmetic mean value of data bytes is ' + '{:1.4f}'.format(r['mean']) +
+              ' (127.5 = random).')
+    if 'pi' in results:
+        r = results['pi']
+        print('Monte Carlo value for Pi is ' + '{:1.9f}'.format(r['pi']) +
+              ' (error ' + '{:1.2f}'.format(r['error_percent']) + ' percent).')
+    if 'serial' in results:
+        print('Serial correlation coefficient is ' +
+              '{:1.6f}'.format(results['serial']['serial_correlation']) + ' (totally uncorrelated = 0.0).')
+    for name in ('ngram2', 'ngram3'):
+        if name in results:
+            r = results[name]
+            print(name[-1] + '-gram chi square for ' + str(r['ngrams']) + ' samples in ' + str(r['bins']) +
+                  ' bins is ' + '{:1.2f}'.format(r['chisquare']) + ', and randomly would exceed this value ' +
+                  '{:1.2f}'.format(r['chisquare_p']*100) + ' percent of the times.')
+    if 'fips' in results:
+        r = results['fips']
+        print('FIPS 140-2 blocks tested: ' + str(r['blocks']))
+        for name in ('monobit', 'poker', 'runs', 'long_run', 'continuous_run'):
+            print('    ' + name + ' failures: ' + str(r[name]))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Parallel analysis of TrueRNG capture files')
+    parser.add_argument('filename')
+    parser.add_argument('-k', '--kernels', default=DEFAULT_KERNELS,
+                        help='comma separated list from: ' + ','.join(KERNELS))
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='worker processes (default: one per core)')
+    parser.add_argument('--slice-mib', type=int, default=SLICE_SIZE // (1024*1024),
+                        help='slice size handed to each worker in MiB')
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.filename):
+        print(args.filename + ' Not Found')
+        sys.exit(1)
+
+    before = time.perf_counter()
+    results = analyze_file(args.filename, args.kernels, args.workers, args.slice_mib*1024*1024)
+    after = time.perf_counter()
+
+    print('==================================================')
+    print('TrueRNG Analysis of ' + args.filename)
+    print('==================================================')
+    print_results(results)
+    print('==================================================')
+    capture = open_capture(args.filename)
+    size = capture.size
+    capture.close()
+    print('Analyzed ' + '{:2.2f}'.format(size/1024/1024) + ' MiB in ' + '{:2.2f}'.format(after-before) +
+          ' seconds (' + '{:2.1f}'.format(size/1024/1024/max(after-before, 1e-9)) + ' MiB/s)')
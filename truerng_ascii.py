@@ -0,0 +1,206 @@
+#!/usr/bin/python3
+
+# TrueRNG ASCII Mode Capture
+# 10/19/2026
+#
+# Requires Python 3.8, pyserial, numpy
+#
+# On Linux - may need to be root or set /dev/tty port permissions to 666
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Pyserial package with:   python -m pip install pyserial
+# Install Numpy package with:   python -m pip install numpy
+#
+# MODE_NORMAL_ASC and MODE_NORMAL_ASC_SLOW (TrueRNGproV2 only) send the normal
+# output as hex text, for hosts where binary ttys are a problem.  This captures in
+# those modes and turns the text back into bytes.  Decoding is a table lookup over
+# the whole read buffer with numpy: every byte maps to its hex digit value, to
+# "line" (line endings), "skip" (spaces and other separators) or to "invalid"; the
+# digits are paired into bytes and an odd digit left at the end of a read is carried
+# into the next one, so records split across reads decode correctly.
+#
+# Line noise must not shift the pairing for the rest of the capture.  An invalid
+# character is taken as a garbled digit: it keeps its place in the pairing and the
+# byte it belongs to is dropped.  A lost (or extra) character can only shift the
+# pairing until the next line ending, where pairing starts again and an odd digit
+# left over is dropped.  Dropped digits are counted.
+#
+# --compare also captures the same number of bytes in MODE_NORMAL and prints both
+# binary throughputs.
+#
+# truerng_ascii.py [PORT] [--slow] [--bytes N] [--out FILE] [--compare]
+# Linux example:  python3 truerng_ascii.py /dev/ttyACM0 --bytes 1048576 --compare
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+import truerng_device
+
+# Lookup values that aren't hex digits
+SKIP = 16
+INVALID = 17
+LINE = 18
+
+# Byte -> digit value, SKIP, INVALID or LINE
+HEX_TABLE = np.full(256, INVALID, dtype=np.uint8)
+for _i, _c in enumerate(b'0123456789ABCDEF'):
+    HEX_TABLE[_c] = _i
+for _i, _c in enumerate(b'abcdef'):
+    HEX_TABLE[_c] = 10 + _i
+for _c in b' \t,:;-':
+    HEX_TABLE[_c] = SKIP
+for _c in b'\r\n':
+    HEX_TABLE[_c] = LINE
+
+# Bytes read at a time
+READ_SIZE = 65536
+
+
+#####################
+# Class: HexDecoder #
+#####################
+# Streaming hex text to bytes.  feed() returns the bytes completed by a block of
+# text; counters say how much text went in, how much came out, how many bytes were
+# neither hex digits nor separators (line noise) and how many digits were dropped
+# (partners of invalid characters and odd digits at line endings).
+class HexDecoder:
+    def __init__(self):
+        self.carry = None
+        self.text_bytes = 0
+        self.binary_bytes = 0
+        self.invalid = 0
+        self.dropped = 0
+
+    def feed(self, data):
+        values = HEX_TABLE[np.frombuffer(data, dtype=np.uint8)]
+        self.text_bytes += len(values)
+        digits = values[values < SKIP]
+        marked = self.carry == INVALID
+        if len(digits) != len(values):
+            self.invalid += int(np.count_nonzero(values == INVALID))
+            # Invalid characters and line endings take part in the pairing
+            places = values[values != SKIP]
+            if len(places) != len(digits):
+                digits = places
+                marked = True
+        if self.carry is not None:
+            digits = np.concatenate((np.array([self.carry], dtype=np.uint8), digits))
+            self.carry = None
+
+        if not marked:
+            # Only digits (the usual case)
+            if len(digits) % 2:
+                self.carry = int(digits[-1])
+                digits = digits[:-1]
+            out = ((digits[0::2] << 4) | digits[1::2]).tobytes()
+            self.binary_bytes += len(out)
+            return out
+
+        # Pairing starts again after every line ending: a place is the first of a
+        # pair when it is an even number of places after the last line ending
+        index = np.arange(len(digits))
+        line = digits == LINE
+        last_line = np.maximum.accumulate(np.where(line, index, -1))
+        first = np.flatnonzero(~line & ((index - last_line - 1) % 2 == 0))
+        if len(first) and first[-1] == len(digits) - 1:
+            self.carry = int(digits[-1])
+            first = first[:-1]
+        paired = ~line[first + 1]
+        self.dropped += int(np.count_nonzero(~paired & (digits[first] != INVALID)))
+        first = first[paired]
+        high = digits[first]
+        low = digits[first + 1]
+        valid = (high < SKIP) & (low < SKIP)
+        self.dropped += int(np.count_nonzero(high[~valid] < SKIP)) + int(np.count_nonzero(low[~valid] < SKIP))
+        out = ((high[valid] << 4) | low[valid]).tobytes()
+        self.binary_bytes += len(out)
+        return out
+
+
+################################
+# Function: capture_ascii_mode #
+################################
+# Reads nbytes decoded bytes in MODE_NORMAL_ASC (or MODE_NORMAL_ASC_SLOW) and
+# returns (data, seconds, decoder)
+def capture_ascii_mode(port, nbytes, slow=False, timeout=10):
+    ser = truerng_device.open_port(port, timeout, 'MODE_NORMAL_ASC_SLOW' if slow else 'MODE_NORMAL_ASC')
+    decoder = HexDecoder()
+    chunks = []
+    total = 0
+    before = time.perf_counter()
+    while total < nbytes:
+        # Two characters per byte (separators make it a little more)
+        text = ser.read(min(READ_SIZE, 2 * (nbytes - total) - (decoder.carry is not None)))
+        if not text:
+            break
+        out = decoder.feed(text)
+        chunks.append(out)
+        total += len(out)
+    elapsed = time.perf_counter() - before
+    ser.close()
+    return b''.join(chunks)[:nbytes], elapsed, decoder
+
+
+#################################
+# Function: capture_normal_mode #
+#################################
+# Reads nbytes in MODE_NORMAL for comparison and returns (data, seconds)
+def capture_normal_mode(port, nbytes, timeout=10):
+    ser = truerng_device.open_port(port, timeout, 'MODE_NORMAL')
+    before = time.perf_counter()
+    data = ser.read(nbytes)
+    elapsed = time.perf_counter() - before
+    ser.close()
+    return data, elapsed
+
+
+def rate_string(nbytes, seconds):
+    return '{:2.3f}'.format(nbytes * 8 / seconds / 1e6 if seconds else 0.0) + ' Mbits/s'
+
+
+if __name__ == '__main__':
+    from serial.tools import list_ports
+
+    parser = argparse.ArgumentParser(description='Capture a TrueRNGproV2 in MODE_NORMAL_ASC and decode it')
+    parser.add_argument('port', nargs='?', default=None, help='com port to read (default first TrueRNGproV2 found)')
+    parser.add_argument('--slow', action='store_true', help='use MODE_NORMAL_ASC_SLOW')
+    parser.add_argument('--bytes', type=int, default=1048576, help='decoded bytes to capture')
+    parser.add_argument('--out', default='random.bin', help='decoded output file')
+    parser.add_argument('--compare', action='store_true', help='also capture --bytes in MODE_NORMAL')
+    args = parser.parse_args()
+
+    port = args.port
+    if port is None:
+        for temp in list_ports.comports():
+            if '04D8:EBB5' in temp[2]:
+                port = temp[0]
+                break
+    if port is None:
+        print('No TrueRNGproV2 detected (the ASCII modes are TrueRNGproV2 only)')
+        sys.exit(1)
+
+    mode = 'MODE_NORMAL_ASC_SLOW' if args.slow else 'MODE_NORMAL_ASC'
+    print('==================================================')
+    print('Capturing ' + str(args.bytes) + ' bytes in ' + mode + ' on ' + port)
+    print('==================================================')
+    data, elapsed, decoder = capture_ascii_mode(port, args.bytes, args.slow)
+    with open(args.out, 'wb') as fp:
+        fp.write(data)
+    print(mode.ljust(21) + ': ' + str(len(data)) + ' bytes (' + str(decoder.text_bytes) + ' characters, ' +
+          str(decoder.invalid) + ' invalid, ' + str(decoder.dropped) + ' digits dropped) at ' +
+          rate_string(len(data), elapsed))
+    if decoder.invalid or decoder.dropped:
+        print('*** FAILED *** ' + str(decoder.invalid) + ' characters were not hex digits or separators, ' +
+              str(decoder.dropped) + ' digits could not be paired')
+    if args.compare:
+        normal, normal_elapsed = capture_normal_mode(port, args.bytes)
+        print('MODE_NORMAL'.ljust(21) + ': ' + str(len(normal)) + ' bytes at ' +
+              rate_string(len(normal), normal_elapsed))
+        if normal_elapsed and elapsed and len(data):
+            print('ASCII mode gives ' + '{:2.1f}'.format(100.0 * (len(data) / elapsed) /
+                                                        (len(normal) / normal_elapsed)) +
+                  '% of the MODE_NORMAL binary throughput')
+    print('Decoded data written to ' + args.out)
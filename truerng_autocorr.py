@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+
+# TrueRNG Autocorrelation Analysis
+# 10/19/2026
+#
+# Requires Python 3.8, numpy
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Numpy package with:   python -m pip install numpy
+#
+# ent only reports the lag 1 serial correlation.  Periodic artifacts (USB frame timing,
+# the Mersenne Twister stage in MODE_NORMAL) show up at larger lags, so this computes
+# the bit level and byte level autocorrelation for lags 1..N over a whole capture.
+# Each chunk is correlated with itself plus the next N samples using the FFT
+# (overlap-add), so the cost is O(n log n) instead of O(n*N).  Runs on all cores
+# using the truerng_analyze.py engine.
+#
+# truerng_autocorr.py FILENAME [--lags N] [--level bits|bytes|both] [--alpha 0.01]
+# Linux example:  python3 truerng_autocorr.py TrueRNGpro_20200614.120000.data --lags 8192
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+import truerng_analyze
+
+# Default number of lags
+DEFAULT_LAGS = 4096
+
+# Default significance level for the whole set of lags (Bonferroni corrected)
+DEFAULT_ALPHA = 0.01
+
+# Number of 1 bits in each byte value
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+#################################
+# Kernel: AutocorrelationKernel #
+#################################
+# Sums of x[i]*x[i+k] for k = 0..lags.  Bits are mapped to -1/+1 (most significant
+# bit first), bytes are used as 0..255 and the mean is removed at the end using the
+# first and last "lags" samples, so the result is exact and non-circular.
+class AutocorrelationKernel:
+    block = 1
+
+    def __init__(self, lags=DEFAULT_LAGS, level='bytes'):
+        self.lags = lags
+        self.level = level
+        self.name = 'autocorr_' + level
+        # Lookahead needed to pair the last samples of a slice with the next slice
+        self.overlap = (lags + 7) // 8 if level == 'bits' else lags
+        # FFT size and the number of new samples correlated per FFT
+        self.size = 1 << max(17, (9 * lags).bit_length())
+        self.step = self.size - lags
+
+    def samples(self, data):
+        if self.level == 'bits':
+            return np.unpackbits(data).astype(np.int8) * 2 - 1
+        return data
+
+    # Samples start..end of data followed by lookahead as float64.  Only the bytes
+    # under that range are unpacked, so a bit level slice never exists as 8 floats per
+    # byte and memory per worker stays close to the byte level figure.
+    def window(self, data, lookahead, start, end):
+        per = 8 if self.level == 'bits' else 1
+        first = start // per
+        last = -(-end // per)
+        raw = data[first:last]
+        if last > len(data):
+            raw = np.concatenate((raw, lookahead[:last - len(data)]))
+        return self.samples(raw)[start - first * per:end - first * per].astype(np.float64)
+
+    def new(self):
+        # n, sum(x), sums for each lag, first samples, last samples
+        return [0, 0, np.zeros(self.lags + 1, dtype=np.int64),
+                np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)]
+
+    def update(self, state, data, lookahead):
+        per = 8 if self.level == 'bits' else 1
+        n = len(data) * per
+        if n == 0:
+            return state
+
+        for a in range(0, n, self.step):
+            b = min(a + self.step, n)
+            segment = self.window(data, lookahead, a, b + self.lags)
+            fa = np.fft.rfft(segment[:b - a], self.size)
+            fb = np.fft.rfft(segment, self.size)
+            c = np.fft.irfft(np.conj(fa) * fb, self.size)[:self.lags + 1]
+            state[2] += np.rint(c).astype(np.int64)
+
+        # Sum of the samples (+1 / -1 per bit) and the first and last lags of them
+        if self.level == 'bits':
+            total = 2 * int(POPCOUNT[data].sum(dtype=np.int64)) - n
+        else:
+            total = int(data.sum(dtype=np.int64))
+        edge = -(-self.lags // per)
+        state[0] += n
+        state[1] += total
+        state[3] = np.concatenate((state[3], self.samples(data[:edge]).astype(np.int64)))[:self.lags]
+        state[4] = np.concatenate((state[4], self.samples(data[-edge:]).astype(np.int64)))[-self.lags:]
+        return state
+
+    def merge(self, a, b):
+        return [a[0] + b[0], a[1] + b[1], a[2] + b[2],
+                np.concatenate((a[3], b[3]))[:self.lags],
+                np.concatenate((a[4], b[4]))[-self.lags:]]
+
+    def result(self, state):
+        n, total, sums, first, last = state
+        lags = min(self.lags, n - 1)
+        if lags < 1:
+            return {'samples': n, 'lags': 0, 'r': [], 'z': []}
+        mean = total / n
+        k = np.arange(lags + 1)
+        # sum of x[0..n-k-1] and of x[k..n-1]
+        head = total - np.concatenate(([0], np.cumsum(last[::-1])))[:lags + 1]
+        tail = total - np.concatenate(([0], np.cumsum(first)))[:lags + 1]
+        cov = sums[:lags + 1] - mean * (head + tail) + (n - k) * mean * mean
+        r = (cov / (n - k)) / (cov[0] / n) if cov[0] else np.zeros(lags + 1)
+        # Under the null hypothesis r[k] is approximately normal with variance 1/n
+        z = r * math.sqrt(n)
+        return {'samples': n, 'lags': lags, 'r': r[1:].tolist(), 'z': z[1:].tolist()}
+
+
+##############################
+# Function: significant_lags #
+##############################
+# Lags whose |z| exceeds the two sided bound for alpha across all lags
+def significant_lags(result, alpha=DEFAULT_ALPHA):
+    if result['lags'] == 0:
+        return float('inf'), []
+    bound = statistics.NormalDist().inv_cdf(1.0 - alpha / (2.0 * result['lags']))
+    found = [(k + 1, r, z) for k, (r, z) in enumerate(zip(result['r'], result['z']))
+             if abs(z) > bound]
+    return bound, found
+
+
+def autocorrelation(path, lags=DEFAULT_LAGS, levels=('bits', 'bytes'), workers=None):
+    kernels = [AutocorrelationKernel(lags, level) for level in levels]
+    results = truerng_analyze.analyze_file(path, kernels, workers)
+    return {level: results['autocorr_' + level] for level in levels}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='FFT autocorrelation of TrueRNG capture files')
+    parser.add_argument('filename')
+    parser.add_argument('--lags', type=int, default=DEFAULT_LAGS)
+    parser.add_argument('--level', choices=('bits', 'bytes', 'both'), default='both')
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA,
+                        help='significance level across all lags')
+    parser.add_argument('-j', '--workers', type=int, default=None)
+    parser.add_argument('--csv', help='write lag,r,z for every lag to this file')
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.filename):
+        print(args.filename + ' Not Found')
+        sys.exit(1)
+
+    levels = ('bits', 'bytes') if args.level == 'both' else (args.level,)
+
+    before = time.perf_counter()
+    results = autocorrelation(args.filename, args.lags, levels, args.workers)
+    after = time.perf_counter()
+
+    print('==================================================')
+    print('TrueRNG Autocorrelation of ' + args.filename)
+    print('==================================================')
+    failed = False
+    for level in levels:
+        result = results[level]
+        bound, found = significant_lags(result, args.alpha)
+        print(level.capitalize() + ': ' + str(result['samples']) + ' samples, lags 1-' + str(result['lags']) +
+              ', bound |z| > ' + '{:2.2f}'.format(bound))
+        if found:
+            failed = True
+            print('*** FAILED *** ' + str(len(found)) + ' significant lags')
+            for lag, r, z in sorted(found, key=lambda f: -abs(f[2]))[:20]:
+                print('    lag ' + str(lag) + ': r = ' + '{:+1.6f}'.format(r) + ' (z = ' + '{:+2.2f}'.format(z) + ')')
+        else:
+            worst = int(np.argmax(np.abs(result['z']))) if result['lags'] else 0
+            print('*** PASSED *** No significant lags (largest |z| = ' +
+                  '{:2.2f}'.format(abs(result['z'][worst]) if result['lags'] else 0.0) +
+                  ' at lag ' + str(worst + 1) + ')')
+
+        if args.csv:
+            with open(args.csv if len(levels) == 1 else level + '_' + args.csv, 'w') as fp:
+                fp.write('lag,r,z\n')
+                for k, (r, z) in enumerate(zip(result['r'], result['z'])):
+                    fp.write(str(k + 1) + ',' + repr(r) + ',' + repr(z) + '\n')
+
+    print('==================================================')
+    print('Completed in ' + '{:2.2f}'.format(after - before) + ' seconds')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,637 @@
+#!/usr/bin/python3
+
+# TrueRNG Benchmarks
+# 10/19/2026
+#
+# Requires Python 3.8 (each benchmark lists what else it needs)
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+#
+# Repeatable performance measurements for the TrueRNG utilities.  Results are printed
+# and can be saved as JSON to compare versions.
+#
+# truerng_benchmark.py [BENCHMARK ...] [--repeat N] [--json FILE]
+# Linux example:  python3 truerng_benchmark.py wordlist --repeat 10
+#                 python3 truerng_benchmark.py startup --json startup.json
+#                 python3 truerng_benchmark.py capture --rate 0.4 --seconds 5 --json capture.json
+#                 python3 truerng_benchmark.py store --store-rows 1000000
+#                 python3 truerng_benchmark.py condition --repeat 3
+#                 python3 truerng_benchmark.py drbg
+#                 python3 truerng_benchmark.py ascii --repeat 3
+
+import argparse
+import json
+import os
+import platform
+import random
+import select
+import shutil
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+# Directory holding the scripts (added to the path of child interpreters)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Registered benchmarks by name
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+
+# Runs python code in a fresh interpreter and returns the wall time in seconds
+def time_python(code, env=None):
+    before = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], cwd=SCRIPT_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - before
+
+
+# Times code repeat times in fresh interpreters
+def startup_times(code, repeat):
+    times = [time_python(code) for _ in range(repeat)]
+    return {'min_s': min(times), 'median_s': statistics.median(times)}
+
+
+# Packages that only the commands needing them should import
+HEAVY_MODULES = ('serial', 'usb', 'numpy', 'matplotlib', 'nltk')
+
+# truerng.py command lines that run without a device
+STARTUP_COMMANDS = {'help': ['--help'],
+                    'find': ['find'],
+                    'analyze': ['analyze', '--help'],
+                    'password': ['password', '--help']}
+
+
+#########################
+# Function: import_time #
+#########################
+# Runs a script with -X importtime and returns (total import microseconds,
+# top level packages of every module imported)
+def import_time(argv):
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + argv, cwd=SCRIPT_DIR,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    total = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        modules.add(fields[2].strip().split('.')[0])
+        # Nested imports are indented and already counted in their parent's total
+        if not fields[2].startswith('  '):
+            total += int(fields[1])
+    return total, modules
+
+
+######################
+# Benchmark: startup #
+######################
+# Import cost of the truerng.py commands, so heavy modules don't creep back into
+# commands that don't need them
+@benchmark('startup')
+def benchmark_startup(args):
+    results = {}
+    for name, command in STARTUP_COMMANDS.items():
+        argv = [os.path.join(SCRIPT_DIR, 'truerng.py')] + command
+        totals = []
+        for _ in range(args.repeat):
+            total, modules = import_time(argv)
+            totals.append(total)
+        results[name] = {'import_ms': statistics.median(totals) / 1000.0,
+                         'heavy_modules': ' '.join(sorted(modules.intersection(HEAVY_MODULES))) or 'none'}
+    return results
+
+
+#############################
+# Function: make_fake_sysfs #
+#############################
+# Builds a sysfs tree under root with count TrueRNGproV2 devices on ttyACM0..N
+# and a few ttys that aren't on USB
+def make_fake_sysfs(root, count):
+    for i in range(count):
+        name = '1-' + str(i + 1)
+        usb_path = os.path.join(root, 'devices', 'pci0000:00', '0000:00:14.0', 'usb1', name)
+        interface = os.path.join(usb_path, name + ':1.0')
+        os.makedirs(os.path.join(interface, 'tty', 'ttyACM' + str(i)))
+        attributes = {'idVendor': '04d8', 'idProduct': 'ebb5', 'bcdDevice': '0110',
+                      'serial': 'SN' + str(i), 'busnum': '1', 'devnum': str(i + 2)}
+        for key, value in attributes.items():
+            with open(os.path.join(usb_path, key), 'w') as fp:
+                fp.write(value + '\n')
+        tty_path = os.path.join(root, 'class', 'tty', 'ttyACM' + str(i))
+        os.makedirs(tty_path)
+        os.symlink(interface, os.path.join(tty_path, 'device'))
+    for i in range(64):
+        os.makedirs(os.path.join(root, 'class', 'tty', 'tty' + str(i)))
+
+
+####################
+# Benchmark: sysfs #
+####################
+# Device discovery from sysfs (truerng_sysfs.py) versus the lsusb subprocess it replaced
+@benchmark('sysfs')
+def benchmark_sysfs(args):
+    import truerng_sysfs
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        make_fake_sysfs(tmp, 8)
+        times = []
+        for _ in range(args.repeat):
+            before = time.perf_counter()
+            truerng_sysfs.scan(tmp)
+            times.append(time.perf_counter() - before)
+        results['scan_8_devices_ms'] = 1000.0 * statistics.median(times)
+        before = time.perf_counter()
+        for _ in range(1000):
+            truerng_sysfs.firmware_revision('/dev/ttyACM7', tmp)
+        results['cached_lookup_us'] = 1000.0 * (time.perf_counter() - before)
+        truerng_sysfs.invalidate()
+
+    if shutil.which('lsusb'):
+        times = []
+        for _ in range(args.repeat):
+            before = time.perf_counter()
+            subprocess.run('lsusb -d 04d8:ebb5 -v 2> /dev/null | grep bcdDevice', shell=True,
+                           stdout=subprocess.DEVNULL)
+            times.append(time.perf_counter() - before)
+        results['lsusb_ms'] = 1000.0 * statistics.median(times)
+    else:
+        results['lsusb_ms'] = 'skipped (lsusb is not installed)'
+    return results
+
+
+######################
+# Benchmark: metrics #
+######################
+# Cost of the metrics bookkeeping in the capture loop (truerng_metrics.py) and of a
+# scrape with a full rolling window
+@benchmark('metrics')
+def benchmark_metrics(args):
+    import truerng_metrics
+    block = os.urandom(truerng_metrics.BLOCK_SIZE)
+    metrics = truerng_metrics.DeviceMetrics('/dev/ttyACM0', 'TrueRNGproV2', 'SN0')
+    count = truerng_metrics.WINDOW_BYTES // len(block)
+    times = []
+    for _ in range(args.repeat):
+        before = time.perf_counter()
+        for _ in range(count):
+            metrics.record_read(block, 0.01, len(block))
+        times.append(time.perf_counter() - before)
+    scrapes = []
+    for _ in range(args.repeat):
+        before = time.perf_counter()
+        truerng_metrics.prometheus_metrics([metrics])
+        scrapes.append(time.perf_counter() - before)
+    return {'record_read_MB_per_s': count * len(block) / statistics.median(times) / 1e6,
+            'record_read_us_per_block': 1e6 * statistics.median(times) / count,
+            'scrape_ms': 1000.0 * statistics.median(scrapes)}
+
+
+# Baseline of the capture sweep; each dimension is varied on its own around it
+CAPTURE_BASELINE = {'method': 'pyserial_read', 'block_size': 65536, 'timeout': 1.0, 'threads': 1}
+CAPTURE_SWEEP = {'block_size': (1024, 4096, 16384, 65536, 262144, 1048576),
+                 'timeout': (0.01, 0.1, 1.0, 10.0),
+                 'method': ('pyserial_read', 'pyserial_readinto', 'fd_read', 'fd_readinto'),
+                 'threads': (1, 2, 4)}
+
+
+# Writes random data to a pty master at rate bytes/s (0 = as fast as possible)
+# until stop is set.  Runs in a child process so it doesn't share the GIL with
+# the reader being measured.
+def _feed_pty(fd, rate, stop):
+    os.set_blocking(fd, False)
+    chunk = 16384
+    data = os.urandom(1024*1024 + chunk)
+    start = time.perf_counter()
+    sent = 0
+    while not stop.is_set():
+        if rate > 0:
+            ahead = sent / rate - (time.perf_counter() - start)
+            if ahead > 0:
+                time.sleep(min(ahead, 0.01))
+                continue
+        # Wait for room with a timeout so stop is noticed when nobody is reading
+        if not select.select([], [fd], [], 0.05)[1]:
+            continue
+        try:
+            sent += os.write(fd, data[sent % len(data):sent % len(data) + chunk])
+        except BlockingIOError:
+            continue
+        except OSError:
+            return
+
+
+###################################
+# Function: open_simulated_device #
+###################################
+# A raw pty fed at rate bytes/s.  Returns (tty name, master fd, slave fd, feeder
+# process); the slave stays open so writes don't fail before the reader opens it.
+def open_simulated_device(rate, stop):
+    import multiprocessing
+    import pty
+    import tty
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    name = os.ttyname(slave)
+    feeder = multiprocessing.get_context('fork').Process(target=_feed_pty, args=(master, rate, stop), daemon=True)
+    feeder.start()
+    return name, master, slave, feeder
+
+
+# Reads from one tty for seconds with the given method and returns the bytes read
+def _capture(name, method, block_size, timeout, seconds, totals, index):
+    import serial
+    total = 0
+    buffer = bytearray(block_size)
+    view = memoryview(buffer)
+    if method.startswith('pyserial'):
+        ser = serial.Serial(port=name, timeout=timeout)
+        read = ser.read
+        readinto = ser.readinto
+    else:
+        fd = os.open(name, os.O_RDONLY | os.O_NOCTTY)
+        raw = open(fd, 'rb', buffering=0)
+        read = raw.read
+        readinto = raw.readinto
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        if method.endswith('readinto'):
+            total += readinto(view) or 0
+        else:
+            total += len(read(block_size) or b'')
+    if method.startswith('pyserial'):
+        ser.close()
+    else:
+        raw.close()
+    totals[index] = total
+
+
+# Number of read system calls made by this process so far (Linux only)
+def read_syscalls():
+    try:
+        with open('/proc/self/io') as fp:
+            for line in fp:
+                if line.startswith('syscr:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+#############################
+# Function: measure_capture #
+#############################
+# Reads from threads simulated devices (one thread each) for seconds and returns
+# MB/s, CPU% and read system calls per MB
+def measure_capture(method, block_size, timeout, threads, seconds, rate):
+    import multiprocessing
+    import threading
+    stop = multiprocessing.get_context('fork').Event()
+    devices = [open_simulated_device(rate, stop) for _ in range(threads)]
+    totals = [0] * threads
+    readers = [threading.Thread(target=_capture, args=(name, method, block_size, timeout, seconds, totals, i))
+               for i, (name, master, slave, feeder) in enumerate(devices)]
+    syscalls = read_syscalls()
+    cpu = time.process_time()
+    before = time.perf_counter()
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join()
+    wall = time.perf_counter() - before
+    cpu = time.process_time() - cpu
+    if syscalls is not None:
+        syscalls = read_syscalls() - syscalls
+    stop.set()
+    for name, master, slave, feeder in devices:
+        feeder.join()
+        os.close(master)
+        os.close(slave)
+    megabytes = sum(totals) / 1e6
+    return {'MB_per_s': megabytes / wall, 'cpu_percent': 100.0 * cpu / wall,
+            'syscalls_per_MB': syscalls / megabytes if syscalls is not None and megabytes else None}
+
+
+######################
+# Benchmark: capture #
+######################
+# Serial capture path on simulated (pty) devices: block size, read timeout,
+# read vs readinto, pyserial vs a raw fd and the number of reader threads.
+# --rate sets the simulated device rate (0 = as fast as the pty allows).
+@benchmark('capture')
+def benchmark_capture(args):
+    rate = args.rate * 1e6
+    results = {'rate_MB_per_s': args.rate or 'unlimited', 'seconds': args.seconds}
+    for dimension, values in CAPTURE_SWEEP.items():
+        results[dimension] = {}
+        for value in values:
+            point = dict(CAPTURE_BASELINE)
+            point[dimension] = value
+            runs = [measure_capture(point['method'], point['block_size'], point['timeout'], point['threads'],
+                                    args.seconds, rate) for _ in range(args.repeat)]
+            results[dimension][str(value)] = {key: statistics.median(run[key] for run in runs)
+                                              if runs[0][key] is not None else None for key in runs[0]}
+    return results
+
+
+#######################
+# Benchmark: wordlist #
+#######################
+# Startup time of the word generator: loading and filtering the nltk corpus versus
+# opening the precompiled index built by truerng_wordlist.py
+@benchmark('wordlist')
+def benchmark_wordlist(args):
+    import truerng_wordlist
+    results = {'interpreter': startup_times('pass', args.repeat)}
+
+    nltk_code = ('import nltk\n'
+                 'w = [x for x in nltk.corpus.words.words() if 2 < len(x) < 10]\n'
+                 'print(w[len(w)//2])\n')
+    try:
+        results['nltk'] = startup_times(nltk_code, args.repeat)
+        import nltk
+        words = nltk.corpus.words.words()
+    except (subprocess.CalledProcessError, ImportError, LookupError):
+        results['nltk'] = 'skipped (nltk or the words corpus is not installed)'
+        # Same size as the nltk corpus so the index numbers are comparable
+        rng = random.Random(1)
+        words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+                 for _ in range(236736)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'wordlist.idx')
+        results['words'] = truerng_wordlist.build_index(words, path, truerng_wordlist.DEFAULT_MIN_LENGTH,
+                                                         truerng_wordlist.DEFAULT_MAX_LENGTH)
+        index_code = ('import truerng_wordlist\n'
+                      'w = truerng_wordlist.Wordlist(' + repr(path) + ')\n'
+                      'print(w[len(w)//2])\n')
+        results['index'] = startup_times(index_code, args.repeat)
+        results['index_bytes'] = os.path.getsize(path)
+    return results
+
+
+########################
+# Benchmark: passwords #
+########################
+# Bulk password generation throughput (truerng_generate_password.py --count) with
+# os.urandom standing in for the device
+@benchmark('passwords')
+def benchmark_passwords(args):
+    import truerng_sampler
+    alphabets = {'alnum': '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz',
+                 'printable': ''.join(chr(c) for c in range(33, 127))}
+    count = 200000
+    results = {}
+    for name, alphabet in alphabets.items():
+        for length in (16, 32):
+            rates = []
+            for _ in range(args.repeat):
+                sampler = truerng_sampler.ByteSampler(os.urandom, refill_size=64*1024)
+                before = time.perf_counter()
+                for _ in sampler.strings(alphabet, length, count):
+                    pass
+                rates.append(count / (time.perf_counter() - before))
+            results[name + '_' + str(length)] = {
+                'passwords_per_s': statistics.median(rates),
+                'bits_per_password': truerng_sampler.string_entropy(len(alphabet), length),
+                'device_bits_per_char': sampler.bits_per_output()}
+    return results
+
+
+####################
+# Benchmark: store #
+####################
+# Batched inserts into the results store (truerng_store.py) and the trend and fleet
+# queries on a year of runs from 50 devices
+@benchmark('store')
+def benchmark_store(args):
+    import truerng_store
+    rng = random.Random(1)
+    serials = ['SN' + str(i).zfill(6) for i in range(50)]
+    start = time.time() - 365 * 86400
+    step = 365 * 86400.0 / args.store_rows
+    results = {'rows': args.store_rows}
+    with tempfile.TemporaryDirectory() as tmp:
+        store = truerng_store.ResultStore(os.path.join(tmp, 'results.db'))
+        before = time.perf_counter()
+        for i in range(args.store_rows):
+            store.add(serials[i % len(serials)], 'TrueRNGproV2', '1.00', 'MODE_NORMAL', 'test',
+                      rng.random() > 0.001, {'entropy': 7.9998 + rng.random() * 1e-4, 'rate': 3.5 + rng.random(),
+                                             'ps_voltage': 16.0 + rng.random() * 0.1},
+                      start + i * step)
+        store.flush()
+        results['inserts_per_s'] = args.store_rows / (time.perf_counter() - before)
+
+        month = start + 180 * 86400
+        queries = {'trend_month_ms': lambda: store.trend(serials[7], 'entropy', month, month + 30 * 86400),
+                   'daily_trend_year_ms': lambda: store.daily_trend(serials[7], 'ps_voltage'),
+                   'fleet_year_ms': lambda: store.fleet('entropy'),
+                   'fleet_month_ms': lambda: store.fleet('rate', month, month + 30 * 86400),
+                   'latest_ms': store.latest}
+        for name, query in queries.items():
+            times = []
+            for _ in range(args.repeat):
+                before = time.perf_counter()
+                query()
+                times.append(time.perf_counter() - before)
+            results[name] = 1000.0 * statistics.median(times)
+        store.close()
+        results['database_MB'] = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp)) / 1e6
+    return results
+
+
+########################
+# Benchmark: condition #
+########################
+# Throughput of the software conditioners (truerng_condition.py) on simulated 10 bit
+# ADC samples, and of parsing the RAW_BIN and UNWHITENED capture formats.  Input
+# MB/s counts samples as the 2 bytes of MODE_RAW_BIN.
+@benchmark('condition')
+def benchmark_condition(args):
+    import numpy as np
+    import truerng_condition
+    rng = np.random.default_rng(1)
+    samples = np.clip(np.rint(rng.normal(512, 100, 1 << 22)), 0, 1023).astype(np.int64)
+    generators = truerng_condition.FORMATS['raw_bin']['generators']
+    entropy = truerng_condition.min_entropy(samples, generators)
+    results = {'samples': len(samples), 'min_entropy_bits': entropy}
+
+    def median_seconds(function):
+        times = []
+        for _ in range(args.repeat):
+            before = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - before)
+        return statistics.median(times)
+
+    raw = samples.astype('<u2').tobytes()
+    text = ''.join(str(v) + ',' for v in samples[:1 << 20] // 2).encode('ascii')
+    for form, data in (('raw_bin', raw), ('unwhitened', text)):
+        seconds = median_seconds(lambda: truerng_condition.parse_samples(data, form))
+        results['parse_' + form + '_MB_per_s'] = len(data) / seconds / 1e6
+
+    for name, bits in (('sha256', 1), ('blake2b', 1), ('vonneumann', 1), ('vonneumann', 4)):
+        output = []
+        seconds = median_seconds(lambda: output.append(
+            len(truerng_condition.make_conditioner(name, entropy, bits, generators).feed(samples))))
+        key = name + ('_' + str(bits) + 'bit' if name == 'vonneumann' else '')
+        results[key] = {'in_MB_per_s': len(raw) / seconds / 1e6, 'out_MB_per_s': output[-1] / seconds / 1e6,
+                        'out_bytes_per_sample': output[-1] / float(len(samples))}
+    return results
+
+
+#######################
+# Benchmark: toeplitz #
+#######################
+# Toeplitz extraction (truerng_toeplitz.py) of simulated 10 bit ADC samples on one
+# core, compared with the sample rate of a TrueRNGproV2 in MODE_RAW_BIN (two bytes
+# per sample at the simulator's rate)
+@benchmark('toeplitz')
+def benchmark_toeplitz(args):
+    import numpy as np
+    import truerng_simulator
+    import truerng_toeplitz
+    rng = np.random.default_rng(1)
+    device_rate = truerng_simulator.MODELS['TrueRNGproV2']['rate'] / 2.0
+    results = {'device_samples_per_s': device_rate}
+    with tempfile.TemporaryDirectory() as tmp:
+        for block in (4096, 16384, 65536):
+            samples = np.clip(np.rint(rng.normal(512, 100, block * 8)), 0, 1023).astype(np.int64)
+            extractor = truerng_toeplitz.extractor_for_min_entropy(
+                7.9, block, seed_file=os.path.join(tmp, 'seed'))
+            times = []
+            for _ in range(args.repeat):
+                before = time.perf_counter()
+                for i in range(8):
+                    extractor.extract(truerng_toeplitz.sample_bits(samples[i * block:(i + 1) * block], 10))
+                times.append(time.perf_counter() - before)
+            rate = block * 8 / statistics.median(times)
+            results['block_' + str(block)] = {'samples_per_s': rate, 'out_MB_per_s': rate * extractor.m /
+                                              extractor.n * 10 / 8e6, 'ratio': extractor.m / float(extractor.n),
+                                              'realtime_factor': rate / device_rate}
+    return results
+
+
+###################
+# Benchmark: drbg #
+###################
+# Expanded output of each generator in truerng_drbg.py (os.urandom stands in for the
+# device so only the generator is measured): MB/s for large and small reads, the
+# cost of a reseed and MB/s with a reseed before every 64 KiB read
+@benchmark('drbg')
+def benchmark_drbg(args):
+    import truerng_drbg
+    results = {}
+
+    def median_seconds(function):
+        times = []
+        for _ in range(args.repeat):
+            before = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - before)
+        return statistics.median(times)
+
+    for name in truerng_drbg.GENERATORS:
+        try:
+            stream = truerng_drbg.SeededStream(os.urandom, name, reseed_bytes=0, reseed_seconds=0)
+        except ImportError:
+            results[name] = 'skipped (cryptography is not installed)'
+            continue
+        total = (8 << 20) if name == 'hmac' else (64 << 20)
+        large = median_seconds(lambda: stream.read(total))
+        small = median_seconds(lambda: [stream.read(4096) for _ in range(total // 4096 // 8)])
+        reseed = median_seconds(lambda: [stream.reseed() for _ in range(1000)]) / 1000
+        resistant = truerng_drbg.SeededStream(os.urandom, name, reseed_bytes=0, reseed_seconds=0,
+                                              prediction_resistance=True)
+        predict = median_seconds(lambda: [resistant.read(65536) for _ in range(total // 65536 // 8)])
+        results[name] = {'MB_per_s_1MiB_reads': total / large / 1e6,
+                         'MB_per_s_4KiB_reads': total / 8 / small / 1e6,
+                         'reseed_us': reseed * 1e6,
+                         'MB_per_s_prediction_resistance_64KiB_reads': total / 8 / predict / 1e6}
+    return results
+
+
+####################
+# Benchmark: ascii #
+####################
+# Hex decoding (truerng_ascii.py) of MODE_NORMAL_ASC text in one buffer and in small
+# reads (odd sizes so digits are carried between reads), compared with the text rate
+# of a TrueRNGproV2 in MODE_NORMAL_ASC (the simulator's rate in characters per second)
+@benchmark('ascii')
+def benchmark_ascii(args):
+    import binascii
+    import truerng_ascii
+    import truerng_simulator
+    data = os.urandom(8 << 20)
+    text = binascii.hexlify(data).upper()
+    device_rate = float(truerng_simulator.MODELS['TrueRNGproV2']['rate'])
+    results = {'device_text_MB_per_s': device_rate / 1e6}
+    for read_size in (len(text), 65536, 4095):
+        times = []
+        for _ in range(args.repeat):
+            decoder = truerng_ascii.HexDecoder()
+            before = time.perf_counter()
+            out = b''.join([decoder.feed(text[i:i + read_size]) for i in range(0, len(text), read_size)])
+            times.append(time.perf_counter() - before)
+        if out != data:
+            raise RuntimeError('hex decoding does not match the input')
+        rate = len(text) / statistics.median(times)
+        results['reads_' + str(read_size)] = {'text_MB_per_s': rate / 1e6, 'realtime_factor': rate / device_rate}
+    return results
+
+
+def print_results(results, indent='    '):
+    for key, value in results.items():
+        if isinstance(value, dict):
+            print(indent + key + ':')
+            print_results(value, indent + '    ')
+        elif isinstance(value, float):
+            print(indent + key + ': ' + '{:.6g}'.format(value))
+        else:
+            print(indent + key + ': ' + str(value))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='TrueRNG utility benchmarks')
+    parser.add_argument('benchmarks', nargs='*', help='any of: ' + ', '.join(BENCHMARKS) + ' (default all)')
+    parser.add_argument('--repeat', type=int, default=5, help='repetitions per measurement')
+    parser.add_argument('--json', help='save the results to this file')
+    parser.add_argument('--rate', type=float, default=0.0,
+                        help='capture: simulated device rate in MB/s (default 0 = unlimited)')
+    parser.add_argument('--seconds', type=float, default=1.0, help='capture: seconds per measurement')
+    parser.add_argument('--store-rows', type=int, default=1000000, help='store: runs to insert')
+    args = parser.parse_args()
+
+    names = args.benchmarks or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print('Unknown benchmark: ' + name)
+            sys.exit(1)
+
+    report = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+              'platform': platform.platform(), 'results': {}}
+    print('==================================================')
+    print('TrueRNG Benchmarks')
+    print('==================================================')
+    for name in names:
+        print(name)
+        results = BENCHMARKS[name](args)
+        report['results'][name] = results
+        print_results(results)
+    print('==================================================')
+
+    if args.json:
+        with open(args.json, 'w') as fp:
+            json.dump(report, fp, indent=2)
+        print('Saved to ' + args.json)
@@ -0,0 +1,277 @@
+#!/usr/bin/python3
+
+# TrueRNG Software Conditioning
+# 10/19/2026
+#
+# Requires Python 3.8, numpy (pyserial to read a device)
+#
+# On Linux - may need to be root or set /dev/tty port permissions to 666
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Numpy package with:   python -m pip install numpy
+# Install Pyserial package with:   python -m pip install pyserial
+#
+# MODE_RAW_BIN, MODE_RAW_ASC and MODE_UNWHITENED give the noise source before the
+# device's own whitening.  This turns those samples into full entropy bytes with a
+# conditioner of our own:
+#
+#   sha256, blake2b   SP 800-90B style hash conditioning: each output block is the
+#                     hash of enough samples to hold output bits + 64 bits of
+#                     min-entropy, so the input / output ratio comes from the
+#                     measured min-entropy per sample (SHA-256 is a vetted
+#                     conditioning function in SP 800-90B, BLAKE2b is not)
+#   vonneumann        von Neumann debiasing of the low --bits bits of consecutive
+#                     samples of the same generator (bit j of one sample and of the
+#                     next: 01 -> 0, 10 -> 1, 00 and 11 dropped).  It removes bias
+#                     only; the samples have to be independent, so keep --bits to the
+#                     noisy low bits
+#
+# MODE_RAW_BIN and MODE_RAW_ASC interleave the samples of the two generators (gen1,
+# gen2, gen1, gen2, ...), which have their own mean and bias, so each generator is
+# estimated and debiased on its own.  The min-entropy per sample is the lower of the
+# generators' SP 800-90B most common value estimates (with its 99% upper bound on
+# the probability) of a calibration block, unless --min-entropy is given.  Parsing
+# and conditioning are done on whole numpy arrays.
+#
+# truerng_condition.py [PORT] [--format raw_bin] [--conditioner sha256] [--bytes N] [--out FILE]
+# truerng_condition.py --input CAPTUREFILE --format unwhitened [--conditioner vonneumann --bits 2]
+# Linux example:  python3 truerng_condition.py /dev/ttyACM0 --format raw_bin --bytes 1048576 --out conditioned.bin
+
+import argparse
+import hashlib
+import math
+import sys
+import time
+
+import numpy as np
+
+import truerng_device
+
+# Capture formats: mode, bits per sample, whether it is ASCII and how many generators
+# take turns in the sample stream
+FORMATS = {'raw_bin': {'mode': 'MODE_RAW_BIN', 'bits': 10, 'ascii': False, 'generators': 2},
+           'raw_asc': {'mode': 'MODE_RAW_ASC', 'bits': 10, 'ascii': True, 'generators': 2},
+           'unwhitened': {'mode': 'MODE_UNWHITENED', 'bits': 9, 'ascii': True, 'generators': 1}}
+
+# Extra min-entropy (bits) per hash input over the output size (SP 800-90B 3.1.5.1.2)
+HASH_MARGIN_BITS = 64
+
+# Samples used to estimate the min-entropy
+CALIBRATION_SAMPLES = 1 << 20
+
+# Bytes read from a device or file at a time
+READ_SIZE = 1 << 20
+
+
+###########################
+# Function: parse_samples #
+###########################
+# Samples from a block of capture data.  Returns (samples, leftover bytes of a sample
+# that continues in the next block).  RAW_BIN is little endian 16 bit samples; the
+# ASCII formats are decimal numbers between separators (',' '\n' '\r'), parsed
+# without a Python loop.
+def parse_samples(data, form):
+    if not FORMATS[form]['ascii']:
+        usable = len(data) & ~1
+        samples = np.frombuffer(data[:usable], dtype='<u2') & ((1 << FORMATS[form]['bits']) - 1)
+        return samples.astype(np.int64), data[usable:]
+
+    buf = np.frombuffer(data, dtype=np.uint8)
+    digit = (buf >= 48) & (buf <= 57)
+    separators = np.flatnonzero(~digit)
+    if len(separators) == 0:
+        return np.zeros(0, dtype=np.int64), data
+    end = separators[-1] + 1
+    buf = buf[:end]
+    digit = digit[:end]
+    # Token of each byte is the separator that ends it; a digit is worth
+    # 10^(digits between it and that separator)
+    token = np.cumsum(~digit) - (~digit)
+    ends = separators[token]
+    place = ends - np.arange(end) - 1
+    values = np.bincount(token[digit], weights=(buf[digit] - 48) * (10.0 ** place[digit]),
+                         minlength=len(separators))
+    lengths = np.bincount(token[digit], minlength=len(separators))
+    return np.rint(values[lengths > 0]).astype(np.int64), data[end:]
+
+
+#########################
+# Function: min_entropy #
+#########################
+# SP 800-90B most common value estimate in bits per sample.  With generators > 1
+# the samples take turns between that many generators and the lowest of their
+# estimates is returned (the mixed stream would count the offset between their
+# means as entropy)
+def min_entropy(samples, generators=1):
+    samples = np.asarray(samples)
+    if generators > 1:
+        return min(min_entropy(samples[g::generators]) for g in range(generators))
+    n = len(samples)
+    if n < 2:
+        return 0.0
+    p = np.bincount(samples).max() / n
+    upper = min(1.0, p + 2.576 * math.sqrt(p * (1.0 - p) / (n - 1)))
+    return -math.log2(upper)
+
+
+##########################
+# Class: HashConditioner #
+##########################
+# Hashes blocks of samples_per_block samples (as 16 bit words) into full entropy output
+class HashConditioner:
+    def __init__(self, entropy_per_sample, algorithm='sha256'):
+        self.algorithm = algorithm
+        self.output_size = hashlib.new(algorithm).digest_size
+        if entropy_per_sample <= 0:
+            raise ValueError('no min-entropy per sample')
+        self.samples_per_block = int(math.ceil((self.output_size * 8 + HASH_MARGIN_BITS) / entropy_per_sample))
+        self.pending = np.zeros(0, dtype='<u2')
+
+    # Output bytes per input sample
+    def ratio(self):
+        return self.output_size / float(self.samples_per_block)
+
+    def feed(self, samples):
+        samples = np.concatenate((self.pending, np.asarray(samples, dtype='<u2')))
+        blocks = len(samples) // self.samples_per_block
+        used = blocks * self.samples_per_block
+        self.pending = samples[used:]
+        data = memoryview(samples[:used].tobytes())
+        step = self.samples_per_block * 2
+        new = hashlib.new
+        algorithm = self.algorithm
+        return b''.join([new(algorithm, data[i:i + step]).digest() for i in range(0, used * 2, step)])
+
+
+###########################
+# Class: VonNeumannDebias #
+###########################
+# Von Neumann debiasing of the low bits of each pair of consecutive samples from the
+# same generator (samples i and i + generators when generators take turns)
+class VonNeumannDebias:
+    def __init__(self, bits=1, generators=1):
+        self.bits = bits
+        self.generators = generators
+        self.pending = np.zeros(0, dtype=np.int64)
+        self.leftover = np.zeros(0, dtype=np.uint8)
+
+    # Expected output bytes per input sample for bits with probability p of 1
+    def ratio(self, p=0.5):
+        return self.bits * p * (1.0 - p) / 8.0
+
+    def feed(self, samples):
+        samples = np.concatenate((self.pending, np.asarray(samples, dtype=np.int64)))
+        # Whole groups of two samples from each generator, so the turn order carries
+        # over to the next call
+        group = 2 * self.generators
+        groups = len(samples) // group
+        self.pending = samples[groups * group:]
+        grouped = samples[:groups * group].reshape(groups, 2, self.generators)
+        first = grouped[:, 0, :].ravel()
+        second = grouped[:, 1, :].ravel()
+        shifts = np.arange(self.bits)
+        # Bit j of each pair (one row per pair), kept where the two samples differ
+        a = ((first[:, None] >> shifts) & 1).astype(np.uint8)
+        b = ((second[:, None] >> shifts) & 1).astype(np.uint8)
+        bits = np.concatenate((self.leftover, a[a != b]))
+        whole = len(bits) // 8 * 8
+        self.leftover = bits[whole:]
+        return np.packbits(bits[:whole]).tobytes()
+
+
+##############################
+# Function: make_conditioner #
+##############################
+def make_conditioner(name, entropy_per_sample=None, bits=1, generators=1):
+    if name == 'vonneumann':
+        return VonNeumannDebias(bits, generators)
+    return HashConditioner(entropy_per_sample, name)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Condition raw / unwhitened TrueRNG samples into full entropy bytes')
+    parser.add_argument('port', nargs='?', default=None, help='com port to read (default first TrueRNGpro / V2)')
+    parser.add_argument('--input', help='condition this capture file instead of reading a device')
+    parser.add_argument('--format', choices=list(FORMATS), default='raw_bin')
+    parser.add_argument('--conditioner', choices=['sha256', 'blake2b', 'vonneumann'], default='sha256')
+    parser.add_argument('--bits', type=int, default=1, help='vonneumann: low bits of each sample to use')
+    parser.add_argument('--min-entropy', type=float, default=None,
+                        help='bits of min-entropy per sample (default estimated from the first samples)')
+    parser.add_argument('--bytes', type=int, default=1048576, help='output bytes (device only)')
+    parser.add_argument('--out', default='conditioned.bin', help='output file')
+    args = parser.parse_args()
+
+    ser = None
+    fp_in = None
+    if args.input:
+        fp_in = open(args.input, 'rb')
+        read = fp_in.read
+    else:
+        from serial.tools import list_ports
+        port = args.port
+        if port is None:
+            for temp in list_ports.comports():
+                if '16D0:0AA0' in temp[2] or '04D8:EBB5' in temp[2]:
+                    port = temp[0]
+                    break
+        if port is None:
+            print('No TrueRNGpro or TrueRNGproV2 detected (the TrueRNG has no raw modes)')
+            sys.exit(1)
+        ser = truerng_device.open_port(port, 10, FORMATS[args.format]['mode'])
+        read = ser.read
+
+    print('==================================================')
+    print('Conditioning ' + (args.input or port) + ' (' + args.format + ') with ' + args.conditioner)
+
+    # Calibration block (also conditioned)
+    leftover = b''
+    samples = np.zeros(0, dtype=np.int64)
+    while len(samples) < CALIBRATION_SAMPLES:
+        data = read(READ_SIZE)
+        if not data:
+            break
+        new, leftover = parse_samples(leftover + data, args.format)
+        samples = np.concatenate((samples, new))
+    entropy = args.min_entropy if args.min_entropy is not None else min_entropy(samples, FORMATS[args.format]['generators'])
+    print('Min-entropy:    ' + '{:1.3f}'.format(entropy) + ' of ' + str(FORMATS[args.format]['bits']) +
+          ' bits per sample' + (' (given)' if args.min_entropy is not None else
+                                ' (most common value estimate, ' + str(len(samples)) + ' samples)'))
+    try:
+        conditioner = make_conditioner(args.conditioner, entropy, args.bits, FORMATS[args.format]['generators'])
+    except ValueError as e:
+        print('*** FAILED *** ' + str(e))
+        sys.exit(1)
+    if args.conditioner == 'vonneumann':
+        print('Pairs of ' + str(args.bits) + ' bit(s), about ' + '{:1.4f}'.format(conditioner.ratio()) +
+              ' output bytes per sample')
+    else:
+        print(str(conditioner.samples_per_block) + ' samples per ' + str(conditioner.output_size) +
+              ' byte block (' + '{:1.4f}'.format(conditioner.ratio()) + ' output bytes per sample)')
+    print('==================================================')
+
+    total_in = 0
+    total_out = 0
+    before = time.perf_counter()
+    with open(args.out, 'wb') as fp:
+        while len(samples):
+            out = conditioner.feed(samples)
+            if not args.input:
+                out = out[:args.bytes - total_out]
+            fp.write(out)
+            total_in += len(samples)
+            total_out += len(out)
+            if not args.input and total_out >= args.bytes:
+                break
+            data = read(READ_SIZE)
+            if not data:
+                break
+            samples, leftover = parse_samples(leftover + data, args.format)
+    elapsed = time.perf_counter() - before
+
+    if ser is not None:
+        ser.close()
+    if fp_in is not None:
+        fp_in.close()
+    print(str(total_in) + ' samples -> ' + str(total_out) + ' bytes to ' + args.out + ' in ' +
+          '{:2.2f}'.format(elapsed) + ' seconds (' + '{:2.3f}'.format(total_out / elapsed / 1e6 if elapsed else 0.0) +
+          ' MB/s out)')
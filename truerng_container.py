@@ -0,0 +1,473 @@
+#!/usr/bin/python3
+
+# TrueRNG Capture Container
+# 10/19/2026
+#
+# Requires Python 3.8, numpy (pyserial to capture, crc32c to checksum quickly)
+#
+# On Linux - may need to be root or set /dev/tty port permissions to 666
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Numpy package with:   python -m pip install numpy
+# Install Crc32c package with:   python -m pip install crc32c
+#
+# Raw .data / random.bin captures don't say which device, mode or time they came
+# from and corruption in the middle goes unnoticed.  A .trng container is:
+#
+#   header    'TRNGCAP1', version, JSON metadata (serial, model, firmware, mode,
+#             rates, block size, times) padded to HEADER_SIZE
+#   payload   the captured bytes, unchanged and contiguous, in fixed size blocks
+#   index     per block: capture time (ns since the epoch), length and CRC32C
+#   footer    index offset, block count, payload size, CRC32C of the index, 'TRNGIDX1'
+#
+# The payload is contiguous so a reader can memory map it and hand analyzers zero
+# copy views (truerng_analyze.py opens containers directly), block i is at a fixed
+# offset (O(1) random access) and the index is found from the footer.  A capture
+# that was interrupted has no index; 'repair' rebuilds it from the payload.
+#
+# CRC32C uses the crc32c package when installed, otherwise a numpy version that
+# checksums many slices of a block at once and combines them.
+#
+# truerng_container.py capture [PORT] [--bytes N] [--out FILE.trng]
+# truerng_container.py wrap RAWFILE FILE.trng [--serial S --model M --firmware F --mode MODE]
+# truerng_container.py info | verify | repair FILE.trng
+# truerng_container.py export FILE.trng [OUT|-]     (raw bytes for ent, rngtest and dieharder)
+# Linux example:  python3 truerng_container.py export capture.trng - | dieharder -a -g 200
+
+import argparse
+import json
+import mmap
+import os
+import socket
+import struct
+import sys
+import time
+
+import numpy as np
+
+MAGIC = b'TRNGCAP1'
+FOOTER_MAGIC = b'TRNGIDX1'
+VERSION = 1
+
+# Space reserved for the header (the payload starts page aligned after it)
+HEADER_SIZE = 4096
+
+# Payload bytes per block
+BLOCK_SIZE = 1 << 20
+
+# magic, version, metadata length
+HEADER = struct.Struct('<8sII')
+
+# index offset, blocks, payload bytes, index CRC32C, magic
+FOOTER = struct.Struct('<QQQI4x8s')
+
+# One index record per block
+INDEX_DTYPE = np.dtype([('time_ns', '<u8'), ('length', '<u4'), ('crc', '<u4')])
+
+# Bytes per slice for the numpy CRC32C
+CRC_LANE = 256
+
+
+##########
+# CRC32C #
+##########
+# Castagnoli polynomial, reflected
+CRC_POLY = 0x82F63B78
+
+
+def _crc_table():
+    table = np.zeros(256, dtype=np.uint32)
+    for i in range(256):
+        c = i
+        for _ in range(8):
+            c = (c >> 1) ^ CRC_POLY if c & 1 else c >> 1
+        table[i] = c
+    return table
+
+
+CRC_TABLE = _crc_table()
+CRC_TABLE_LIST = [int(v) for v in CRC_TABLE]
+
+
+# Register after n zero bytes starting from x, as four byte tables (the CRC register
+# update is linear, so it is the XOR of the images of each byte of x)
+def _zeros_tables(n):
+    columns = []
+    for bit in range(32):
+        r = 1 << bit
+        for _ in range(n):
+            r = CRC_TABLE_LIST[r & 0xFF] ^ (r >> 8)
+        columns.append(r)
+    tables = []
+    for k in range(4):
+        table = [0] * 256
+        for v in range(256):
+            x = 0
+            for bit in range(8):
+                if v >> bit & 1:
+                    x ^= columns[8 * k + bit]
+            table[v] = x
+        tables.append(table)
+    return tables
+
+
+CRC_LANE_TABLES = _zeros_tables(CRC_LANE)
+
+
+##########################
+# Function: crc32c_numpy #
+##########################
+# CRC32C of data continuing from crc (0 to start).  Checksums len // CRC_LANE slices
+# side by side with numpy (from a zero register), then chains them: the register
+# after a slice is the register before it pushed through CRC_LANE zero bytes XOR
+# the slice's own checksum.
+def crc32c_numpy(data, crc=0):
+    buf = np.frombuffer(data, dtype=np.uint8)
+    lanes = len(buf) // CRC_LANE
+    register = crc ^ 0xFFFFFFFF
+    if lanes:
+        block = buf[:lanes * CRC_LANE].reshape(lanes, CRC_LANE)
+        r = np.zeros(lanes, dtype=np.uint32)
+        for j in range(CRC_LANE):
+            r = CRC_TABLE[(r ^ block[:, j]) & 0xFF] ^ (r >> 8)
+        t0, t1, t2, t3 = CRC_LANE_TABLES
+        for g in r.tolist():
+            register = (t0[register & 0xFF] ^ t1[(register >> 8) & 0xFF] ^ t2[(register >> 16) & 0xFF] ^
+                        t3[register >> 24] ^ g)
+    table = CRC_TABLE_LIST
+    for b in buf[lanes * CRC_LANE:].tolist():
+        register = table[(register ^ b) & 0xFF] ^ (register >> 8)
+    return register ^ 0xFFFFFFFF
+
+
+try:
+    from crc32c import crc32c
+except ImportError:
+    crc32c = crc32c_numpy
+
+
+##########################
+# Class: ContainerWriter #
+##########################
+# Writes a container.  metadata is stored in the header (block_size, version and
+# the times are added); close() writes the index and footer and updates the header
+# with the payload size and, for data read live from a device, the measured rate.
+class ContainerWriter:
+    def __init__(self, path, metadata=None, block_size=BLOCK_SIZE, live=True):
+        self.path = path
+        self.block_size = block_size
+        self.live = live
+        self.metadata = dict(metadata or {})
+        self.metadata.update({'version': VERSION, 'block_size': block_size, 'crc': 'crc32c',
+                              'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'created_ns': time.time_ns(),
+                              'host': socket.gethostname()})
+        self.fp = open(path, 'wb')
+        self.write_header()
+        self.pending = bytearray()
+        self.block_started = None
+        self.records = []
+        self.payload_bytes = 0
+
+    def write_header(self):
+        text = json.dumps(self.metadata, sort_keys=True).encode('utf-8')
+        if HEADER.size + len(text) > HEADER_SIZE:
+            raise ValueError('metadata is ' + str(len(text)) + ' bytes, the header holds ' +
+                             str(HEADER_SIZE - HEADER.size))
+        self.fp.seek(0)
+        self.fp.write(HEADER.pack(MAGIC, VERSION, len(text)) + text)
+        self.fp.write(b'\x00' * (HEADER_SIZE - HEADER.size - len(text)))
+
+    # Capture time of a block is when its first byte was written
+    def write(self, data):
+        if self.block_started is None:
+            self.block_started = time.time_ns()
+        self.pending += data
+        while len(self.pending) >= self.block_size:
+            self.write_block(bytes(self.pending[:self.block_size]))
+            del self.pending[:self.block_size]
+            self.block_started = time.time_ns() if self.pending else None
+
+    def write_block(self, block):
+        self.fp.write(block)
+        self.records.append((self.block_started, len(block), crc32c(block)))
+        self.payload_bytes += len(block)
+
+    def close(self):
+        if self.fp is None:
+            return
+        if self.pending:
+            self.write_block(bytes(self.pending))
+            self.pending = bytearray()
+        index = np.array(self.records, dtype=INDEX_DTYPE).tobytes()
+        index_offset = HEADER_SIZE + self.payload_bytes
+        self.fp.write(index)
+        self.fp.write(FOOTER.pack(index_offset, len(self.records), self.payload_bytes, crc32c(index),
+                                  FOOTER_MAGIC))
+        closed = time.time_ns()
+        self.metadata.update({'payload_bytes': self.payload_bytes, 'blocks': len(self.records),
+                              'closed': time.strftime('%Y-%m-%dT%H:%M:%S'), 'closed_ns': closed})
+        if self.live and self.records and closed > self.records[0][0]:
+            self.metadata['measured_rate_mbits'] = self.payload_bytes * 8 / ((closed - self.records[0][0]) / 1e3)
+        self.write_header()
+        self.fp.close()
+        self.fp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+##########################
+# Class: ContainerReader #
+##########################
+# Memory maps a container.  payload(), block() and view() return zero copy numpy
+# arrays; the index is a numpy array of INDEX_DTYPE records.
+class ContainerReader:
+    def __init__(self, path):
+        self.path = path
+        self.fp = open(path, 'rb')
+        self.file_size = os.fstat(self.fp.fileno()).st_size
+        self.metadata = read_header(self.fp)
+        self.block_size = self.metadata['block_size']
+        if self.file_size < HEADER_SIZE + FOOTER.size:
+            raise ValueError(path + ' has no index (interrupted capture?): use repair')
+        self.fp.seek(self.file_size - FOOTER.size)
+        index_offset, self.blocks, self.payload_size, index_crc, magic = FOOTER.unpack(self.fp.read(FOOTER.size))
+        if magic != FOOTER_MAGIC or index_offset + self.blocks * INDEX_DTYPE.itemsize + FOOTER.size != \
+                self.file_size:
+            raise ValueError(path + ' has no index (interrupted capture?): use repair')
+        self.map = mmap.mmap(self.fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = np.frombuffer(self.map, dtype=INDEX_DTYPE, count=self.blocks, offset=index_offset)
+        if crc32c(self.index) != index_crc:
+            raise ValueError(path + ': index CRC32C mismatch')
+
+    def payload(self):
+        return np.frombuffer(self.map, dtype=np.uint8, count=self.payload_size, offset=HEADER_SIZE)
+
+    # Payload bytes [start, end)
+    def view(self, start, end):
+        end = min(end, self.payload_size)
+        if end <= start:
+            return np.zeros(0, dtype=np.uint8)
+        return np.frombuffer(self.map, dtype=np.uint8, count=end - start, offset=HEADER_SIZE + start)
+
+    def block(self, i):
+        return self.view(i * self.block_size, i * self.block_size + int(self.index[i]['length']))
+
+    def block_for_offset(self, offset):
+        return offset // self.block_size
+
+    # Last block whose capture started at or before time_ns
+    def block_at_time(self, time_ns):
+        return max(0, int(np.searchsorted(self.index['time_ns'], time_ns, side='right')) - 1)
+
+    # Indexes of the blocks whose CRC32C doesn't match
+    def verify(self):
+        return [i for i in range(self.blocks) if crc32c(self.block(i)) != int(self.index[i]['crc'])]
+
+    # Writes payload bytes [start, end) to a file object without copying them first
+    def export(self, fp, start=0, end=None, chunk=16 * BLOCK_SIZE):
+        end = self.payload_size if end is None else min(end, self.payload_size)
+        view = memoryview(self.map)
+        for a in range(start, end, chunk):
+            fp.write(view[HEADER_SIZE + a:HEADER_SIZE + min(a + chunk, end)])
+        view.release()
+
+    def close(self):
+        # Views handed out must be gone before the map can close
+        self.index = None
+        if self.map is not None:
+            try:
+                self.map.close()
+            except BufferError:
+                pass
+            self.map = None
+        self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+#########################
+# Function: read_header #
+#########################
+def read_header(fp):
+    fp.seek(0)
+    head = fp.read(HEADER_SIZE)
+    if len(head) < HEADER.size:
+        raise ValueError('not a TrueRNG container')
+    magic, version, length = HEADER.unpack(head[:HEADER.size])
+    if magic != MAGIC:
+        raise ValueError('not a TrueRNG container')
+    if version > VERSION:
+        raise ValueError('container version ' + str(version) + ' is newer than this reader')
+    return json.loads(head[HEADER.size:HEADER.size + length].decode('utf-8'))
+
+
+##########################
+# Function: is_container #
+##########################
+def is_container(path):
+    with open(path, 'rb') as fp:
+        return fp.read(len(MAGIC)) == MAGIC
+
+
+###########################
+# Function: payload_range #
+###########################
+# (offset, size) of the payload of a container in its file, so it can be mapped
+# like a raw capture
+def payload_range(path):
+    with ContainerReader(path) as reader:
+        return HEADER_SIZE, reader.payload_size
+
+
+####################
+# Function: repair #
+####################
+# Rebuilds the index and footer of an interrupted capture from the payload on disk
+# (block times are unknown and set to the creation time).  Returns the block count.
+def repair(path):
+    with open(path, 'r+b') as fp:
+        metadata = read_header(fp)
+        size = os.fstat(fp.fileno()).st_size
+        block_size = metadata['block_size']
+        payload_bytes = size - HEADER_SIZE
+        fp.seek(size - FOOTER.size)
+        footer = FOOTER.unpack(fp.read(FOOTER.size)) if size >= HEADER_SIZE + FOOTER.size else None
+        if footer and footer[4] == FOOTER_MAGIC:
+            payload_bytes = footer[2]
+        records = []
+        fp.seek(HEADER_SIZE)
+        for offset in range(0, payload_bytes, block_size):
+            block = fp.read(min(block_size, payload_bytes - offset))
+            records.append((metadata['created_ns'], len(block), crc32c(block)))
+        index = np.array(records, dtype=INDEX_DTYPE).tobytes()
+        fp.seek(HEADER_SIZE + payload_bytes)
+        fp.truncate()
+        fp.write(index)
+        fp.write(FOOTER.pack(HEADER_SIZE + payload_bytes, len(records), payload_bytes, crc32c(index), FOOTER_MAGIC))
+    return len(records)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='TrueRNG capture containers')
+    sub = parser.add_subparsers(dest='command')
+    capture = sub.add_parser('capture', help='capture MODE_NORMAL data from a device into a container')
+    capture.add_argument('port', nargs='?', default=None, help='com port to read (default first TrueRNG found)')
+    capture.add_argument('--bytes', type=int, default=1024 * 1024 * 100)
+    capture.add_argument('--out', default=None, help='default MODEL_YYYYMMDD.HHMMSS.trng')
+    capture.add_argument('--block-size', type=int, default=BLOCK_SIZE)
+    wrap = sub.add_parser('wrap', help='put a raw capture file in a container')
+    wrap.add_argument('raw')
+    wrap.add_argument('out')
+    for name in ('serial', 'model', 'firmware'):
+        wrap.add_argument('--' + name)
+    wrap.add_argument('--mode', default='MODE_NORMAL')
+    wrap.add_argument('--block-size', type=int, default=BLOCK_SIZE)
+    for name, text in (('info', 'print the metadata and index summary'), ('verify', 'check every block CRC32C'),
+                       ('repair', 'rebuild the index of an interrupted capture')):
+        sub.add_parser(name, help=text).add_argument('filename')
+    export = sub.add_parser('export', help='write the raw payload for ent, rngtest and dieharder')
+    export.add_argument('filename')
+    export.add_argument('out', nargs='?', default='-', help='output file (default - for stdout)')
+    args = parser.parse_args()
+
+    if args.command in ('info', 'verify', 'export'):
+        try:
+            reader = ContainerReader(args.filename)
+        except (OSError, ValueError) as e:
+            print(str(e))
+            sys.exit(1)
+
+    if args.command == 'capture':
+        from serial.tools import list_ports
+        import truerng_device
+        ids = {'04D8:F5FE': 'TrueRNG', '16D0:0AA0': 'TrueRNGpro', '04D8:EBB5': 'TrueRNGproV2'}
+        port, model, serial_number = args.port, None, None
+        for temp in list_ports.comports():
+            for vidpid, name in ids.items():
+                if vidpid in temp[2] and (port is None or temp[0] == port):
+                    port, model, serial_number = temp[0], name, temp.serial_number
+        if port is None:
+            print('No TrueRNG devices detected')
+            sys.exit(1)
+        firmware = None
+        if os.name == 'posix':
+            import truerng_sysfs
+            firmware = truerng_sysfs.firmware_revision(port)
+        if model in ('TrueRNGpro', 'TrueRNGproV2'):
+            truerng_device.modeChange('MODE_NORMAL', port)
+        out = args.out or str(model or 'TrueRNG') + '_' + time.strftime('%Y%m%d.%H%M%S') + '.trng'
+        metadata = {'serial': serial_number, 'model': model, 'firmware': firmware, 'mode': 'MODE_NORMAL',
+                    'port': port, 'source': 'truerng_container.py capture'}
+        ser = truerng_device.open_port(port, 10)
+        print('Capturing ' + str(args.bytes) + ' bytes from ' + port + ' to ' + out)
+        with ContainerWriter(out, metadata, args.block_size) as writer:
+            while writer.payload_bytes + len(writer.pending) < args.bytes:
+                data = ser.read(min(args.block_size, args.bytes - writer.payload_bytes - len(writer.pending)))
+                if not data:
+                    print('Read Failed!!!')
+                    break
+                writer.write(data)
+        ser.close()
+        print(str(writer.payload_bytes) + ' bytes in ' + str(len(writer.records)) + ' blocks at ' +
+              '{:2.3f}'.format(writer.metadata.get('measured_rate_mbits', 0.0)) + ' Mbits/s')
+
+    elif args.command == 'wrap':
+        metadata = {'serial': args.serial, 'model': args.model, 'firmware': args.firmware, 'mode': args.mode,
+                    'source': os.path.abspath(args.raw)}
+        with open(args.raw, 'rb') as fp, ContainerWriter(args.out, metadata, args.block_size, live=False) as writer:
+            while True:
+                data = fp.read(args.block_size)
+                if not data:
+                    break
+                writer.write(data)
+        print(args.raw + ' -> ' + args.out + ' (' + str(len(writer.records)) + ' blocks)')
+
+    elif args.command == 'info':
+        with reader:
+            for key, value in sorted(reader.metadata.items()):
+                print(key.ljust(20) + ': ' + str(value))
+            if reader.blocks:
+                times = reader.index['time_ns']
+                print('index'.ljust(20) + ': ' + str(reader.blocks) + ' blocks, ' +
+                      time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(int(times[0]) / 1e9)) + ' to ' +
+                      time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(int(times[-1]) / 1e9)))
+
+    elif args.command == 'verify':
+        before = time.perf_counter()
+        with reader:
+            bad = reader.verify()
+            size = reader.payload_size
+            for i in bad:
+                print('*** FAILED *** block ' + str(i) + ' (payload bytes ' + str(i * reader.block_size) + ' - ' +
+                      str(i * reader.block_size + int(reader.index[i]['length'])) + ') CRC32C mismatch')
+        elapsed = time.perf_counter() - before
+        if not bad:
+            print('*** PASSED *** ' + str(size) + ' bytes in ' + '{:2.2f}'.format(elapsed) + ' seconds (' +
+                  '{:2.1f}'.format(size / 1e6 / max(elapsed, 1e-9)) + ' MB/s)')
+        sys.exit(1 if bad else 0)
+
+    elif args.command == 'repair':
+        print(args.filename + ': index rebuilt for ' + str(repair(args.filename)) + ' blocks')
+
+    elif args.command == 'export':
+        with reader:
+            if args.out == '-':
+                try:
+                    reader.export(sys.stdout.buffer)
+                except BrokenPipeError:
+                    pass
+            else:
+                with open(args.out, 'wb') as fp:
+                    reader.export(fp)
+
+    else:
+        parser.print_help()
+        sys.exit(1)
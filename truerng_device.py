@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+
+# TrueRNG Device Helpers
+# 10/19/2026
+#
+# Requires Python 3.8, pyserial
+#
+# On Linux - may need to be root or set /dev/tty port permissions to 666
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Pyserial package with:   python -m pip install pyserial
+#
+# Mode changes and port setup shared by the tools.  Opening the port at 110, 300
+# and 110 baud is the "knock"; the baud rate it is opened at next selects the mode
+# (the original example scripts keep their own modeChange).  set_dtr() starts the
+# data flowing on any port, including ones without modem lines, and open_port()
+# does the whole setup before reading.
+#
+# Example:
+#   ser = truerng_device.open_port('/dev/ttyACM0', timeout=10, mode='MODE_RAW_BIN')
+#
+# truerng_device.py PORT MODE
+# Linux example:  python3 truerng_device.py /dev/ttyACM0 MODE_NORMAL
+
+import argparse
+import time
+
+# Mode: baud rate that selects it (modes other than MODE_NORMAL only have effect on
+# the TrueRNGpro and TrueRNGproV2)
+MODES = {'MODE_NORMAL': 300,              # Streams combined + Mersenne Twister
+         'MODE_PSDEBUG': 1200,            # PS Voltage in mV in ASCII
+         'MODE_RNGDEBUG': 2400,           # RNG Debug 0x0RRR 0x0RRR in ASCII
+         'MODE_RNG1WHITE': 4800,          # RNG1 + Mersenne Twister
+         'MODE_RNG2WHITE': 9600,          # RNG2 + Mersenne Twister
+         'MODE_RAW_BIN': 19200,           # Raw ADC Samples in Binary Mode
+         'MODE_RAW_ASC': 38400,           # Raw ADC Samples in Ascii Mode
+         'MODE_UNWHITENED': 57600,        # Unwhitened RNG1-RNG2 (TrueRNGproV2 Only)
+         'MODE_NORMAL_ASC': 115200,       # Normal in Ascii Mode (TrueRNGproV2 Only)
+         'MODE_NORMAL_ASC_SLOW': 230400}  # Normal in Ascii Mode - Slow for small devices (TrueRNGproV2 Only)
+
+
+########################
+# Function: modeChange #
+########################
+def modeChange(MODE, PORT):
+    import serial
+    if MODE not in MODES:
+        raise ValueError('unknown mode ' + str(MODE) + ' (one of ' + ', '.join(MODES) + ')')
+    # "Knock" Sequence to activate mode change
+    ser = serial.Serial(port=PORT,baudrate=110,timeout=1)
+    time.sleep(0.5)
+    ser.close()
+    ser = serial.Serial(port=PORT,baudrate=300,timeout=1)
+    ser.close()
+    ser = serial.Serial(port=PORT,baudrate=110,timeout=1)
+    ser.close()
+    ser = serial.Serial(port=PORT,baudrate=MODES[MODE],timeout=1)
+    ser.close()
+
+
+#####################
+# Function: set_dtr #
+#####################
+# Sets Data Terminal Ready to start the data flowing.  Ports without modem lines
+# (ptys, such as truerng_simulator.py's) refuse it and don't need it.
+def set_dtr(ser):
+    try:
+        ser.setDTR(True)
+    except OSError:
+        pass
+
+
+#######################
+# Function: open_port #
+#######################
+# Opens a port ready to read: changes to mode first if one is given, then starts the
+# data flowing and clears the receive buffer so no stale data is returned
+def open_port(port, timeout=10, mode=None):
+    import serial
+    if mode is not None:
+        modeChange(mode, port)
+    ser = serial.Serial(port=port, timeout=timeout)
+    set_dtr(ser)
+    ser.flushInput()
+    return ser
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Change the mode of a TrueRNGpro / TrueRNGproV2')
+    parser.add_argument('port')
+    parser.add_argument('mode', choices=list(MODES))
+    args = parser.parse_args()
+    modeChange(args.mode, args.port)
+    print('Changed ' + args.port + ' to ' + args.mode)
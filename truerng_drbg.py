@@ -0,0 +1,308 @@
+#!/usr/bin/python3
+
+# TrueRNG Seeded DRBG Expansion
+# 10/19/2026
+#
+# Requires Python 3.8, pyserial (cryptography for the ctr and chacha20 generators)
+#
+# On Linux - may need to be root or set /dev/tty port permissions to 666
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Pyserial package with:   python -m pip install pyserial
+# Install Cryptography package with:   python -m pip install cryptography
+#
+# A TrueRNGpro gives about 3.3 Mbits/s.  For consumers that need far more, this seeds
+# a deterministic random bit generator from device bytes and streams its output:
+#
+#   hmac       SP 800-90A HMAC_DRBG with SHA-256 (standard library only, ~10 MB/s)
+#   ctr        SP 800-90A CTR_DRBG with AES-256, no derivation function (the device
+#              bytes are hashed with SHA-384 into the 384 bit seed), output is AES-CTR
+#              keystream so it runs at memory speed
+#   chacha20   ChaCha20 keystream with fast key erasure: the first 32 bytes of every
+#              request become the next key
+#
+# Each is reseeded from the device every --reseed-mb of output or --reseed-seconds,
+# whichever comes first.  With --prediction-resistance every request is preceded by
+# a reseed, so output can't be predicted from an earlier state; throughput is then
+# bounded by the device.
+#
+# Example:
+#   stream = truerng_drbg.SeededStream(ser.read, 'ctr', reseed_bytes=1 << 30, reseed_seconds=60)
+#   data = stream.read(100 * 1024 * 1024)
+#
+# truerng_drbg.py [PORT] [--generator ctr] [--bytes N] [--out FILE|-] [--reseed-mb 1024] [--reseed-seconds 60]
+#                 [--prediction-resistance]
+# Linux example:  python3 truerng_drbg.py /dev/ttyACM0 --bytes 0 --out - | dieharder -a -g 200
+
+import argparse
+import hashlib
+import hmac
+import os
+import sys
+import time
+
+# Device bytes read for each instantiate / reseed (twice the 256 bit security strength)
+ENTROPY_BYTES = 64
+
+# Largest generate request (SP 800-90A limit of 2^19 bits for HMAC_DRBG and CTR_DRBG)
+MAX_REQUEST = 1 << 16
+
+# Requests before a reseed is required (SP 800-90A allows 2^48)
+RESEED_INTERVAL = 1 << 48
+
+# Default reseed triggers
+RESEED_BYTES = 1 << 30
+RESEED_SECONDS = 60.0
+
+# Bytes written at a time by the command line
+WRITE_SIZE = 1 << 20
+
+
+###################
+# Class: HmacDrbg #
+###################
+# SP 800-90A HMAC_DRBG with SHA-256
+class HmacDrbg:
+    name = 'hmac'
+
+    def __init__(self, entropy, nonce=b'', personalization=b''):
+        self.key = b'\x00' * 32
+        self.value = b'\x01' * 32
+        self.update(entropy + nonce + personalization)
+        self.reseed_counter = 1
+
+    def update(self, provided=b''):
+        self.key = hmac.digest(self.key, self.value + b'\x00' + provided, 'sha256')
+        self.value = hmac.digest(self.key, self.value, 'sha256')
+        if provided:
+            self.key = hmac.digest(self.key, self.value + b'\x01' + provided, 'sha256')
+            self.value = hmac.digest(self.key, self.value, 'sha256')
+
+    def reseed(self, entropy, additional=b''):
+        self.update(entropy + additional)
+        self.reseed_counter = 1
+
+    def generate(self, n, additional=b''):
+        if n > MAX_REQUEST:
+            raise ValueError('request of ' + str(n) + ' bytes is over ' + str(MAX_REQUEST))
+        if self.reseed_counter > RESEED_INTERVAL:
+            raise RuntimeError('reseed required')
+        if additional:
+            self.update(additional)
+        key = self.key
+        value = self.value
+        blocks = []
+        for _ in range((n + 31) // 32):
+            value = hmac.digest(key, value, 'sha256')
+            blocks.append(value)
+        self.value = value
+        self.update(additional)
+        self.reseed_counter += 1
+        return b''.join(blocks)[:n]
+
+
+##################
+# Class: CtrDrbg #
+##################
+# SP 800-90A CTR_DRBG with AES-256 and no derivation function (seed material is
+# 48 bytes: the SHA-384 of the entropy input)
+class CtrDrbg:
+    name = 'ctr'
+    seed_length = 48
+
+    def __init__(self, entropy, nonce=b'', personalization=b''):
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+        self.cipher = Cipher
+        self.algorithms = algorithms
+        self.modes = modes
+        self.key = b'\x00' * 32
+        self.value = 0
+        self.update(self.seed_material(entropy + nonce, personalization))
+        self.reseed_counter = 1
+
+    def seed_material(self, entropy, extra=b''):
+        seed = hashlib.sha384(entropy).digest()
+        if extra:
+            extra = hashlib.sha384(extra).digest()
+            seed = bytes(a ^ b for a, b in zip(seed, extra))
+        return seed
+
+    # Keystream of n bytes from the counter block after self.value
+    def keystream(self, n):
+        counter = ((self.value + 1) % (1 << 128)).to_bytes(16, 'big')
+        encryptor = self.cipher(self.algorithms.AES(self.key), self.modes.CTR(counter)).encryptor()
+        return encryptor.update(bytes(n))
+
+    def update(self, provided=None):
+        temp = self.keystream(self.seed_length)
+        if provided:
+            temp = bytes(a ^ b for a, b in zip(temp, provided))
+        self.key = temp[:32]
+        self.value = int.from_bytes(temp[32:], 'big')
+
+    def reseed(self, entropy, additional=b''):
+        self.update(self.seed_material(entropy, additional))
+        self.reseed_counter = 1
+
+    def generate(self, n, additional=b''):
+        if n > MAX_REQUEST:
+            raise ValueError('request of ' + str(n) + ' bytes is over ' + str(MAX_REQUEST))
+        if self.reseed_counter > RESEED_INTERVAL:
+            raise RuntimeError('reseed required')
+        additional = self.seed_material(additional) if additional else None
+        if additional:
+            self.update(additional)
+        output = self.keystream(n)
+        self.value = (self.value + (n + 15) // 16) % (1 << 128)
+        self.update(additional)
+        self.reseed_counter += 1
+        return output
+
+
+##########################
+# Class: ChaChaGenerator #
+##########################
+# ChaCha20 keystream generator with fast key erasure.  Not an SP 800-90A DRBG, but
+# the same instantiate / reseed / generate interface.
+class ChaChaGenerator:
+    name = 'chacha20'
+
+    def __init__(self, entropy, nonce=b'', personalization=b''):
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms
+        self.cipher = Cipher
+        self.algorithms = algorithms
+        self.key = hashlib.sha256(entropy + nonce + personalization).digest()
+        self.reseed_counter = 1
+
+    def reseed(self, entropy, additional=b''):
+        self.key = hashlib.sha256(self.key + entropy + additional).digest()
+        self.reseed_counter = 1
+
+    def generate(self, n, additional=b''):
+        if additional:
+            self.key = hashlib.sha256(self.key + additional).digest()
+        encryptor = self.cipher(self.algorithms.ChaCha20(self.key, b'\x00' * 16), mode=None).encryptor()
+        output = encryptor.update(bytes(n + 32))
+        self.key = output[:32]
+        self.reseed_counter += 1
+        return output[32:]
+
+
+GENERATORS = {'hmac': HmacDrbg, 'ctr': CtrDrbg, 'chacha20': ChaChaGenerator}
+
+# Largest request per generate call for each generator
+REQUEST_SIZES = {'hmac': MAX_REQUEST, 'ctr': MAX_REQUEST, 'chacha20': 1 << 20}
+
+
+#######################
+# Class: SeededStream #
+#######################
+# Output of a generator seeded and reseeded from read_entropy(n) (for example a
+# serial port's read).  Reseeds after reseed_bytes of output or reseed_seconds,
+# and before every read() with prediction_resistance.
+class SeededStream:
+    def __init__(self, read_entropy, generator='ctr', reseed_bytes=RESEED_BYTES, reseed_seconds=RESEED_SECONDS,
+                 prediction_resistance=False, personalization=b''):
+        self.read_entropy = read_entropy
+        self.reseed_bytes = reseed_bytes
+        self.reseed_seconds = reseed_seconds
+        self.prediction_resistance = prediction_resistance
+        self.request_size = REQUEST_SIZES[generator]
+        self.reseeds = 0
+        self.entropy_bytes = 0
+        self.output_bytes = 0
+        nonce = time.time_ns().to_bytes(8, 'big') + os.getpid().to_bytes(4, 'big')
+        self.generator = GENERATORS[generator](self.entropy(), nonce, personalization)
+        self.since_reseed = 0
+        self.reseeded = time.monotonic()
+
+    def entropy(self):
+        data = self.read_entropy(ENTROPY_BYTES)
+        if len(data) < ENTROPY_BYTES:
+            raise OSError('entropy source returned ' + str(len(data)) + ' of ' + str(ENTROPY_BYTES) + ' bytes')
+        self.entropy_bytes += len(data)
+        return bytes(data)
+
+    def reseed(self, additional=b''):
+        self.generator.reseed(self.entropy(), additional)
+        self.reseeds += 1
+        self.since_reseed = 0
+        self.reseeded = time.monotonic()
+
+    def read(self, n, additional=b''):
+        if self.prediction_resistance:
+            self.reseed(additional)
+            additional = b''
+        chunks = []
+        remaining = n
+        while remaining > 0:
+            if (self.reseed_bytes and self.since_reseed >= self.reseed_bytes) or \
+                    (self.reseed_seconds and time.monotonic() - self.reseeded >= self.reseed_seconds):
+                self.reseed()
+            size = min(remaining, self.request_size)
+            if self.reseed_bytes:
+                size = min(size, max(1, self.reseed_bytes - self.since_reseed))
+            chunks.append(self.generator.generate(size, additional))
+            additional = b''
+            remaining -= size
+            self.since_reseed += size
+        self.output_bytes += n
+        return b''.join(chunks)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Stream DRBG output seeded from a TrueRNG')
+    parser.add_argument('port', nargs='?', default=None, help='com port to read (default first TrueRNG found)')
+    parser.add_argument('--generator', choices=list(GENERATORS), default='ctr')
+    parser.add_argument('--bytes', type=int, default=1048576, help='output bytes (0 = until interrupted)')
+    parser.add_argument('--out', default='drbg.bin', help='output file (- for stdout)')
+    parser.add_argument('--reseed-mb', type=float, default=RESEED_BYTES / 1048576.0,
+                        help='reseed after this many MiB of output (default 1024)')
+    parser.add_argument('--reseed-seconds', type=float, default=RESEED_SECONDS,
+                        help='reseed after this many seconds (default 60)')
+    parser.add_argument('--prediction-resistance', action='store_true',
+                        help='reseed from the device before every ' + str(WRITE_SIZE) + ' byte request')
+    args = parser.parse_args()
+
+    from serial.tools import list_ports
+    import truerng_device
+
+    port = args.port
+    model = None
+    for temp in list_ports.comports():
+        for vidpid, name in (('04D8:F5FE', 'TrueRNG'), ('16D0:0AA0', 'TrueRNGpro'), ('04D8:EBB5', 'TrueRNGproV2')):
+            if vidpid in temp[2] and (port is None or temp[0] == port):
+                port, model = temp[0], name
+    if port is None:
+        print('No TrueRNG devices detected')
+        sys.exit(1)
+
+    # Make sure the seed is whitened output (only has effect on the TrueRNGpro and TrueRNGproV2)
+    ser = truerng_device.open_port(port, 10, 'MODE_NORMAL' if model in ('TrueRNGpro', 'TrueRNGproV2') else None)
+
+    log = sys.stderr if args.out == '-' else sys.stdout
+    try:
+        stream = SeededStream(ser.read, args.generator, int(args.reseed_mb * 1048576), args.reseed_seconds,
+                              args.prediction_resistance)
+    except ImportError:
+        log.write('The ' + args.generator + ' generator needs the cryptography package '
+                  '(python -m pip install cryptography)\n')
+        sys.exit(1)
+
+    fp = sys.stdout.buffer if args.out == '-' else open(args.out, 'wb')
+    log.write('Expanding ' + port + ' with ' + args.generator + ' to ' + args.out + '\n')
+    before = time.perf_counter()
+    try:
+        while args.bytes == 0 or stream.output_bytes < args.bytes:
+            size = WRITE_SIZE if args.bytes == 0 else min(WRITE_SIZE, args.bytes - stream.output_bytes)
+            fp.write(stream.read(size))
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        elapsed = time.perf_counter() - before
+        ser.close()
+        if fp is not sys.stdout.buffer:
+            fp.close()
+    log.write(str(stream.output_bytes) + ' bytes in ' + '{:2.2f}'.format(elapsed) + ' seconds (' +
+              '{:2.1f}'.format(stream.output_bytes / elapsed / 1e6 if elapsed else 0.0) + ' MB/s) from ' +
+              str(stream.entropy_bytes) + ' device bytes, ' + str(stream.reseeds) + ' reseeds\n')
@@ -0,0 +1,308 @@
+#!/usr/bin/python3
+
+# TrueRNG Distribution Drift Detection
+# 10/19/2026
+#
+# Requires Python 3.8, numpy
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Numpy package with:   python -m pip install numpy
+#
+# The limits in truerng_test.py (TrueRNGproV2_Mean_Min, TrueRNGproV2_Std_Max, ...)
+# are wide enough for every device, so a noise source that slowly degrades passes
+# until it fails outright.  This keeps a baseline histogram per device serial number
+# for each channel (the NORMAL mode byte histogram, the RAW_ASC gen1 / gen2 10 bit
+# ADC histograms and the UNWHITENED histogram) and compares new runs against it.
+#
+# The first BASELINE_RUNS runs of a device build its baseline.  After that each run
+# is added to an exponentially weighted histogram of recent runs (each update costs
+# O(bins) and nothing old is re-read) which is compared to the baseline with a two
+# sample chi-square test and the two sample Kolmogorov-Smirnov distance.  A channel
+# has drifted when either p-value is below ALPHA.
+#
+# Baselines are kept in a JSON file.  truerng_test.py --drift FILE and
+# truerng_soak.py --drift FILE update it after every run / window.
+#
+# truerng_drift.py [--file truerng_baselines.json] show
+# truerng_drift.py [--file truerng_baselines.json] update SERIAL CAPTUREFILE   (NORMAL mode capture)
+# truerng_drift.py [--file truerng_baselines.json] reset SERIAL
+# Linux example:  python3 truerng_drift.py update 1A2B3C4D TrueRNGpro_20200614.120000.data
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+import truerng_analyze
+
+# Baseline file used when none is given
+DEFAULT_FILE = 'truerng_baselines.json'
+
+# Channels and their number of bins
+CHANNELS = {'normal': 256, 'gen1': 1024, 'gen2': 1024, 'unwhitened': 512}
+
+# Runs that make up a new baseline
+BASELINE_RUNS = 5
+
+# Weight kept by the recent histogram at each update (0.8 = about the last 5 runs)
+DECAY = 0.8
+
+# A p-value below this is drift (about one false alarm per 10000 runs per test)
+ALPHA = 1e-4
+
+# Bins with fewer expected counts than this are pooled for the chi-square test
+MIN_EXPECTED = 5.0
+
+
+##################################
+# Function: chisquare_two_sample #
+##################################
+# Chi-square test that two histograms come from the same distribution.  n_b is the
+# number of samples b stands for (less than b.sum() for a weighted histogram).
+# Returns (chisquare, degrees of freedom, p-value).
+def chisquare_two_sample(a, b, n_b=None):
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    n_a = a.sum()
+    total_b = b.sum()
+    if n_b is None:
+        n_b = total_b
+    if n_a <= 0 or total_b <= 0 or n_b <= 0:
+        return 0.0, 0, 1.0
+    b = b * (n_b / total_b)
+
+    # Pool the sparse bins (the tails of the ADC histograms) into one
+    expected = (a + b) * min(n_a, n_b) / (n_a + n_b)
+    sparse = expected < MIN_EXPECTED
+    if sparse.any():
+        a = np.append(a[~sparse], a[sparse].sum())
+        b = np.append(b[~sparse], b[sparse].sum())
+    used = (a + b) > 0
+    a = a[used]
+    b = b[used]
+    if len(a) < 2:
+        return 0.0, 0, 1.0
+
+    ratio = math.sqrt(n_b / n_a)
+    chisq = float((((a * ratio - b / ratio) ** 2) / (a + b)).sum())
+    df = len(a) - 1
+    return chisq, df, truerng_analyze.chisquare_pvalue(chisq, df)
+
+
+###########################
+# Function: ks_two_sample #
+###########################
+# Two sample Kolmogorov-Smirnov distance between two histograms over the same
+# ordered bins and its asymptotic p-value.  Returns (distance, p-value).
+def ks_two_sample(a, b, n_b=None):
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    n_a = a.sum()
+    total_b = b.sum()
+    if n_b is None:
+        n_b = total_b
+    if n_a <= 0 or total_b <= 0 or n_b <= 0:
+        return 0.0, 1.0
+    distance = float(np.abs(np.cumsum(a) / n_a - np.cumsum(b) / total_b).max())
+    n = n_a * n_b / (n_a + n_b)
+    x = (math.sqrt(n) + 0.12 + 0.11 / math.sqrt(n)) * distance
+    # Kolmogorov distribution
+    p = 2.0 * sum((-1) ** (k - 1) * math.exp(-2.0 * k * k * x * x) for k in range(1, 101))
+    return distance, min(1.0, max(0.0, p))
+
+
+#######################
+# Class: ChannelDrift #
+#######################
+# Baseline and recent histograms of one channel of one device
+class ChannelDrift:
+    def __init__(self, bins):
+        self.baseline = np.zeros(bins, dtype=np.float64)
+        self.baseline_runs = 0
+        self.recent = np.zeros(bins, dtype=np.float64)
+        # Sums of the run weights and squared weights (for the effective sample size)
+        self.weight = 0.0
+        self.weight_squared = 0.0
+        self.recent_samples = 0.0
+        self.runs = 0
+        self.last = None
+
+    # Adds a run.  Returns None while the baseline is being built, otherwise a
+    # dictionary with the test results.
+    def update(self, counts, baseline_runs=BASELINE_RUNS, decay=DECAY, alpha=ALPHA):
+        counts = np.asarray(counts, dtype=np.float64)
+        self.runs += 1
+        if self.baseline_runs < baseline_runs:
+            self.baseline += counts
+            self.baseline_runs += 1
+            return None
+
+        # Exponentially weighted histogram of recent runs: every sample of the run k
+        # updates ago has weight w = decay^k, so the effective sample size (Kish) is
+        # (sum w n)^2 / sum w^2 n.
+        n = counts.sum()
+        self.recent = self.recent * decay + counts
+        self.recent_samples = self.recent_samples * decay + n
+        self.weight = self.weight * decay + n
+        self.weight_squared = self.weight_squared * decay * decay + n
+        effective = self.weight * self.weight / self.weight_squared if self.weight_squared else 0.0
+
+        chisq, df, chisq_p = chisquare_two_sample(self.baseline, self.recent, effective)
+        distance, ks_p = ks_two_sample(self.baseline, self.recent, effective)
+        recent_mean = float((self.recent * np.arange(len(self.recent))).sum() / self.recent.sum()) \
+            if self.recent.sum() else None
+        baseline_mean = float((self.baseline * np.arange(len(self.baseline))).sum() / self.baseline.sum()) \
+            if self.baseline.sum() else None
+        self.last = {'chisquare': chisq, 'df': df, 'chisquare_p': chisq_p, 'ks_distance': distance,
+                     'ks_p': ks_p, 'effective_samples': effective, 'baseline_mean': baseline_mean,
+                     'recent_mean': recent_mean, 'drift': chisq_p < alpha or ks_p < alpha}
+        return self.last
+
+    def to_dict(self):
+        return {'baseline': self.baseline.tolist(), 'baseline_runs': self.baseline_runs,
+                'recent': self.recent.tolist(), 'weight': self.weight, 'weight_squared': self.weight_squared,
+                'recent_samples': self.recent_samples, 'runs': self.runs, 'last': self.last}
+
+    @classmethod
+    def from_dict(cls, values):
+        channel = cls(len(values['baseline']))
+        channel.baseline = np.array(values['baseline'], dtype=np.float64)
+        channel.baseline_runs = values['baseline_runs']
+        channel.recent = np.array(values['recent'], dtype=np.float64)
+        channel.weight = values['weight']
+        channel.weight_squared = values['weight_squared']
+        channel.recent_samples = values['recent_samples']
+        channel.runs = values['runs']
+        channel.last = values.get('last')
+        return channel
+
+
+#################################
+# Function: channels_from_lists #
+#################################
+# Channel histograms from the lists truerng_test.run_device_tests() returns.  The
+# NORMAL mode list holds frequencies, so it needs the number of bytes read.
+def channels_from_lists(lists, normal_bytes=None):
+    channels = {}
+    if lists.get('normal') is not None and normal_bytes:
+        channels['normal'] = np.rint(np.asarray(lists['normal']) * normal_bytes)
+    if lists.get('raw_asc') is not None:
+        channels['gen1'] = lists['raw_asc'][:1024]
+        channels['gen2'] = lists['raw_asc'][1024:2048]
+    if lists.get('unwhitened') is not None:
+        channels['unwhitened'] = lists['unwhitened']
+    return channels
+
+
+#####################
+# Class: DriftStore #
+#####################
+# Baselines of every device in a JSON file
+class DriftStore:
+    def __init__(self, path=DEFAULT_FILE, baseline_runs=BASELINE_RUNS, decay=DECAY, alpha=ALPHA):
+        self.path = path
+        self.baseline_runs = baseline_runs
+        self.decay = decay
+        self.alpha = alpha
+        self.devices = {}
+        if os.path.exists(path):
+            with open(path) as fp:
+                for serial, channels in json.load(fp).items():
+                    self.devices[serial] = {name: ChannelDrift.from_dict(values)
+                                            for name, values in channels.items()}
+
+    # Adds a run of a device ({channel: histogram}) and returns {channel: result}
+    # (None for channels still building their baseline)
+    def update(self, serial, channels):
+        device = self.devices.setdefault(str(serial), {})
+        results = {}
+        for name, counts in channels.items():
+            if name not in device:
+                device[name] = ChannelDrift(len(counts))
+            results[name] = device[name].update(counts, self.baseline_runs, self.decay, self.alpha)
+        return results
+
+    def reset(self, serial):
+        return self.devices.pop(str(serial), None) is not None
+
+    # Written to a temporary file first so a crash never leaves half a file
+    def save(self):
+        data = {serial: {name: channel.to_dict() for name, channel in channels.items()}
+                for serial, channels in self.devices.items()}
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w') as fp:
+            json.dump(data, fp)
+        os.replace(temporary, self.path)
+
+
+# One line per channel in the style of truerng_test.py
+def format_results(results, baseline_runs=BASELINE_RUNS):
+    lines = []
+    for name, result in results.items():
+        if result is None:
+            lines.append('*** BASELINE *** ' + name + ' histogram added to the baseline')
+            continue
+        lines.append(('*** DRIFT ***  ' if result['drift'] else '*** PASSED *** ') + name +
+                     ' vs baseline: chi-square p ' + '{:1.2e}'.format(result['chisquare_p']) +
+                     ', KS distance ' + '{:1.5f}'.format(result['ks_distance']) +
+                     ' (p ' + '{:1.2e}'.format(result['ks_p']) + '), mean ' +
+                     '{:1.3f}'.format(result['recent_mean']) + ' (baseline ' +
+                     '{:1.3f}'.format(result['baseline_mean']) + ')')
+    return lines
+
+
+# Byte histogram of a capture file, read a chunk at a time
+def file_histogram(path):
+    counts = np.zeros(256, dtype=np.int64)
+    with open(path, 'rb') as fp:
+        while True:
+            data = fp.read(truerng_analyze.CHUNK_SIZE)
+            if not data:
+                break
+            counts += np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    return counts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Per device baseline histograms and drift detection')
+    parser.add_argument('--file', default=DEFAULT_FILE, help='baseline file (default ' + DEFAULT_FILE + ')')
+    parser.add_argument('--alpha', type=float, default=ALPHA, help='p-value that counts as drift')
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('show', help='the state of every device')
+    update = sub.add_parser('update', help='add the byte histogram of a NORMAL mode capture file')
+    update.add_argument('serial')
+    update.add_argument('capture')
+    reset = sub.add_parser('reset', help='forget a device so its next runs build a new baseline')
+    reset.add_argument('serial')
+    args = parser.parse_args()
+
+    store = DriftStore(args.file, alpha=args.alpha)
+    if args.command == 'show':
+        for serial, channels in sorted(store.devices.items()):
+            print(serial)
+            for name, channel in channels.items():
+                state = ('baseline ' + str(channel.baseline_runs) + ' of ' + str(store.baseline_runs) + ' runs'
+                         if channel.baseline_runs < store.baseline_runs else str(channel.runs) + ' runs')
+                if channel.last:
+                    state += ', last: ' + format_results({name: channel.last})[0]
+                print('    ' + name.ljust(10) + ' ' + state)
+    elif args.command == 'update':
+        before = time.perf_counter()
+        counts = file_histogram(args.capture)
+        for line in format_results(store.update(args.serial, {'normal': counts})):
+            print(line)
+        store.save()
+        print('(' + '{:2.1f}'.format(time.perf_counter() - before) + ' seconds)')
+    elif args.command == 'reset':
+        if store.reset(args.serial):
+            store.save()
+            print('Removed the baseline of ' + args.serial)
+        else:
+            print('No baseline for ' + args.serial)
+    else:
+        parser.print_help()
+        sys.exit(1)
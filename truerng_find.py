@@ -9,7 +9,6 @@
 #
 # Python 3.8.xx is available here: https://www.python.org/downloads/
 # Install Pyserial package with:   python -m pip install pyserial
-# Install Pyusb package with:   python -m pip install pyusb
 # Run this Python Script from the Windows command line:  py truerng_find.py OR truerng_find.py
 
 import serial
@@ -18,10 +17,12 @@ import sys
 import math
 import os
 import platform
-import usb
-import subprocess
 from serial.tools import list_ports
 
+# Firmware revisions come from sysfs on Linux
+if os.name == 'posix':
+    import truerng_sysfs
+
 if os.name == 'nt':
     from winregistry import WinRegistry as Reg
     def get_truerngs_from_registry():
@@ -165,18 +166,11 @@ try:
         for temp in ports_avaiable:
          #   print(temp[1] + ' : ' + temp[2])
             if '04D8:F5FE' in temp[2]:
-                command='lsusb -d 04d8:f5fe -v 2> /dev/null | grep bcdDevice'
-                result=subprocess.check_output(command, shell=True)
-                print(temp[0] + ' : TrueRNG       : No SN      ' + ' : Rev ' + str(result).split('  ')[-1].split('\\')[0])
+                print(temp[0] + ' : TrueRNG       : No SN      ' + ' : Rev ' + str(truerng_sysfs.firmware_revision(temp[0])))
             if '16D0:0AA0' in temp[2]:
-                command='lsusb -d 16d0:0aa0 -v 2> /dev/null | grep bcdDevice'
-                result=subprocess.check_output(command, shell=True)
-                print(temp[0] + ' : TrueRNGpro    : SN ' + temp.serial_number + ' : Rev ' + str(result).split('  ')[-1].split('\\')[0])
+                print(temp[0] + ' : TrueRNGpro    : SN ' + temp.serial_number + ' : Rev ' + str(truerng_sysfs.firmware_revision(temp[0])))
             if '04D8:EBB5' in temp[2]:
-                command='lsusb -d 04d8:ebb5 -v 2> /dev/null | grep bcdDevice'
-                result=subprocess.check_output(command, shell=True)
-                print(temp[0] + ' : TrueRNGpro V2 : SN ' + temp.serial_number + ' : Rev ' + str(result).split('  ')[-1].split('\\')[0])
-
+                print(temp[0] + ' : TrueRNGpro V2 : SN ' + temp.serial_number + ' : Rev ' + str(truerng_sysfs.firmware_revision(temp[0])))
 
     print('====================================================')
 
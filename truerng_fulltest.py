@@ -19,6 +19,8 @@ import time
 import sys
 import os
 from serial.tools import list_ports
+import truerng_device
+import truerng_reader
 
 # Number of loops
 numloops=14*1024     # Need 14GiB (14*1024) for Dieharder to not repeat data
@@ -146,12 +148,17 @@ except:
     print('Port Not Usable!')
     print('Do you have permissions set to read ' + rng_com_port + ' ?')
 
+# Read each block in pieces sized for a couple of reads per second with a timeout
+# from the measured rate, and record the latency and size of every read (see
+# truerng_reader.py).  A block is only short if nothing arrives for 10 seconds.
+ser = truerng_reader.AdaptiveReader(ser, target_reads_per_second=2)
+
 # Open the serial port if it isn't open
 if(ser.isOpen() == False):
     ser.open()
 
 # Set Data Terminal Ready to start flow
-ser.setDTR(True)
+truerng_device.set_dtr(ser)
 
 # This clears the receive buffer so we aren't using buffered data
 ser.flushInput()
@@ -164,9 +171,9 @@ for i in range(numloops):
 
     # Try to read the port and record the time before and after
     try:
-        before = time.time()    # in microseconds
+        before = time.perf_counter()    # in seconds
         x=ser.read(blocksize)   # read bytes from serial port
-        after = time.time()     # in microseconds
+        after = time.perf_counter()     # in seconds
     except:
         print('Read Failed!!!')
         break
@@ -179,7 +186,7 @@ for i in range(numloops):
         fp.write(x)
 
     # Calculate the rate
-    rate=float(blocksize) / ((after-before)*1000000.0) *8
+    rate=float(len(x)) / ((after-before)*1000000.0) *8
 
     # Write status
     sys.stdout.write(str(i+1) + ' of ' + str(numloops) + ' MiB (' + '{:2.1f}'.format((i+1)*100/numloops) + '%)Read at ' + '{:2.3f}'.format(rate) + ' Mbits/s' +'\r')
@@ -187,6 +194,10 @@ for i in range(numloops):
 # Close the serial port
 ser.close()
 
+print('')
+# Print read latency percentiles (stalls show up in p99 / p999 and the largest gap)
+print(ser.stats.report())
+
 # If the file is open then close it
 if fp != 0:
     fp.close()
@@ -1,8 +1,8 @@
-#!/bin/bash
-
-while true
-do
-	./truerng_fulltest.py
-	sleep 5
-done
-
+#!/bin/bash
+
+# Continuous burn-in.  truerng_soak.py finds the device and changes the mode once,
+# then captures into a fixed size ring of files and keeps only summaries and the
+# data of failing windows (options are passed on, see ./truerng_soak.py --help).
+# Use truerng_fulltest.py for a single 14GB capture with ent, rngtest and dieharder.
+
+exec ./truerng_soak.py "$@"
@@ -4,24 +4,76 @@
 # Chris K Cockrum
 # 7/23/20
 #
-# Requires Python 3.8, pyserial
+# Requires Python 3.8, pyserial, numpy
 #
 # On Linux - may need to be root or set /dev/tty port permissions to 666
 #
 # Python 3.8.xx is available here: https://www.python.org/downloads/
 # Install Pyserial package with:   python -m pip install pyserial
+# Install Numpy package with:   python -m pip install numpy
+#
+# With no options prints two example passwords.  Bulk mode:
+# truerng_generate_password.py --count N [--length L] [--alphabet printable|alnum|hex|digits|CHARACTERS] [--output FILE] [--port PORT]
+# Linux example:  python3 truerng_generate_password.py --count 10000 --length 16 --alphabet alnum --output passwords.txt
 
 import serial
 import os
+import sys
 import time
 import math
+import argparse
+import truerng_device
+import truerng_reader
+import truerng_sampler
 from serial.tools import list_ports
 
 # Number of random characters to generate
-NUMBER_OF_CHARACTERS = 20 
+NUMBER_OF_CHARACTERS = 20
+
+# Printable characters (ASCII 33 - 126)
+PRINTABLE_CHARACTERS = ''.join(chr(c) for c in range(33, 127))
+
+# Letters and numbers only
+ALPHANUMERIC_CHARACTERS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+# Alphabets that can be chosen by name in bulk mode
+ALPHABETS = {'printable': PRINTABLE_CHARACTERS,
+             'alnum': ALPHANUMERIC_CHARACTERS,
+             'hex': '0123456789abcdef',
+             'digits': '0123456789'}
+
+# Bytes read from the device at a time in bulk mode
+BULK_READ_SIZE = 64 * 1024
+
+# Seconds each read from the device has to complete in
+READ_DEADLINE = 10
+
+parser = argparse.ArgumentParser(description='Create random passwords from a TrueRNG')
+parser.add_argument('--count', type=int, default=0, help='bulk mode: number of passwords to generate')
+parser.add_argument('--length', type=int, default=NUMBER_OF_CHARACTERS, help='characters per password')
+parser.add_argument('--alphabet', default='printable',
+                    help='printable, alnum, hex, digits or the characters to use')
+parser.add_argument('--output', default='-', help='file to write passwords to (default stdout)')
+parser.add_argument('--port', default=None, help='com port to use (default first TrueRNG found)')
+args = parser.parse_args()
+
+# Bulk mode writes one password per line, so the alphabet has to be printable ASCII
+if args.count > 0:
+    alphabet = ALPHABETS.get(args.alphabet, args.alphabet)
+    if len(alphabet) == 0:
+        parser.error('--alphabet is empty')
+    if any(ord(c) < 33 or ord(c) > 126 for c in alphabet):
+        parser.error('--alphabet can only contain printable ASCII characters (no spaces)')
+    if args.length < 1:
+        parser.error('--length must be at least 1')
+
+# Keep status messages out of the password stream when writing to stdout
+if args.count > 0 and args.output == '-':
+    password_output = sys.stdout.buffer
+    sys.stdout = sys.stderr
 
 # Set com port to default None
-rng_com_port = None
+rng_com_port = args.port
 
 # Set mode (only has effect on TrueRNGpro and TrueRNGproV2)
 capture_mode = 'MODE_NORMAL'
@@ -122,70 +174,90 @@ if(ser.isOpen() == False):
     ser.open()
 
 # Set Data Terminal Ready to start flow
-ser.setDTR(True)
+truerng_device.set_dtr(ser)
 
 # This clears the receive buffer so we aren't using buffered data
 ser.flushInput()
 
-# Keep track of total bytes read
-totalbytes=0
-
-# Try to read the port and record the time before and after
-try:
-    x=ser.read(2048)   # read bytes from serial port
-except:
-    print('Read Failed!!!')
-
-# Set index for random buffer to zero
-index=0;
-
-print('Entropy')
-print('Printable Characters are   : 6.58 bits/char')
-print('Letter / Number Characters : 5.95 bits/char')
-
-print('==================================================')
-
-found=0
-
-password = '  Printable Characters Password: '
-
-# Loop on how many characters to generate
-while found < 20:
-    # Convert 3 bytes of random x values to one integer
-    temp = x[index]
-
-    # Increment to the next byte of random for the next loop
-    index=index+3
-
-    # Find the remainder mod wordlistlength (generates a number between 0 and (wordlistlength-1) )
-    # Ignore word if under 3 characters long
-    if (temp > 32) & (temp<127):
-        found=found+1
-        password = password + chr(temp)
-
-print(password)
-
-found=0
-
-password = 'Letters / Numbers Only Password: '
-
-# Loop on how many characters to generate
-while found < 20:
-    # Convert 3 bytes of random x values to one integer
-    temp = x[index]
-
-    # Increment to the next byte of random for the next loop
-    index=index+3
-
-    # Find the remainder mod wordlistlength (generates a number between 0 and (wordlistlength-1) )
-    # Ignore word if under 3 characters long
-    if ((temp >= 48) & (temp<=57)) | ((temp >= 65) & (temp<=90)) | ((temp >= 97) & (temp<=122)):
-        found=found+1
-        password = password + chr(temp)
-
-print(password)
-
-print('==================================================')
+#########################
+# Function: read_device #
+#########################
+# All of the requested bytes within READ_DEADLINE seconds, or EOFError saying how
+# many arrived (so a stalled device never leaves a short buffer behind)
+def read_device(size):
+    data = truerng_reader.read_deadline(ser, size, READ_DEADLINE)
+    if isinstance(data, truerng_reader.PartialRead):
+        raise EOFError(data.describe())
+    return data
+
+# Draw random numbers from the device as needed (unbiased, no wasted bytes)
+sampler = truerng_sampler.ByteSampler(read_device, refill_size=256)
+
+# Set if the device stopped before every password was generated
+read_failed = False
+
+if args.count > 0:
+    #############
+    # Bulk Mode #
+    #############
+    alphabet = ''.join(sorted(set(alphabet), key=alphabet.index))
+    sampler.refill_size = BULK_READ_SIZE
+
+    print('Passwords:       ' + str(args.count) + ' x ' + str(args.length) + ' characters')
+    print('Alphabet:        ' + str(len(alphabet)) + ' characters')
+    print('Entropy:         ' + '{:2.2f}'.format(truerng_sampler.string_entropy(len(alphabet), args.length)) +
+          ' bits per password')
+    print('==================================================')
+
+    if args.output != '-':
+        password_output = open(args.output, 'wb')
+
+    # Count what was actually written so a failed read can't report a full file
+    generated = 0
+    before = time.perf_counter()
+    try:
+        for chunk in sampler.strings(alphabet, args.length, args.count):
+            password_output.write(chunk)
+            generated += len(chunk) // (args.length + 1)
+    except EOFError as e:
+        print('Read Failed!!! ' + str(e))
+        read_failed = True
+    password_output.flush()
+    after = time.perf_counter()
+
+    if args.output != '-':
+        password_output.close()
+
+    print('==================================================')
+    print('Generated ' + str(generated) + ' of ' + str(args.count) + ' passwords in ' +
+          '{:2.2f}'.format(after-before) + ' seconds (' +
+          '{:2.0f}'.format(generated / max(after-before, 1e-9)) + ' passwords/s)')
+    print('Used ' + str(sampler.bytes_consumed) + ' bytes from the TrueRNG (' +
+          '{:2.2f}'.format(sampler.bits_per_output()) + ' bits per character, ' +
+          '{:2.1f}'.format(100.0*sampler.efficiency()) + '% efficiency)')
+    print('==================================================')
+
+else:
+    print('Entropy')
+    print('Printable Characters are   : ' + '{:1.2f}'.format(math.log2(len(PRINTABLE_CHARACTERS))) + ' bits/char')
+    print('Letter / Number Characters : ' + '{:1.2f}'.format(math.log2(len(ALPHANUMERIC_CHARACTERS))) + ' bits/char')
+
+    print('==================================================')
+
+    try:
+        password = ''.join(sampler.choice(PRINTABLE_CHARACTERS, NUMBER_OF_CHARACTERS))
+        print('  Printable Characters Password: ' + password)
+
+        password = ''.join(sampler.choice(ALPHANUMERIC_CHARACTERS, NUMBER_OF_CHARACTERS))
+        print('Letters / Numbers Only Password: ' + password)
+    except EOFError as e:
+        print('Read Failed!!! ' + str(e))
+        read_failed = True
+
+    print('==================================================')
+    print('Used ' + str(sampler.bytes_consumed) + ' bytes from the TrueRNG (' +
+          '{:2.2f}'.format(sampler.bits_per_output()) + ' bits per character)')
+    print('==================================================')
 
 # Close the serial port
 ser.close()
@@ -194,3 +266,7 @@ ser.close()
 # Pyserial screws this up
 if os.name == 'posix':
     os.system('stty -F '+rng_com_port+' min 1')
+
+# Scripts can tell a truncated output from a complete one
+if read_failed:
+    sys.exit(1)
@@ -4,18 +4,24 @@
 # Chris K Cockrum
 # 7/23/20
 #
-# Requires Python 3.8, pyserial, nltk
+# Requires Python 3.8, pyserial, numpy (nltk to build the wordlist index)
 #
 # On Linux - may need to be root or set /dev/tty port permissions to 666
 #
 # Python 3.8.xx is available here: https://www.python.org/downloads/
-# Install package with:   python -m pip install pyserial nltk
+# Install package with:   python -m pip install pyserial nltk numpy
+#
+# Build the wordlist index once with:   python3 truerng_wordlist.py build
+# Use another wordlist (like diceware):  python3 truerng_generate_words.py diceware.idx
 
 import serial
 import os
+import sys
 import time
-import nltk
 import math
+import truerng_device
+import truerng_sampler
+import truerng_wordlist
 from serial.tools import list_ports
 
 # Number of random words to generate
@@ -24,6 +30,16 @@ NUMBER_OF_WORDS = 20
 # Set com port to default None
 rng_com_port = None
 
+# Wordlist index built by truerng_wordlist.py
+wordlist_index = truerng_wordlist.DEFAULT_INDEX
+if len(sys.argv) >= 2:
+    wordlist_index = str(sys.argv[1])
+
+if not os.path.isfile(wordlist_index):
+    print(wordlist_index + ' Not Found')
+    print('Build it with:  python3 truerng_wordlist.py build')
+    exit()
+
 # Set mode (only has effect on TrueRNGpro and TrueRNGproV2)
 capture_mode = 'MODE_NORMAL'
 
@@ -122,53 +138,34 @@ if(ser.isOpen() == False):
     ser.open()
 
 # Set Data Terminal Ready to start flow
-ser.setDTR(True)
+truerng_device.set_dtr(ser)
 
 # This clears the receive buffer so we aren't using buffered data
 ser.flushInput()
 
-# Keep track of total bytes read
-totalbytes=0
-
-# Try to read the port and record the time before and after
-try:
-    x=ser.read(2048)   # read bytes from serial port
-except:
-    print('Read Failed!!!')
-
+# Draw random numbers from the device as needed (unbiased, no wasted bytes)
+sampler = truerng_sampler.ByteSampler(ser.read, refill_size=256)
 
-# Load the wordlist from nltk
-wordlist = nltk.corpus.words.words()
+# Open the precompiled wordlist (words from 3 to 9 characters long by default)
+wordlist = truerng_wordlist.Wordlist(wordlist_index)
 
-# Get the length of the wordlist 
+# Get the length of the wordlist
 wordlistlength = len(wordlist)
 
-# Set index for random buffer to zero
-index=0;
-
 print('Choosing 3 of these words would give a password with about ' + str(math.log(wordlistlength,2)*3)[0:4] + ' bits of entropy')
 
 print('==================================================')
 
-found=0
-
-# Loop on how many words to generate
-while found < 20:
-    # Convert 3 bytes of random x values to one integer
-    temp = x[index] + (x[index+1]*256) + (x[index+2]*65536)
-
-    # Increment to the next 3 bytes of random for the next loop
-    index=index+3
-
-    # Find the remainder mod wordlistlength (generates a number between 0 and (wordlistlength-1) )
-    temp=temp % wordlistlength
-
-    # Ignore word if under 3 characters long
-    if (len(wordlist[temp]) > 2) & (len(wordlist[temp]) < 10):
-        found=found+1
-        # Print a random word from the list
-        print(wordlist[temp])
+# Print random words from the list
+try:
+    for word in sampler.choice(wordlist, NUMBER_OF_WORDS):
+        print(word)
+except EOFError:
+    print('Read Failed!!!')
 
+print('==================================================')
+print('Used ' + str(sampler.bytes_consumed) + ' bytes from the TrueRNG (' +
+      '{:2.2f}'.format(sampler.bits_per_output()) + ' bits per word)')
 
 # Close the serial port
 ser.close()
@@ -0,0 +1,361 @@
+#!/usr/bin/python3
+
+# TrueRNG Metrics Exporter
+# 10/19/2026
+#
+# Requires Python 3.8, pyserial, numpy
+#
+# On Linux - may need to be root or set /dev/tty port permissions to 666
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Pyserial package with:   python -m pip install pyserial
+# Install Numpy package with:   python -m pip install numpy
+#
+# Reads every connected TrueRNG continuously and serves per device metrics in the
+# Prometheus text format on http://127.0.0.1:9464/metrics (stdlib http.server):
+# throughput, bytes read and served, read timeouts, read latency and gap percentiles,
+# rolling Shannon entropy and pi error, PS voltage (TrueRNGpro / TrueRNGproV2) and
+# continuous health test failures.  The PS voltage needs MODE_PSDEBUG, so capture
+# pauses for a couple of seconds every --ps-interval seconds to measure it again.
+#
+# The capture loop only does a bincount, the pi count and the health tests on each
+# block and appends them to a per device window under a short lock; everything else
+# is computed by the scrape from a copy of that window, so scrapes never hold up
+# the readers.
+#
+# truerng_metrics.py [--listen 127.0.0.1] [--port 9464] [--block-size 65536] [--device PORT ...] [--output FILE]
+#                    [--ps-interval 300]
+# Linux example:  python3 truerng_metrics.py --port 9464
+
+import argparse
+import collections
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import truerng_analyze
+import truerng_device
+import truerng_reader
+
+# Default HTTP port
+DEFAULT_PORT = 9464
+
+# Bytes read from a device at a time
+BLOCK_SIZE = 64 * 1024
+
+# Rolling window for throughput, entropy and pi error
+WINDOW_BYTES = 16 * 1024 * 1024
+WINDOW_SECONDS = 60.0
+
+# Continuous health tests (NIST SP 800-90B 4.4) assuming at least 1 bit of
+# min-entropy per byte and a false alarm probability of 2^-20
+HEALTH_MIN_ENTROPY = 1.0
+REPETITION_CUTOFF = 1 + int(math.ceil(20 / HEALTH_MIN_ENTROPY))
+PROPORTION_WINDOW = 512
+PROPORTION_CUTOFF = 410
+
+# Read timeout in seconds
+READ_TIMEOUT = 2
+
+# Seconds between PS voltage measurements
+PS_VOLTAGE_INTERVAL = 300
+
+
+#########################
+# Function: longest_run #
+#########################
+# Length of the longest run of identical bytes in data
+def longest_run(data):
+    if len(data) == 0:
+        return 0
+    edges = np.flatnonzero(data[1:] != data[:-1])
+    bounds = np.concatenate(([-1], edges, [len(data) - 1]))
+    return int(np.diff(bounds).max())
+
+
+# Number of 512 byte windows where the first byte repeats too often
+def proportion_failures(data):
+    windows = data[:len(data) - len(data) % PROPORTION_WINDOW].reshape(-1, PROPORTION_WINDOW)
+    if len(windows) == 0:
+        return 0
+    counts = np.count_nonzero(windows == windows[:, :1], axis=1)
+    return int(np.count_nonzero(counts >= PROPORTION_CUTOFF))
+
+
+########################
+# Class: DeviceMetrics #
+########################
+# Counters for one device.  record_read() is called by the capture loop, snapshot()
+# by the exporter.
+class DeviceMetrics:
+    pi_kernel = truerng_analyze.PiKernel()
+
+    def __init__(self, port, model=None, serial=None):
+        self.labels = {'port': port, 'model': model or 'unknown', 'serial': serial or 'none'}
+        self.lock = threading.Lock()
+        self.bytes_read = 0
+        self.bytes_served = 0
+        self.reads = 0
+        self.read_seconds = 0.0
+        self.timeouts = 0
+        self.repetition_failures = 0
+        self.proportion_failures = 0
+        self.ps_voltage = None
+        self.up = 1
+        # Latency and gap percentiles of the capture loop's reads
+        self.read_stats = truerng_reader.ReadStats()
+        # (time, bytes, seconds, histogram, pi points inside, pi points)
+        self.window = collections.deque()
+        self.window_bytes = 0
+
+    def record_read(self, data, seconds, requested):
+        samples = np.frombuffer(data, dtype=np.uint8)
+        histogram = np.bincount(samples, minlength=256)
+        inside, points = self.pi_kernel.update([0, 0], samples, None)
+        repetition = 1 if longest_run(samples) >= REPETITION_CUTOFF else 0
+        proportion = proportion_failures(samples)
+        now = time.monotonic()
+        with self.lock:
+            self.reads += 1
+            self.bytes_read += len(data)
+            self.read_seconds += seconds
+            if len(data) < requested:
+                self.timeouts += 1
+            self.repetition_failures += repetition
+            self.proportion_failures += proportion
+            self.window.append((now, len(data), seconds, histogram, inside, points))
+            self.window_bytes += len(data)
+            while self.window and (self.window_bytes - self.window[0][1] >= WINDOW_BYTES or
+                                   now - self.window[0][0] > WINDOW_SECONDS):
+                self.window_bytes -= self.window.popleft()[1]
+
+    def record_served(self, nbytes):
+        with self.lock:
+            self.bytes_served += nbytes
+
+    def set_ps_voltage(self, volts):
+        with self.lock:
+            self.ps_voltage = volts
+
+    def set_up(self, up):
+        with self.lock:
+            self.up = 1 if up else 0
+
+    # Counters and the rolling values.  Only the copy is done under the lock.
+    def snapshot(self):
+        with self.lock:
+            values = {'bytes_read': self.bytes_read, 'bytes_served': self.bytes_served,
+                      'reads': self.reads, 'read_seconds': self.read_seconds, 'timeouts': self.timeouts,
+                      'repetition_failures': self.repetition_failures,
+                      'proportion_failures': self.proportion_failures,
+                      'ps_voltage': self.ps_voltage, 'up': self.up}
+            window = list(self.window)
+        values['read_stats'] = self.read_stats.summary()
+
+        if window:
+            nbytes = sum(entry[1] for entry in window)
+            seconds = sum(entry[2] for entry in window)
+            histogram = np.sum([entry[3] for entry in window], axis=0)
+            inside = sum(entry[4] for entry in window)
+            points = sum(entry[5] for entry in window)
+            p = histogram[histogram > 0] / float(nbytes)
+            values['throughput'] = nbytes / seconds if seconds > 0 else 0.0
+            values['entropy'] = float(-(p * np.log2(p)).sum())
+            values['pi_error'] = self.pi_kernel.result([inside, points])['error_percent'] if points else None
+            values['window_bytes'] = nbytes
+        return values
+
+
+# (name, type, help, snapshot key)
+METRICS = (
+    ('truerng_up', 'gauge', '1 if the device is being read', 'up'),
+    ('truerng_bytes_read_total', 'counter', 'Bytes read from the device', 'bytes_read'),
+    ('truerng_bytes_served_total', 'counter', 'Bytes passed on to consumers', 'bytes_served'),
+    ('truerng_reads_total', 'counter', 'Reads from the device', 'reads'),
+    ('truerng_read_seconds_total', 'counter', 'Time spent in reads', 'read_seconds'),
+    ('truerng_read_timeouts_total', 'counter', 'Reads that returned fewer bytes than requested', 'timeouts'),
+    ('truerng_read_throughput_bytes_per_second', 'gauge', 'Read throughput over the rolling window', 'throughput'),
+    ('truerng_entropy_bits_per_byte', 'gauge', 'Shannon entropy over the rolling window', 'entropy'),
+    ('truerng_pi_error_percent', 'gauge', 'Monte Carlo pi error over the rolling window', 'pi_error'),
+    ('truerng_window_bytes', 'gauge', 'Bytes in the rolling window', 'window_bytes'),
+    ('truerng_ps_voltage_volts', 'gauge', 'Power supply voltage (TrueRNGpro / TrueRNGproV2)', 'ps_voltage'),
+)
+
+
+def format_labels(labels, extra=None):
+    items = list(labels.items()) + list((extra or {}).items())
+    return '{' + ','.join(key + '="' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+                          for key, value in items) + '}'
+
+
+################################
+# Function: prometheus_metrics #
+################################
+# Prometheus text exposition format for a list of DeviceMetrics
+def prometheus_metrics(devices):
+    snapshots = [(device.labels, device.snapshot()) for device in devices]
+    lines = []
+    for name, kind, description, key in METRICS:
+        lines.append('# HELP ' + name + ' ' + description)
+        lines.append('# TYPE ' + name + ' ' + kind)
+        for labels, values in snapshots:
+            if values.get(key) is not None:
+                lines.append(name + format_labels(labels) + ' ' + repr(float(values[key])))
+    lines.append('# HELP truerng_health_failures_total Continuous health test failures (SP 800-90B)')
+    lines.append('# TYPE truerng_health_failures_total counter')
+    for labels, values in snapshots:
+        for test in ('repetition', 'proportion'):
+            lines.append('truerng_health_failures_total' + format_labels(labels, {'test': test}) + ' ' +
+                         str(values[test + '_failures']))
+    for name, key, description in (('truerng_read_latency_seconds', 'latency', 'Latency of reads from the device'),
+                                   ('truerng_read_gap_seconds', 'gap', 'Time between reads that returned data')):
+        lines.append('# HELP ' + name + ' ' + description)
+        lines.append('# TYPE ' + name + ' summary')
+        for labels, values in snapshots:
+            stats = values['read_stats']
+            for quantile, percentile in (('0.5', 'p50'), ('0.99', 'p99'), ('0.999', 'p999')):
+                if stats[key + '_' + percentile + '_ns'] is not None:
+                    lines.append(name + format_labels(labels, {'quantile': quantile}) + ' ' +
+                                 repr(stats[key + '_' + percentile + '_ns'] / 1e9))
+            lines.append(name + '_sum' + format_labels(labels) + ' ' + repr(stats[key + '_sum_ns'] / 1e9))
+            lines.append(name + '_count' + format_labels(labels) + ' ' +
+                         str(stats['reads' if key == 'latency' else 'gaps']))
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    devices = []
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = prometheus_metrics(self.devices).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+###########################
+# Function: serve_metrics #
+###########################
+# Starts the HTTP server on a daemon thread and returns it
+def serve_metrics(devices, port=DEFAULT_PORT, listen='127.0.0.1'):
+    handler = type('Handler', (MetricsHandler,), {'devices': devices})
+    server = ThreadingHTTPServer((listen, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='truerng-metrics', daemon=True).start()
+    return server
+
+
+# Average power supply voltage in volts from MODE_PSDEBUG (None if unreadable)
+def read_ps_voltage(port):
+    ser = truerng_device.open_port(port, READ_TIMEOUT, 'MODE_PSDEBUG')
+    lines = ser.read(6*256).decode('ascii', errors='replace').split('\n')
+    ser.close()
+    volts = [int(line) for line in lines if line.strip().isdigit() and 1000 <= int(line) <= 30000]
+    truerng_device.modeChange('MODE_NORMAL', port)
+    return sum(volts) / len(volts) / 1000.0 if volts else None
+
+
+##########################
+# Function: capture_loop #
+##########################
+# Reads a device forever, updating its metrics.  Data goes to output (a function
+# taking bytes) if given.  On a TrueRNGpro / TrueRNGproV2 the PS voltage is measured
+# first and then every ps_interval seconds (only once if ps_interval is 0).
+def capture_loop(metrics, port, block_size=BLOCK_SIZE, output=None, stop=None, ps_interval=PS_VOLTAGE_INTERVAL):
+    import serial
+    ps_due = 0.0 if metrics.labels['model'] in ('TrueRNGpro', 'TrueRNGproV2') else None
+    while stop is None or not stop.is_set():
+        ser = None
+        failed = False
+        try:
+            if ps_due is not None and time.monotonic() >= ps_due:
+                ps_due = time.monotonic() + ps_interval if ps_interval else None
+                metrics.set_ps_voltage(read_ps_voltage(port))
+            ser = truerng_reader.InstrumentedReader(truerng_device.open_port(port, READ_TIMEOUT),
+                                                    metrics.read_stats)
+            metrics.set_up(True)
+            while (stop is None or not stop.is_set()) and (ps_due is None or time.monotonic() < ps_due):
+                before = time.perf_counter()
+                data = ser.read(block_size)
+                after = time.perf_counter()
+                metrics.record_read(data, after - before, block_size)
+                if output is not None and data:
+                    output(data)
+                    metrics.record_served(len(data))
+        except (OSError, serial.SerialException):
+            metrics.set_up(False)
+            failed = True
+        finally:
+            # Close before reconnecting so a disconnect doesn't leak the fd (and tty lock)
+            if ser is not None:
+                try:
+                    ser.close()
+                except (OSError, serial.SerialException):
+                    pass
+        if failed:
+            time.sleep(1)
+
+if __name__ == '__main__':
+    from serial.tools import list_ports
+
+    parser = argparse.ArgumentParser(description='Serve TrueRNG metrics in the Prometheus text format')
+    parser.add_argument('--listen', default='127.0.0.1', help='address to listen on (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='HTTP port (default 9464)')
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE)
+    parser.add_argument('--device', action='append', help='com port to read (default every TrueRNG found)')
+    parser.add_argument('--output', help='append the random data to this file (counted as bytes served)')
+    parser.add_argument('--ps-interval', type=float, default=PS_VOLTAGE_INTERVAL,
+                        help='seconds between PS voltage measurements (0 = only at start)')
+    args = parser.parse_args()
+
+    ids = {'04D8:F5FE': 'TrueRNG', '16D0:0AA0': 'TrueRNGpro', '04D8:EBB5': 'TrueRNGproV2'}
+    found = []
+    for temp in list_ports.comports():
+        for vidpid, model in ids.items():
+            if vidpid in temp[2] and (args.device is None or temp[0] in args.device):
+                found.append((temp[0], model, temp.serial_number))
+    for port in args.device or []:
+        if port not in [f[0] for f in found]:
+            found.append((port, None, None))
+
+    print('==================================================')
+    print('TrueRNG Metrics Exporter')
+    print('==================================================')
+    if not found:
+        print('No TrueRNG devices detected')
+
+    output = None
+    if args.output:
+        output_file = open(args.output, 'ab')
+        output_lock = threading.Lock()
+        def output(data):
+            with output_lock:
+                output_file.write(data)
+
+    devices = []
+    for port, model, serial_number in found:
+        metrics = DeviceMetrics(port, model, serial_number)
+        devices.append(metrics)
+        print(port + ' : ' + str(model) + ' : SN ' + str(serial_number))
+        threading.Thread(target=capture_loop, args=(metrics, port, args.block_size, output, None, args.ps_interval),
+                         name='truerng-' + os.path.basename(port), daemon=True).start()
+
+    serve_metrics(devices, args.port, args.listen)
+    print('Serving http://' + args.listen + ':' + str(args.port) + '/metrics (Ctrl-C to end)')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
@@ -20,6 +20,7 @@ import sys
 import math
 import os
 from serial.tools import list_ports
+import truerng_device
 
 # Set Default Operating Mode to Normal
 OPERATING_MODE='MODE_RNGDEBUG'
@@ -174,16 +175,16 @@ try:
         ser.open()
 
     # Set Data Terminal Ready to start flow
-    ser.setDTR(True)
+    truerng_device.set_dtr(ser)
 
     # This clears the receive buffer so we aren't using buffered data
     ser.flushInput()
 
     # Try to read the port and record the time before and after
     try:
-        before = time.time()    # in microseconds
+        before = time.perf_counter()    # in seconds
         x=ser.read(sample_block_size)   # read bytes from serial port
-        after = time.time()     # in microseconds
+        after = time.perf_counter()     # in seconds
     except:
         print('Read Failed!!!')
 
@@ -15,12 +15,15 @@ import serial
 import time
 import os
 from serial.tools import list_ports
+import truerng_device
+import truerng_reader
 
-# Size of block for each loop
-blocksize=102400
+# Total bytes to read
+totalsize=1024000
 
-# Number of loops
-numloops=10
+# Each read is sized for about this many seconds of data at the rate the device
+# delivers (see AdaptiveReader in truerng_reader.py)
+target_latency=0.1
 
 # Set com port to default None
 # Set this to the exact port name if you want to choose a specific port
@@ -106,10 +109,9 @@ print('==================================================')
 # Print which port we're using
 print('Using com port:  ' + str(rng_com_port))
 
-# Print block size and number of loops
-print('Block Size:      ' + '{:2.2f}'.format(blocksize/1000) + ' KB')
-print('Number of loops: ' + str(numloops))
-print('Total size:      ' + '{:2.2f}'.format(blocksize * numloops/1000000) + ' MB')
+# Print read size and total size
+print('Read Size:       adaptive (about ' + '{:g}'.format(target_latency*1000) + ' ms of data)')
+print('Total size:      ' + '{:2.2f}'.format(totalsize/1000000) + ' MB')
 print('Writing to:      random.bin')
 print('Capture Mode:    ' + capture_mode)
 print('==================================================')
@@ -131,12 +133,16 @@ except:
     print('Port Not Usable!')
     print('Do you have permissions set to read ' + rng_com_port + ' ?')
 
+# Size reads and the timeout from the measured rate and record the latency and size
+# of every read (see truerng_reader.py)
+ser = truerng_reader.AdaptiveReader(ser, target_latency=target_latency)
+
 # Open the serial port if it isn't open
 if(ser.isOpen() == False):
     ser.open()
 
 # Set Data Terminal Ready to start flow
-ser.setDTR(True)
+truerng_device.set_dtr(ser)
 
 # This clears the receive buffer so we aren't using buffered data
 ser.flushInput()
@@ -145,17 +151,23 @@ ser.flushInput()
 totalbytes=0
 
 # Loop
-for _ in range(numloops):
+while totalbytes < totalsize:
 
     # Try to read the port and record the time before and after
     try:
-        before = time.time()    # in microseconds
-        x=ser.read(blocksize)   # read bytes from serial port
-        after = time.time()     # in microseconds
+        timeout = ser.timeout           # timeout for this read (a timeout makes the next one longer)
+        before = time.perf_counter()    # in seconds
+        x=ser.read_once(min(ser.chunk, totalsize-totalbytes))   # about target_latency seconds of bytes
+        after = time.perf_counter()     # in seconds
     except:
         print('Read Failed!!!')
         break
 
+    # Give up if nothing arrived even with the longest timeout
+    if len(x) == 0 and timeout >= ser.max_timeout:
+        print('Read Timed Out!!!')
+        break
+
     # Update total bytes read
     totalbytes +=len(x)
 
@@ -164,13 +176,17 @@ for _ in range(numloops):
         fp.write(x)
 
     # Calculate the rate
-    rate=float(blocksize) / ((after-before)*1000000.0) *8
+    rate=float(len(x)) / ((after-before)*1000000.0) *8
 
-    print(str(totalbytes) + ' Bytes Read at ' + '{:2.3f}'.format(rate) + ' Mbits/s')
+    print(str(totalbytes) + ' Bytes Read at ' + '{:2.3f}'.format(rate) + ' Mbits/s (' + str(len(x)) + ' byte read)')
 
 # Close the serial port
 ser.close()
 
+# Print read latency percentiles (stalls show up in p99 / p999 and the largest gap)
+# and the read size and timeout chosen
+print(ser.stats.report())
+
 # If the file is open then close it
 if fp != 0:
     fp.close()
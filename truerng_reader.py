@@ -0,0 +1,543 @@
+#!/usr/bin/python3
+
+# TrueRNG Instrumented Reader
+# 10/19/2026
+#
+# Requires Python 3.8, pyserial
+#
+# On Linux - may need to be root or set /dev/tty port permissions to 666
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Pyserial package with:   python -m pip install pyserial
+#
+# Records the latency (perf_counter_ns) and size of every read from a serial port in
+# HDR style histograms, along with the gaps between reads that returned data and
+# counters for short reads and timeouts.  Averages over a whole capture hide USB
+# scheduling stalls; p99 / p999 latency and the largest gap show them.
+#
+# AdaptiveReader also measures the rate the device delivers and picks the read size
+# and timeout from it instead of fixed values: reads of about target_latency seconds
+# of data for consumers that want bytes as they arrive, or target_reads_per_second
+# reads per second for bulk capture (fewer, larger reads).  The timeout is a few
+# times the expected time of a read, so a stall is noticed in well under the usual
+# 10 seconds.  Every change is kept in decisions and the current choice is in the
+# stats summary and report.
+#
+# read_deadline() reads an exact number of bytes within a deadline, retrying short
+# reads and serial errors inside it, and returns either all of them (bytes) or a
+# PartialRead (bytes too) saying how many were asked for, how long it took and why
+# it stopped, so a stall never looks like a complete read.
+#
+# Example:
+#   ser = truerng_reader.InstrumentedReader(serial.Serial(port, timeout=10))
+#   data = ser.read(102400)       # anything else is passed to the serial port
+#   print(ser.stats.report())
+#
+#   ser = truerng_reader.AdaptiveReader(serial.Serial(port, timeout=10), target_latency=0.05)
+#   data = ser.read()             # about 50 ms of data
+#   data = ser.read(1048576)      # exactly 1 MiB unless the device stops for max_timeout
+#
+#   data = truerng_reader.read_deadline(port, 1048576, 5.0)
+#   if isinstance(data, truerng_reader.PartialRead):
+#       print(data.describe())    # '524288 of 1048576 bytes in 5.000 seconds'
+#
+# truerng_reader.py [PORT] [--seconds 10] [--block-size 65536]   (reads and prints the report)
+# truerng_reader.py [PORT] --adaptive latency|bulk [--target-latency 0.05] [--reads-per-second 2]
+# Linux example:  python3 truerng_reader.py /dev/ttyACM0
+#                 python3 truerng_reader.py /dev/ttyACM0 --adaptive bulk
+
+import argparse
+import collections
+import threading
+import time
+
+# Values below 2^SUB_BUCKET_BITS are counted exactly; larger values share a bucket
+# with values within 1/2^(SUB_BUCKET_BITS-1) (1.6%) of them
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+# Percentiles in the report and their names
+PERCENTILES = {50.0: 'p50', 99.0: 'p99', 99.9: 'p999'}
+
+# AdaptiveReader defaults: seconds of data per read for latency sensitive consumers,
+# reads per second for bulk capture and the range of read sizes (powers of two)
+TARGET_LATENCY = 0.05
+TARGET_READS_PER_SECOND = 2.0
+MIN_CHUNK = 64
+MAX_CHUNK = 4 * 1024 * 1024
+INITIAL_CHUNK = 4096
+
+# Read timeout is TIMEOUT_FACTOR times the expected time of a read, between
+# MIN_TIMEOUT and MAX_TIMEOUT seconds (doubled after each read that times out)
+TIMEOUT_FACTOR = 4.0
+MIN_TIMEOUT = 0.05
+MAX_TIMEOUT = 10.0
+
+# Rate measurements cover at least RATE_WINDOW seconds (so data that was already
+# buffered doesn't look like a fast device); each has weight RATE_SMOOTHING in the
+# running estimate
+RATE_WINDOW = 0.1
+RATE_SMOOTHING = 0.25
+
+# Tuning decisions kept by AdaptiveReader
+DECISION_LOG = 64
+
+# Pause before read_deadline retries a read that raised an error (seconds)
+RETRY_DELAY = 0.01
+
+# read_deadline only lowers the port timeout when it is more than this much longer
+# than the time left (the larger of the two), since every change is a tcsetattr
+# call in pyserial.  A read can end this much after the deadline.
+DEADLINE_SLACK = 0.05
+DEADLINE_SLACK_FRACTION = 0.1
+
+
+#######################
+# Function: format_ns #
+#######################
+# Nanoseconds as a short string in ns, us, ms or s
+def format_ns(ns):
+    if ns is None:
+        return '-'
+    if ns < 1000:
+        return str(int(ns)) + ' ns'
+    if ns < 1000000:
+        return '{:2.1f}'.format(ns / 1000.0) + ' us'
+    if ns < 1000000000:
+        return '{:2.2f}'.format(ns / 1000000.0) + ' ms'
+    return '{:2.3f}'.format(ns / 1000000000.0) + ' s'
+
+
+###########################
+# Class: LatencyHistogram #
+###########################
+# Log-linear histogram of non-negative integers (HdrHistogram layout): each power of
+# two is split into SUB_BUCKET_HALF linear buckets, so the relative error is the same
+# from nanoseconds to minutes and recording is a few integer operations.
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def bucket_index(value):
+        if value < (1 << SUB_BUCKET_BITS):
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+    # Smallest and largest values counted in a bucket
+    @staticmethod
+    def bucket_range(index):
+        if index < (1 << SUB_BUCKET_BITS):
+            return index, index
+        shift = (index >> (SUB_BUCKET_BITS - 1)) - 1
+        low = (index - (shift << (SUB_BUCKET_BITS - 1))) << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, value):
+        value = max(0, int(value))
+        index = self.bucket_index(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    # Value at or below which percent of the recorded values fall (the top of the
+    # bucket it is in, but never more than the largest value recorded)
+    def percentile(self, percent):
+        if not self.count:
+            return None
+        target = max(1, int(round(self.count * percent / 100.0)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.bucket_range(index)[1], self.max)
+        return self.max
+
+
+####################
+# Class: ReadStats #
+####################
+# Latency, size and gap histograms (nanoseconds and bytes) and counters for one
+# stream of reads.  A short read returned fewer bytes than requested (the timeout
+# expired first); a timeout returned nothing at all.
+class ReadStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = LatencyHistogram()
+        self.sizes = LatencyHistogram()
+        self.gaps = LatencyHistogram()
+        self.reads = 0
+        self.bytes = 0
+        self.short_reads = 0
+        self.timeouts = 0
+        self.last_data = None
+        self.tuning = None
+        self.retunes = 0
+        self.rate_estimate = None
+
+    # start and end are perf_counter_ns() values taken around the read
+    def record(self, start, end, nbytes, requested):
+        with self.lock:
+            self.reads += 1
+            self.bytes += nbytes
+            self.latency.record(end - start)
+            self.sizes.record(nbytes)
+            if nbytes < requested:
+                self.short_reads += 1
+            if nbytes == 0:
+                self.timeouts += 1
+                return
+            if self.last_data is not None:
+                self.gaps.record(end - self.last_data)
+            self.last_data = end
+
+    # Latest AdaptiveReader decision (a dict from AdaptiveReader.decide)
+    def record_tuning(self, decision):
+        with self.lock:
+            self.tuning = decision
+            self.retunes += 1
+
+    # Current AdaptiveReader rate estimate in bytes/s (updated between decisions too)
+    def record_rate(self, rate):
+        with self.lock:
+            self.rate_estimate = rate
+
+    # Plain values for JSON and the metrics exporter
+    def summary(self):
+        with self.lock:
+            values = {'reads': self.reads, 'bytes': self.bytes, 'short_reads': self.short_reads,
+                      'timeouts': self.timeouts, 'latency_max_ns': self.latency.max,
+                      'latency_sum_ns': self.latency.total, 'latency_mean_ns': self.latency.mean(),
+                      'gap_max_ns': self.gaps.max, 'gap_sum_ns': self.gaps.total, 'gaps': self.gaps.count,
+                      'size_mean': self.sizes.mean()}
+            for percent, name in PERCENTILES.items():
+                values['latency_' + name + '_ns'] = self.latency.percentile(percent)
+                values['gap_' + name + '_ns'] = self.gaps.percentile(percent)
+            if self.tuning is not None:
+                values.update({'tuning_mode': self.tuning['mode'], 'chunk_size': self.tuning['chunk'],
+                               'read_timeout_s': self.tuning['timeout'],
+                               'rate_estimate_bytes_per_s': self.rate_estimate, 'retunes': self.retunes})
+        return values
+
+    def report(self):
+        values = self.summary()
+        lines = [str(values['reads']) + ' reads, ' + str(values['bytes']) + ' bytes, ' +
+                 str(values['short_reads']) + ' short reads, ' + str(values['timeouts']) + ' timeouts']
+        for name, title in (('latency', 'Read latency'), ('gap', 'Gap between data')):
+            lines.append(title.ljust(17) + ': ' +
+                         '  '.join(percentile + ' ' + format_ns(values[name + '_' + percentile + '_ns'])
+                                   for percentile in PERCENTILES.values()) +
+                         '  max ' + format_ns(values[name + '_max_ns']))
+        if 'chunk_size' in values:
+            rate = values['rate_estimate_bytes_per_s']
+            lines.append('Adaptive reads'.ljust(17) + ': ' + values['tuning_mode'] + ', ' +
+                         str(values['chunk_size']) + ' bytes, timeout ' + format_ns(values['read_timeout_s'] * 1e9) +
+                         ', rate ' + ('-' if rate is None else '{:2.3f}'.format(rate * 8 / 1e6) + ' Mbits/s') +
+                         ' (' + str(values['retunes']) + ' decisions)')
+        return '\n'.join(lines)
+
+
+######################
+# Class: PartialRead #
+######################
+# What read_deadline() got when the deadline passed before all the bytes arrived.
+# It is the bytes that did arrive, plus requested, elapsed (seconds), retries and
+# error (the last exception from the port, None if it just went quiet).
+class PartialRead(bytes):
+    def __new__(cls, data, requested, elapsed, retries=0, error=None):
+        self = bytes.__new__(cls, data)
+        self.requested = requested
+        self.elapsed = elapsed
+        self.retries = retries
+        self.error = error
+        return self
+
+    @property
+    def missing(self):
+        return self.requested - len(self)
+
+    def describe(self):
+        return (str(len(self)) + ' of ' + str(self.requested) + ' bytes in ' + '{:2.3f}'.format(self.elapsed) +
+                ' seconds' + ('' if self.error is None else ' (' + str(self.error) + ')'))
+
+
+###########################
+# Function: read_deadline #
+###########################
+# Reads size bytes from port within deadline seconds.  The port timeout is lowered
+# to the time left when it would run past the deadline (by more than the slack
+# above, and put back afterwards), and short reads and
+# serial errors (SerialException is an OSError) are retried until the deadline.
+# Returns bytes of exactly size, or a PartialRead.  read is the function to read
+# with (default port.read) so wrappers can record the reads, and limit() (if given)
+# the most to ask for in one read.  retries counts reads after a short read or an
+# error.
+def read_deadline(port, size, deadline, read=None, limit=None):
+    read = port.read if read is None else read
+    start = time.perf_counter()
+    end = start + deadline
+    timed = hasattr(port, 'timeout')
+    saved = port.timeout if timed else None
+    chunks = []
+    remaining = size
+    retries = 0
+    error = None
+    retry = False
+    try:
+        while remaining > 0:
+            left = end - time.perf_counter()
+            if left <= 0:
+                break
+            if retry:
+                retries += 1
+            # Even a port opened with timeout=None must give up at the deadline
+            if timed and (port.timeout is None or
+                          port.timeout - left > max(DEADLINE_SLACK, DEADLINE_SLACK_FRACTION * left)):
+                port.timeout = left
+            ask = remaining if limit is None else min(remaining, limit())
+            try:
+                data = read(ask)
+            except OSError as e:
+                error = e
+                retry = True
+                time.sleep(min(RETRY_DELAY, max(0.0, end - time.perf_counter())))
+                continue
+            chunks.append(data)
+            remaining -= len(data)
+            retry = len(data) < ask
+    finally:
+        if timed and port.timeout != saved:
+            try:
+                port.timeout = saved
+            except OSError:
+                pass
+    data = b''.join(chunks)
+    if remaining > 0:
+        return PartialRead(data, size, time.perf_counter() - start, retries, error)
+    return data
+
+
+#############################
+# Class: InstrumentedReader #
+#############################
+# Wraps a serial port (or anything with read(size)) and records every read in
+# stats.  Everything else is passed through to the port.
+class InstrumentedReader:
+    def __init__(self, port, stats=None):
+        self.port = port
+        self.stats = stats if stats is not None else ReadStats()
+
+    def read(self, size=1):
+        start = time.perf_counter_ns()
+        data = self.port.read(size)
+        end = time.perf_counter_ns()
+        self.stats.record(start, end, len(data), size)
+        return data
+
+    # read_deadline() with every read recorded
+    def read_deadline(self, size, deadline):
+        return read_deadline(self.port, size, deadline, self.read)
+
+    def __getattr__(self, name):
+        return getattr(self.port, name)
+
+
+#########################
+# Class: AdaptiveReader #
+#########################
+# InstrumentedReader that sizes reads and sets the port timeout from the measured
+# delivery rate.  Give target_latency (seconds of data per read) or
+# target_reads_per_second (bulk); latency is the default.  The rate is bytes over
+# wall time, so time the consumer spends between reads counts: it is the rate
+# actually delivered to this consumer.  A short read waited out the whole timeout,
+# so it replaces the estimate instead of being averaged in.
+class AdaptiveReader(InstrumentedReader):
+    def __init__(self, port, stats=None, target_latency=None, target_reads_per_second=None,
+                 min_chunk=MIN_CHUNK, max_chunk=MAX_CHUNK, max_timeout=MAX_TIMEOUT):
+        InstrumentedReader.__init__(self, port, stats)
+        if target_latency is not None and target_reads_per_second is not None:
+            raise ValueError('give target_latency or target_reads_per_second, not both')
+        if target_reads_per_second is not None:
+            if target_reads_per_second <= 0:
+                raise ValueError('target_reads_per_second must be positive')
+            self.mode = 'bulk'
+            self.read_seconds = 1.0 / target_reads_per_second
+        else:
+            self.mode = 'latency'
+            self.read_seconds = TARGET_LATENCY if target_latency is None else target_latency
+            if self.read_seconds <= 0:
+                raise ValueError('target_latency must be positive')
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.max_timeout = max_timeout
+        self.chunk = min(max(INITIAL_CHUNK, min_chunk), max_chunk)
+        self.timeout = getattr(port, 'timeout', None) or max_timeout
+        self.rate = None
+        self.window_start = None
+        self.window_bytes = 0
+        self.decisions = collections.deque(maxlen=DECISION_LOG)
+        self.decide(self.chunk, self.timeout, 'initial')
+
+    # Largest power of two read size holding at most read_seconds of data at rate
+    def chunk_for(self, rate):
+        chunk = self.min_chunk
+        while chunk * 2 <= min(rate * self.read_seconds, self.max_chunk):
+            chunk *= 2
+        return chunk
+
+    def timeout_for(self, chunk, rate):
+        return min(max(TIMEOUT_FACTOR * chunk / rate, MIN_TIMEOUT), self.max_timeout)
+
+    # Applies a read size and timeout and records why (only the timeout touches the port)
+    def decide(self, chunk, timeout, reason):
+        if timeout != self.timeout and hasattr(self.port, 'timeout'):
+            self.port.timeout = timeout
+        self.chunk = chunk
+        self.timeout = timeout
+        decision = {'time': time.time(), 'mode': self.mode, 'reason': reason, 'rate': self.rate,
+                    'chunk': chunk, 'timeout': timeout}
+        self.decisions.append(decision)
+        self.stats.record_tuning(decision)
+
+    def tune(self, start, end, nbytes, requested):
+        if self.window_start is None:
+            self.window_start = start
+        if nbytes == 0:
+            # Nothing before the timeout: wait longer next time
+            if self.timeout < self.max_timeout:
+                self.decide(self.chunk, min(self.timeout * 2, self.max_timeout), 'timeout')
+            return
+        self.window_bytes += nbytes
+        elapsed = (end - self.window_start) / 1e9
+        short = nbytes < requested
+        if elapsed < RATE_WINDOW and not short:
+            return
+        sample = self.window_bytes / max(elapsed, 1e-9)
+        self.window_start = end
+        self.window_bytes = 0
+        if self.rate is None or short:
+            self.rate = sample
+        else:
+            self.rate += RATE_SMOOTHING * (sample - self.rate)
+        self.stats.record_rate(self.rate)
+        chunk = self.chunk_for(self.rate)
+        # Halve only when well under the current size so a rate near a boundary
+        # doesn't flip between two sizes
+        if chunk > self.chunk or (chunk < self.chunk and self.rate * self.read_seconds < self.chunk * 0.75):
+            self.decide(chunk, self.timeout_for(chunk, self.rate),
+                        'rate ' + '{:2.0f}'.format(self.rate) + ' bytes/s')
+        elif self.timeout > self.timeout_for(self.chunk, self.rate) * 2:
+            # Recovered from a stall (or the first rate measurement)
+            self.decide(self.chunk, self.timeout_for(self.chunk, self.rate), 'rate recovered')
+
+    def read_once(self, size):
+        start = time.perf_counter_ns()
+        data = self.port.read(size)
+        end = time.perf_counter_ns()
+        self.stats.record(start, end, len(data), size)
+        self.tune(start, end, len(data), size)
+        return data
+
+    # read() returns one read of the tuned size; read(size) returns size bytes read in
+    # tuned pieces, or fewer if nothing arrives for max_timeout seconds
+    def read(self, size=None):
+        if size is None:
+            return self.read_once(self.chunk)
+        chunks = []
+        remaining = size
+        idle = 0.0
+        while remaining > 0 and idle < self.max_timeout:
+            timeout = self.timeout
+            data = self.read_once(min(self.chunk, remaining))
+            if data:
+                chunks.append(data)
+                remaining -= len(data)
+                idle = 0.0
+            else:
+                idle += timeout
+        return b''.join(chunks)
+
+    # read_deadline() in tuned pieces with every read recorded; the deadline sets the
+    # port timeout while it runs, then the tuned timeout is put back
+    def read_deadline(self, size, deadline):
+        try:
+            return read_deadline(self.port, size, deadline, self.read_once, lambda: self.chunk)
+        finally:
+            if hasattr(self.port, 'timeout') and self.port.timeout != self.timeout:
+                self.port.timeout = self.timeout
+
+
+if __name__ == '__main__':
+    from serial.tools import list_ports
+    import truerng_device
+
+    parser = argparse.ArgumentParser(description='Read a TrueRNG and print read latency percentiles')
+    parser.add_argument('port', nargs='?', default=None, help='com port to read (default first TrueRNG found)')
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--block-size', type=int, default=65536)
+    parser.add_argument('--timeout', type=float, default=10.0, help='serial read timeout in seconds')
+    parser.add_argument('--adaptive', choices=['latency', 'bulk'], default=None,
+                        help='tune the read size and timeout (--block-size is ignored)')
+    parser.add_argument('--target-latency', type=float, default=TARGET_LATENCY,
+                        help='latency: seconds of data per read')
+    parser.add_argument('--reads-per-second', type=float, default=TARGET_READS_PER_SECOND,
+                        help='bulk: reads per second')
+    args = parser.parse_args()
+
+    port = args.port
+    if port is None:
+        for temp in list_ports.comports():
+            if '04D8:F5FE' in temp[2] or '16D0:0AA0' in temp[2] or '04D8:EBB5' in temp[2]:
+                port = temp[0]
+                break
+    if port is None:
+        print('No TrueRNG devices detected')
+        raise SystemExit(1)
+
+    ser = truerng_device.open_port(port, args.timeout)
+    if args.adaptive == 'latency':
+        ser = AdaptiveReader(ser, target_latency=args.target_latency, max_timeout=args.timeout)
+    elif args.adaptive == 'bulk':
+        ser = AdaptiveReader(ser, target_reads_per_second=args.reads_per_second, max_timeout=args.timeout)
+    else:
+        ser = InstrumentedReader(ser)
+
+    print('==================================================')
+    print('Reading ' + port + ' for ' + '{:g}'.format(args.seconds) + ' seconds')
+    print('==================================================')
+    end = time.perf_counter() + args.seconds
+    while time.perf_counter() < end:
+        ser.read() if args.adaptive else ser.read(args.block_size)
+    ser.close()
+    if args.adaptive:
+        for decision in ser.decisions:
+            print(time.strftime('%H:%M:%S', time.localtime(decision['time'])) + ' ' +
+                  str(decision['chunk']).rjust(8) + ' bytes  timeout ' + format_ns(decision['timeout'] * 1e9).ljust(9) +
+                  ' ' + decision['reason'])
+    print(ser.stats.report())
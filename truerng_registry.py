@@ -0,0 +1,326 @@
+#!/usr/bin/python3
+
+# TrueRNG Hotplug Device Registry
+# 10/19/2026
+#
+# Requires Python 3.8 (Linux only)
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+#
+# Keeps a table of connected TrueRNG devices keyed by serial number and calls back
+# when devices are attached or detached.  Instead of calling list_ports.comports()
+# in a loop it sleeps on a kernel uevent (netlink) socket, or on inotify events for
+# /dev when netlink isn't available (some containers), and only reads sysfs after
+# a tty has been added or removed.
+#
+# Example:
+#   registry = truerng_registry.DeviceRegistry()
+#   registry.on_attach(lambda device: print('attached ' + device['port']))
+#   registry.on_detach(lambda device: print('detached ' + device['port']))
+#   registry.start()
+#
+# DeviceFollower keeps the current port of one device, so a program reading it can
+# reopen it on its new /dev/ttyACMn after a replug (truerng_soak.py does this).
+#
+# truerng_registry.py [--source netlink|inotify]     (prints events until Ctrl-C)
+
+import argparse
+import ctypes
+import errno
+import os
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+
+import truerng_sysfs
+
+# Netlink protocol for kernel uevents and the group the kernel sends them to
+NETLINK_KOBJECT_UEVENT = 15
+UEVENT_GROUP_KERNEL = 1
+
+# inotify flags (linux/inotify.h)
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+INOTIFY_EVENT = struct.Struct('iIII')
+
+# Directory watched by the inotify source
+DEV_DIR = '/dev'
+
+# Seconds to keep collecting events after the first one so a replug (several
+# uevents and /dev entries) causes a single sysfs scan
+SETTLE_SECONDS = 0.1
+
+# Seconds to wait after an unexpected error from the event source before carrying on
+ERROR_DELAY = 1.0
+
+
+#########################
+# Class: NetlinkWatcher #
+#########################
+# Kernel uevents for the tty subsystem
+class NetlinkWatcher:
+    name = 'netlink'
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        self.sock.bind((0, UEVENT_GROUP_KERNEL))
+        self.sock.setblocking(False)
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    # Reads pending uevents and returns True if a tty was added or removed (or events
+    # were lost because the socket buffer overflowed during a burst)
+    def read_events(self):
+        changed = False
+        while True:
+            try:
+                message = self.sock.recv(16384)
+            except BlockingIOError:
+                return changed
+            except OSError as e:
+                if e.errno == errno.ENOBUFS:
+                    return True
+                raise
+            fields = message.split(b'\0')
+            values = dict(field.split(b'=', 1) for field in fields[1:] if b'=' in field)
+            if values.get(b'SUBSYSTEM') == b'tty' and values.get(b'ACTION') in (b'add', b'remove'):
+                changed = True
+
+    def close(self):
+        self.sock.close()
+
+
+#########################
+# Class: InotifyWatcher #
+#########################
+# Entries created or deleted in /dev (tty* nodes appear and disappear on hotplug)
+class InotifyWatcher:
+    name = 'inotify'
+
+    def __init__(self, path=DEV_DIR, prefix='tty'):
+        self.prefix = prefix.encode()
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        mask = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+        if self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, 'inotify_add_watch failed', path)
+
+    def fileno(self):
+        return self.fd
+
+    # Reads pending events and returns True if a matching entry was added or removed
+    def read_events(self):
+        changed = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changed
+            position = 0
+            while position + INOTIFY_EVENT.size <= len(data):
+                wd, mask, cookie, length = INOTIFY_EVENT.unpack_from(data, position)
+                position += INOTIFY_EVENT.size
+                name = data[position:position + length].rstrip(b'\0')
+                position += length
+                if mask & IN_Q_OVERFLOW or name.startswith(self.prefix):
+                    changed = True
+
+    def close(self):
+        os.close(self.fd)
+
+
+##########################
+# Function: open_watcher #
+##########################
+# Netlink if the kernel lets us bind to it, otherwise inotify
+def open_watcher(source=None):
+    if source in (None, 'netlink'):
+        try:
+            return NetlinkWatcher()
+        except OSError:
+            if source == 'netlink':
+                raise
+    return InotifyWatcher()
+
+
+#########################
+# Class: DeviceRegistry #
+#########################
+# Table of TrueRNG devices by serial number (the port for devices without one),
+# updated from a background thread.  Callbacks run on that thread.
+class DeviceRegistry:
+    def __init__(self, root=truerng_sysfs.SYSFS_ROOT, source=None):
+        self.root = root
+        self.source = source
+        self.devices = {}
+        self.lock = threading.Lock()
+        self.attach_callbacks = []
+        self.detach_callbacks = []
+        self.watcher = None
+        self.thread = None
+        self.stop_read = None
+        self.stop_write = None
+
+    def on_attach(self, callback):
+        self.attach_callbacks.append(callback)
+
+    def on_detach(self, callback):
+        self.detach_callbacks.append(callback)
+
+    # Copy of the current table
+    def snapshot(self):
+        with self.lock:
+            return dict(self.devices)
+
+    def get(self, serial):
+        with self.lock:
+            return self.devices.get(serial)
+
+    # Re-reads sysfs and calls the callbacks for every difference
+    def refresh(self):
+        truerng_sysfs.invalidate()
+        current = {}
+        for device in truerng_sysfs.scan(self.root):
+            current[device['serial'] or device['port']] = device
+        with self.lock:
+            previous = self.devices
+            self.devices = current
+        for key, device in previous.items():
+            if key not in current or current[key]['port'] != device['port']:
+                self.call(self.detach_callbacks, device)
+        for key, device in current.items():
+            if key not in previous or previous[key]['port'] != device['port']:
+                self.call(self.attach_callbacks, device)
+
+    # A failing callback is reported and doesn't stop the others (or the thread)
+    @staticmethod
+    def call(callbacks, device):
+        for callback in callbacks:
+            try:
+                callback(device)
+            except Exception as e:
+                print('Registry callback failed for ' + str(device.get('port')) + ': ' +
+                      type(e).__name__ + ': ' + str(e), file=sys.stderr)
+
+    # Opens the event source, reads the current devices (attach callbacks are called
+    # for each) and starts watching
+    def start(self):
+        self.watcher = open_watcher(self.source)
+        self.stop_read, self.stop_write = os.pipe()
+        self.refresh()
+        self.thread = threading.Thread(target=self.run, name='truerng-registry', daemon=True)
+        self.thread.start()
+
+    # Watches until stop().  Errors from the event source or sysfs are reported and
+    # answered with a full refresh, so the table can't silently go stale.
+    def run(self):
+        while True:
+            ready, _, _ = select.select([self.watcher, self.stop_read], [], [])
+            if self.stop_read in ready:
+                return
+            try:
+                changed = self.watcher.read_events()
+                # Collect the rest of the burst before scanning
+                deadline = time.monotonic() + SETTLE_SECONDS
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    ready, _, _ = select.select([self.watcher, self.stop_read], [], [], remaining)
+                    if self.stop_read in ready:
+                        return
+                    if ready:
+                        changed = self.watcher.read_events() or changed
+                if changed:
+                    self.refresh()
+            except Exception as e:
+                print('Registry ' + self.watcher.name + ' error: ' + type(e).__name__ + ': ' + str(e) +
+                      ' (rescanning)', file=sys.stderr)
+                time.sleep(ERROR_DELAY)
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print('Registry refresh failed: ' + type(e).__name__ + ': ' + str(e), file=sys.stderr)
+
+    def stop(self):
+        if self.thread is not None:
+            os.write(self.stop_write, b'x')
+            self.thread.join()
+            self.thread = None
+        if self.stop_read is not None:
+            os.close(self.stop_read)
+            os.close(self.stop_write)
+            self.stop_read = None
+            self.stop_write = None
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+
+
+#########################
+# Class: DeviceFollower #
+#########################
+# Current port of one device (by serial number, or by port for devices without
+# one), kept up to date from the registry's attach and detach callbacks
+class DeviceFollower:
+    def __init__(self, registry, port, serial_number=None):
+        self.port = port
+        self.key = serial_number or port
+        self.attached = registry.get(self.key) is not None
+        registry.on_attach(self.attach)
+        registry.on_detach(self.detach)
+
+    def matches(self, device):
+        return (device['serial'] or device['port']) == self.key
+
+    def attach(self, device):
+        if self.matches(device):
+            if device['port'] != self.port:
+                print(time.strftime('%H:%M:%S') + ' ' + self.key + ' moved from ' + self.port + ' to ' + device['port'])
+            self.port = device['port']
+            self.attached = True
+
+    def detach(self, device):
+        if self.matches(device) and device['port'] == self.port:
+            print(time.strftime('%H:%M:%S') + ' ' + self.key + ' detached from ' + self.port)
+            self.attached = False
+
+
+def describe(device):
+    return (device['port'] + ' : ' + str(device['model']).ljust(12) + ' : SN ' + str(device['serial']) +
+            ' : Rev ' + str(device['revision']) + ' : USB ' + device['usb_path'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Print TrueRNG attach and detach events')
+    parser.add_argument('--source', choices=('netlink', 'inotify'), default=None,
+                        help='event source (default netlink, falling back to inotify)')
+    parser.add_argument('--root', default=truerng_sysfs.SYSFS_ROOT, help='sysfs root (default /sys)')
+    args = parser.parse_args()
+
+    registry = DeviceRegistry(args.root, args.source)
+    registry.on_attach(lambda device: print(time.strftime('%H:%M:%S') + ' Attached ' + describe(device)))
+    registry.on_detach(lambda device: print(time.strftime('%H:%M:%S') + ' Detached ' + describe(device)))
+
+    print('====================================================')
+    print('TrueRNG Device Registry (Ctrl-C to end)')
+    print('====================================================')
+    registry.start()
+    print('Watching with ' + registry.watcher.name)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    registry.stop()
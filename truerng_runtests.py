@@ -12,16 +12,20 @@
 #
 # Note: Dieharder needs 14GiB of data to not re-use (rewind) input data
 #       If you run this with 14GiB, many of the dieharder results may be invalid
+#
+# truerng_runtests.py FILENAME [--db truerng_results.db --serial SERIAL]
 
 import time
 import sys
 import os
+import argparse
 
-if len(sys.argv)==2:
-	FILENAME = str(sys.argv[1])
-else:
-	print('Usage: truerng_runtests.py FILENAME')
-	exit()
+parser = argparse.ArgumentParser(description='Run ent, rngtest and dieharder on a capture file')
+parser.add_argument('filename')
+parser.add_argument('--db', help='also record the results in this results database (see truerng_store.py)')
+parser.add_argument('--serial', help='serial number of the device the capture came from (for --db, otherwise stored as unknown)')
+args = parser.parse_args()
+FILENAME = args.filename
 
 
 if os.path.isfile(FILENAME):
@@ -59,3 +63,11 @@ try:
     os.system('dieharder ' + DIEHARDER_OPTIONS + ' -f ' + FILENAME + ' > ' + FILENAME + '.dieharder.txt')
 except:
     print('Can\'t run dieharder')
+
+# Record the results by serial number
+if args.db:
+    import truerng_store
+    with truerng_store.ResultStore(args.db) as store:
+        results = truerng_store.add_capture_results(store, FILENAME, args.serial)
+    print('\n *** Recorded in ' + args.db + ' *** \n')
+    print(results)
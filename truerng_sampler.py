@@ -0,0 +1,221 @@
+#!/usr/bin/python3
+
+# TrueRNG Unbiased Integer Sampler
+# 10/19/2026
+#
+# Requires Python 3.8, numpy
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Numpy package with:   python -m pip install numpy
+#
+# Turns random bytes into unbiased integers in [0, n) without wasting device bytes.
+# Taking (random value % n) is biased unless n divides the range, and throwing away
+# whole bytes that fall outside an alphabet wastes most of them.  This uses Lemire's
+# multiply-and-reject method on k byte words, and packs j outputs into each word
+# (a draw from [0, n^j) split into j base n digits) with k and j chosen to use the
+# fewest bytes per output.  All draws are done in bulk with numpy.
+#
+# Example:
+#   sampler = truerng_sampler.ByteSampler(ser.read)
+#   indexes = sampler.integers(len(wordlist), 20)
+
+import math
+
+import numpy as np
+
+# Bytes requested from a device each time the buffer runs dry
+REFILL_SIZE = 4096
+
+# Largest word used for a draw (k*8 bits)
+MAX_WORD_BYTES = 8
+
+# Largest range supported
+MAX_RANGE = 2**32
+
+M32 = np.uint64(0xFFFFFFFF)
+
+
+#########################
+# Function: choose_draw #
+#########################
+# Returns (bytes per draw, outputs per draw, expected bytes per output) for the
+# cheapest way to sample from [0, n).
+def choose_draw(n):
+    if n < 1 or n > MAX_RANGE:
+        raise ValueError('n must be between 1 and ' + str(MAX_RANGE))
+    best = None
+    for k in range(1, MAX_WORD_BYTES + 1):
+        w = 2**(8*k)
+        if n > w:
+            continue
+        # as many base n digits as fit in the word
+        j = 1
+        while n**(j + 1) <= w:
+            j += 1
+        for digits in range(1, j + 1):
+            big_n = n**digits
+            accept = 1.0 - (w % big_n) / float(w)
+            cost = k / (digits * accept)
+            if best is None or cost < best[2]:
+                best = (k, digits, cost)
+    return best
+
+
+############################
+# Function: string_entropy #
+############################
+# Exact bits of entropy in a string of length characters chosen uniformly from an
+# alphabet of size characters
+def string_entropy(size, length):
+    return length * math.log2(size) if size > 0 else 0.0
+
+
+##########################
+# Function: multiply_128 #
+##########################
+# r * big_n for w bit words r (uint64 array) and big_n < 2^w, using 32 bit limbs so
+# nothing overflows.  Returns (r*big_n >> w, r*big_n mod 2^w).
+def multiply_128(r, big_n, w):
+    a0 = r & M32
+    a1 = r >> np.uint64(32)
+    b0 = np.uint64(big_n & 0xFFFFFFFF)
+    b1 = np.uint64(big_n >> 32)
+    p00 = a0 * b0
+    p01 = a0 * b1
+    p10 = a1 * b0
+    mid = (p00 >> np.uint64(32)) + (p01 & M32) + (p10 & M32)
+    lo = (p00 & M32) | (mid << np.uint64(32))
+    hi = a1 * b1 + (p01 >> np.uint64(32)) + (p10 >> np.uint64(32)) + (mid >> np.uint64(32))
+    if w == 64:
+        return hi, lo
+    return (hi << np.uint64(64 - w)) | (lo >> np.uint64(w)), lo & np.uint64(2**w - 1)
+
+
+class ByteSampler:
+    # source is either bytes (a fixed buffer) or a function like ser.read that
+    # returns up to the requested number of bytes
+    def __init__(self, source, refill_size=REFILL_SIZE):
+        if callable(source):
+            self.read = source
+            self.buffer = np.zeros(0, dtype=np.uint8)
+        else:
+            self.read = None
+            self.buffer = np.frombuffer(bytes(source), dtype=np.uint8)
+        self.position = 0
+        self.refill_size = refill_size
+        self.bytes_consumed = 0
+        self.bytes_read = len(self.buffer)
+        self.outputs = 0
+        self.ideal_bits = 0.0
+
+    # Makes sure at least nbytes are buffered, reading more from the device if needed
+    def _fill(self, nbytes):
+        available = len(self.buffer) - self.position
+        if available >= nbytes:
+            return
+        if self.read is None:
+            raise EOFError('Random buffer exhausted')
+        parts = [self.buffer[self.position:]]
+        while available < nbytes:
+            data = self.read(max(self.refill_size, nbytes - available))
+            if not data:
+                raise EOFError('Random source returned no data')
+            parts.append(np.frombuffer(bytes(data), dtype=np.uint8))
+            available += len(data)
+            self.bytes_read += len(data)
+        self.buffer = np.concatenate(parts)
+        self.position = 0
+
+    # Returns an array of count unbiased integers in [0, n)
+    def integers(self, n, count):
+        count = int(count)
+        if n == 1 or count == 0:
+            self.outputs += count
+            return np.zeros(count, dtype=np.int64)
+        k, digits, cost = choose_draw(n)
+        big_n = n**digits
+        threshold = np.uint64((2**(8*k)) % big_n)
+
+        needed = -(-count // digits)
+        accepted = []
+        while needed > 0:
+            # Draw enough words for the expected number of accepts plus a margin
+            draws = int(needed * cost * digits / k * 1.05) + 8
+            available = len(self.buffer) - self.position
+            if self.read is None:
+                draws = min(draws, available // k)
+                if draws == 0:
+                    raise EOFError('Random buffer exhausted')
+            self._fill(draws * k)
+            raw = self.buffer[self.position:self.position + draws*k].reshape(draws, k)
+            r = np.zeros(draws, dtype=np.uint64)
+            for i in range(k):
+                r = (r << np.uint64(8)) | raw[:, i]
+            high, low = multiply_128(r, big_n, 8*k)
+            ok = np.flatnonzero(low >= threshold)
+            if len(ok) > needed:
+                ok = ok[:needed]
+                used = int(ok[-1]) + 1
+            else:
+                used = draws
+            # Bytes after the last accepted draw stay in the buffer
+            self.position += used * k
+            self.bytes_consumed += used * k
+            accepted.append(high[ok])
+            needed -= len(ok)
+
+        values = np.concatenate(accepted)
+        # Split each draw into base n digits
+        out = np.empty((len(values), digits), dtype=np.int64)
+        for i in range(digits):
+            out[:, i] = values % np.uint64(n)
+            values //= np.uint64(n)
+        self.outputs += count
+        self.ideal_bits += count * math.log2(n)
+        return out.ravel()[:count]
+
+    # Random items from a sequence (like a wordlist or alphabet)
+    def choice(self, items, count):
+        return [items[i] for i in self.integers(len(items), count)]
+
+    # Yields chunks of newline separated random strings over an ASCII alphabet,
+    # batch strings at a time, so callers can stream thousands of passwords
+    def strings(self, alphabet, length, count, batch=1024):
+        table = np.frombuffer(alphabet.encode('ascii'), dtype=np.uint8)
+        remaining = count
+        while remaining > 0:
+            rows = min(batch, remaining)
+            index = self.integers(len(table), rows * length).reshape(rows, length)
+            lines = np.empty((rows, length + 1), dtype=np.uint8)
+            lines[:, :length] = table[index]
+            lines[:, length] = ord('\n')
+            remaining -= rows
+            yield lines.tobytes()
+
+    # Device bits used for each output so far
+    def bits_per_output(self):
+        return 8.0 * self.bytes_consumed / self.outputs if self.outputs else 0.0
+
+    # Fraction of the consumed device entropy that ended up in the outputs
+    def efficiency(self):
+        return self.ideal_bits / (8.0 * self.bytes_consumed) if self.bytes_consumed else 0.0
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+
+    # Quick check with os.urandom: truerng_sampler.py N COUNT
+    n = int(sys.argv[1]) if len(sys.argv) >= 2 else 94
+    count = int(sys.argv[2]) if len(sys.argv) >= 3 else 1000000
+    sampler = ByteSampler(os.urandom)
+    values = sampler.integers(n, count)
+    k, digits, cost = choose_draw(n)
+    print('Range [0, ' + str(n) + '): ' + str(k) + ' byte words, ' + str(digits) + ' outputs per word')
+    print('Bits per output: ' + '{:2.3f}'.format(sampler.bits_per_output()) +
+          ' (ideal ' + '{:2.3f}'.format(math.log2(n)) + ', efficiency ' +
+          '{:2.1f}'.format(100.0*sampler.efficiency()) + '%)')
+    if n <= 65536:
+        counts = np.bincount(values, minlength=n)
+        print('Min / Max count: ' + str(counts.min()) + ' / ' + str(counts.max()) +
+              ' (expected ' + '{:2.1f}'.format(count/n) + ')')
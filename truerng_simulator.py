@@ -0,0 +1,287 @@
+#!/usr/bin/python3
+
+# TrueRNG Device Simulator
+# 10/19/2026
+#
+# Requires Python 3.8, numpy (Linux only)
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Numpy package with:   python -m pip install numpy
+#
+# Creates a pty that behaves like a TrueRNG, TrueRNGpro or TrueRNGproV2 so the
+# capture and test scripts can be run without hardware.  The pty is put in packet
+# mode with EXTPROC set, so every time a program sets the baud rate the simulator
+# is woken up and reads the new speed.  The 110 / 300 / 110 / <mode> "knock"
+# sequence (see modeChange in truerng_mode.py) switches the output format:
+#
+#   MODE_NORMAL, MODE_RNG1WHITE, MODE_RNG2WHITE   random bytes
+#   MODE_PSDEBUG                                  millivolt lines ("16012\n")
+#   MODE_RNGDEBUG                                 "0x0RRR 0x0RRR\n"
+#   MODE_RAW_BIN                                  two little endian 16 bit ADC samples
+#   MODE_RAW_ASC                                  "RRR,RRR\n" ADC samples
+#   MODE_UNWHITENED                               "NNN," values 0-511
+#   MODE_NORMAL_ASC, MODE_NORMAL_ASC_SLOW         random bytes as hex
+#
+# Output is rate limited and faults can be injected: stalls (no data for a while),
+# stuck bytes (runs of one value) and bias (bits are 1 with probability 0.5 + bias).
+#
+# truerng_simulator.py [--model TrueRNGproV2] [--rate BYTES/S] [--link /tmp/ttyTrueRNG]
+#                      [--stall SECONDS --stall-every SECONDS] [--stuck-prob P --stuck-run N] [--bias B]
+# Linux example:  python3 truerng_simulator.py --link /tmp/ttyTrueRNG &
+#                 python3 truerng_test.py /tmp/ttyTrueRNG --model TrueRNGproV2 --headless
+
+import argparse
+import fcntl
+import os
+import pty
+import select
+import struct
+import termios
+import threading
+import time
+import tty
+
+import numpy as np
+
+# Baud rate: mode (same table as modeChange)
+MODES = {300: 'MODE_NORMAL',
+         1200: 'MODE_PSDEBUG',
+         2400: 'MODE_RNGDEBUG',
+         4800: 'MODE_RNG1WHITE',
+         9600: 'MODE_RNG2WHITE',
+         19200: 'MODE_RAW_BIN',
+         38400: 'MODE_RAW_ASC',
+         57600: 'MODE_UNWHITENED',
+         115200: 'MODE_NORMAL_ASC',
+         230400: 'MODE_NORMAL_ASC_SLOW'}
+
+# termios speed constants to baud rates
+SPEEDS = {getattr(termios, 'B' + str(baud)): baud for baud in [110] + list(MODES) if hasattr(termios, 'B' + str(baud))}
+
+# Knock sequence that comes before the mode's baud rate
+KNOCK = (110, 300, 110)
+
+# Output rate in bytes per second and PS voltage in millivolts for each model
+MODELS = {'TrueRNG': {'rate': 50000, 'ps_voltage': None},
+          'TrueRNGpro': {'rate': 420000, 'ps_voltage': 9000},
+          'TrueRNGproV2': {'rate': 440000, 'ps_voltage': 16000}}
+
+# EXTPROC is not exported by the termios module (linux/termios.h)
+EXTPROC = getattr(termios, 'EXTPROC', 0o200000)
+
+# Bytes generated and written at a time
+CHUNK_SIZE = 4096
+
+# Seconds of output that can be sent at once after the reader falls behind
+BURST_SECONDS = 0.1
+
+
+####################
+# Class: Simulator #
+####################
+class Simulator:
+    def __init__(self, model='TrueRNGproV2', rate=None, mode='MODE_NORMAL', stall=0.0, stall_every=0.0,
+                 stuck_prob=0.0, stuck_run=64, bias=0.0, seed=None, verbose=False):
+        self.model = model
+        self.rate = MODELS[model]['rate'] if rate is None else rate
+        self.mode = mode
+        self.stall = stall
+        self.stall_every = stall_every
+        self.stuck_prob = stuck_prob
+        self.stuck_run = stuck_run
+        self.bias = bias
+        self.verbose = verbose
+        self.rng = np.random.default_rng(seed)
+        self.knock = 0
+        self.mode_changes = 0
+        self.bytes_written = 0
+
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        attributes = termios.tcgetattr(self.slave)
+        attributes[3] |= EXTPROC
+        termios.tcsetattr(self.slave, termios.TCSANOW, attributes)
+        fcntl.ioctl(self.master, termios.TIOCPKT, struct.pack('i', 1))
+        os.set_blocking(self.master, False)
+        self.port = os.ttyname(self.slave)
+        self.speed = self.read_speed()
+        self.stop_read, self.stop_write = os.pipe()
+        self.realtime = None
+        self.thread = None
+
+    def read_speed(self):
+        return SPEEDS.get(termios.tcgetattr(self.slave)[5])
+
+    # Follows the knock sequence; the baud rate after a complete knock sets the mode
+    def speed_changed(self, baud):
+        if self.knock == len(KNOCK):
+            self.knock = 0
+            if baud in MODES and self.model != 'TrueRNG':
+                self.mode = MODES[baud]
+                self.mode_changes += 1
+                if self.verbose:
+                    print(time.strftime('%H:%M:%S') + ' Switched to ' + self.mode)
+                return
+        if baud == KNOCK[self.knock]:
+            self.knock += 1
+        else:
+            self.knock = 1 if baud == KNOCK[0] else 0
+
+    def random_bytes(self, n):
+        if self.bias:
+            bits = self.rng.random((n, 8)) < 0.5 + self.bias
+            data = np.packbits(bits, axis=1).ravel()
+        else:
+            data = self.rng.integers(0, 256, n, dtype=np.uint8)
+        if self.stuck_prob and self.rng.random() < self.stuck_prob:
+            start = int(self.rng.integers(0, max(1, n - self.stuck_run)))
+            data[start:start + self.stuck_run] = data[start]
+        return data.tobytes()
+
+    def adc_samples(self, n, mean=512, std=100):
+        samples = np.clip(np.rint(self.rng.normal(mean, std, n)), 0, 1023).astype(np.int64)
+        if self.stuck_prob and self.rng.random() < self.stuck_prob:
+            start = int(self.rng.integers(0, max(1, n - self.stuck_run)))
+            samples[start:start + self.stuck_run] = samples[start]
+        return samples
+
+    # Output of the current mode, about CHUNK_SIZE bytes
+    def generate(self):
+        mode = self.mode if self.model != 'TrueRNG' else 'MODE_NORMAL'
+        if mode == 'MODE_PSDEBUG':
+            volts = np.rint(self.rng.normal(MODELS[self.model]['ps_voltage'] or 5000, 20, CHUNK_SIZE // 6))
+            return ''.join(str(int(v)) + '\n' for v in volts).encode('ascii')
+        if mode == 'MODE_RNGDEBUG':
+            samples = self.adc_samples(CHUNK_SIZE // 7)
+            return ''.join('0x0{:03X} 0x0{:03X}\n'.format(a, b)
+                           for a, b in zip(samples[0::2], samples[1::2])).encode('ascii')
+        if mode == 'MODE_RAW_BIN':
+            return self.adc_samples(CHUNK_SIZE // 2).astype('<u2').tobytes()
+        if mode == 'MODE_RAW_ASC':
+            samples = self.adc_samples(CHUNK_SIZE // 4)
+            return ''.join(str(a) + ',' + str(b) + '\n' for a, b in zip(samples[0::2], samples[1::2])).encode('ascii')
+        if mode == 'MODE_UNWHITENED':
+            samples = np.clip(self.adc_samples(CHUNK_SIZE // 4, 256, 50), 0, 511)
+            return ''.join(str(v) + ',' for v in samples).encode('ascii')
+        if mode in ('MODE_NORMAL_ASC', 'MODE_NORMAL_ASC_SLOW'):
+            return self.random_bytes(CHUNK_SIZE // 2).hex().upper().encode('ascii')
+        return self.random_bytes(CHUNK_SIZE)
+
+    # Writes at the rate limit and watches for baud rate changes until stop()
+    def run(self):
+        # The pty only says that the settings changed, not how many times, so each
+        # knock step has to be read before the next one replaces it.  A real-time
+        # thread is woken ahead of the program knocking; without one (not root) steps
+        # can be missed when the CPUs are busy.
+        try:
+            os.sched_setscheduler(threading.get_native_id(), os.SCHED_FIFO, os.sched_param(1))
+            self.realtime = True
+        except (AttributeError, OSError):
+            self.realtime = False
+        epoch = start = time.perf_counter()
+        sent = 0
+        pending = b''
+        while True:
+            now = time.perf_counter()
+            rate = self.rate / 10 if self.mode == 'MODE_NORMAL_ASC_SLOW' else self.rate
+            wait = None
+            writable = True
+            if rate > 0:
+                ahead = sent / rate - (now - start)
+                if ahead < -BURST_SECONDS:
+                    # Nobody was reading; don't save up more than a burst
+                    start -= ahead + BURST_SECONDS
+                elif ahead > 0:
+                    writable = False
+                    wait = ahead
+            if self.knock:
+                # Stay idle during a knock so the next step is noticed right away
+                writable = False
+                wait = None
+            elif self.stall and self.stall_every:
+                # Stall for the last "stall" seconds of every "stall_every" seconds
+                phase = (now - epoch) % self.stall_every
+                if phase > self.stall_every - self.stall:
+                    writable = False
+                    wait = self.stall_every - phase
+
+            ready_read, ready_write, _ = select.select([self.master, self.stop_read],
+                                                      [self.master] if writable else [], [], wait)
+            if self.stop_read in ready_read:
+                return
+            if self.master in ready_read:
+                try:
+                    os.read(self.master, 4096)
+                except OSError:
+                    pass
+                speed = self.read_speed()
+                if speed != self.speed:
+                    self.speed = speed
+                    self.speed_changed(speed)
+                    # Data from the previous mode is dropped like a real mode change
+                    pending = b''
+            if self.master in ready_write:
+                if not pending:
+                    pending = self.generate()
+                try:
+                    count = os.write(self.master, pending)
+                except (BlockingIOError, OSError):
+                    count = 0
+                pending = pending[count:]
+                sent += count
+                self.bytes_written += count
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='truerng-simulator', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.thread is not None:
+            os.write(self.stop_write, b'x')
+            self.thread.join()
+            self.thread = None
+        os.close(self.master)
+        os.close(self.slave)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulate a TrueRNG on a pty')
+    parser.add_argument('--model', choices=list(MODELS), default='TrueRNGproV2')
+    parser.add_argument('--rate', type=float, default=None,
+                        help='bytes per second (default the model\'s rate, 0 = unlimited)')
+    parser.add_argument('--mode', choices=list(MODES.values()), default='MODE_NORMAL', help='starting mode')
+    parser.add_argument('--link', help='also make this symlink to the pty (for example /tmp/ttyTrueRNG)')
+    parser.add_argument('--stall', type=float, default=0.0, help='fault: seconds without data ...')
+    parser.add_argument('--stall-every', type=float, default=0.0, help='... every this many seconds')
+    parser.add_argument('--stuck-prob', type=float, default=0.0,
+                        help='fault: probability per %d byte chunk of a run of one value' % CHUNK_SIZE)
+    parser.add_argument('--stuck-run', type=int, default=64, help='length of the stuck runs')
+    parser.add_argument('--bias', type=float, default=0.0, help='fault: bits are 1 with probability 0.5 + BIAS')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    simulator = Simulator(args.model, args.rate, args.mode, args.stall, args.stall_every, args.stuck_prob,
+                          args.stuck_run, args.bias, args.seed, verbose=True)
+    if args.link:
+        if os.path.islink(args.link):
+            os.remove(args.link)
+        os.symlink(simulator.port, args.link)
+
+    print('==================================================')
+    print('TrueRNG Simulator (' + args.model + ') on ' + simulator.port +
+          (' (' + args.link + ')' if args.link else ''))
+    print('==================================================')
+    simulator.start()
+    time.sleep(0.1)
+    if not simulator.realtime:
+        print('Not running with real-time priority (needs root): mode changes can be missed on a busy CPU')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    simulator.stop()
+    if args.link and os.path.islink(args.link):
+        os.remove(args.link)
+    print('Wrote ' + str(simulator.bytes_written) + ' bytes, ' + str(simulator.mode_changes) + ' mode changes')
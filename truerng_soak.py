@@ -0,0 +1,372 @@
+#!/usr/bin/python3
+
+# TrueRNG Continuous Soak Test
+# 10/19/2026
+#
+# Requires Python 3.8, pyserial, numpy
+#
+# On Linux - may need to be root or set /dev/tty port permissions to 666
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Pyserial package with:   python -m pip install pyserial
+# Install Numpy package with:   python -m pip install numpy
+#
+# Burn-in that can run for weeks in constant memory and disk.  The device is found
+# and read continuously (put in MODE_NORMAL each time the port is opened, so a
+# replugged device is too); data goes into a ring of
+# capture files (window 0 to ring_00.data, window 1 to ring_01.data, ... wrapping
+# around), so the disk used is fixed at RING x WINDOW bytes.  Each window is analyzed
+# while it is captured (the truerng_analyze.py kernels plus the continuous health
+# tests from truerng_metrics.py), one JSON line per window goes to summary.jsonl
+# and the capture file of a window that fails is kept (at most --keep-failed of
+# them, oldest deleted first).  summary.jsonl is rotated to summary.jsonl.1 when it
+# reaches --summary-mb.  With --drift each complete window's byte histogram is also
+# compared with the device's baseline (see truerng_drift.py).  On Linux a device with a serial
+# number is followed across replugs (see truerng_registry.py), so the soak reopens it
+# on its new port instead of retrying the old one.
+#
+# truerng_soak.py [PORT] [--dir soak] [--window-mb 64] [--ring 4] [--keep-failed 4] [--hours H] [--db FILE]
+#                 [--drift FILE]
+# Linux example:  python3 truerng_soak.py --dir /var/tmp/soak
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import serial
+from serial.tools import list_ports
+
+import truerng_analyze
+import truerng_device
+import truerng_drift
+import truerng_metrics
+import truerng_reader
+
+# Kernels run on every window (ngram3 needs 64 MiB of counters, so it's left out)
+SOAK_KERNELS = 'histogram,entropy,pi,serial,fips,ngram2'
+
+# Bytes read from the device at a time
+BLOCK_SIZE = 64 * 1024
+
+# Read timeout in seconds
+READ_TIMEOUT = 10
+
+# Failed opens or reads (timeouts) before a window is ended short
+MAX_PORT_ERRORS = 10
+
+# Limits for a window to pass.  A random 64 MiB window is nowhere near any of these;
+# the p-value limit gives about one false alarm in a million windows per test.
+MIN_ENTROPY = 7.99
+MAX_PI_ERROR = 0.5
+MAX_MEAN_ERROR = 0.5
+MAX_SERIAL_CORRELATION = 0.01
+MIN_CHISQUARE_P = 1e-6
+MAX_FIPS_FAILURE_RATE = 0.01
+
+
+#########################
+# Class: StreamAnalyzer #
+#########################
+# Runs truerng_analyze kernels on data as it arrives.  Data is held back until a
+# whole chunk plus the kernels' lookahead is available, so the results are the same
+# as analyzing the window's file afterwards.
+class StreamAnalyzer:
+    def __init__(self, kernels=SOAK_KERNELS):
+        self.kernels = truerng_analyze.get_kernels(kernels)
+        self.align = truerng_analyze.alignment(self.kernels)
+        self.overlap = max([k.overlap for k in self.kernels] + [0])
+        self.chunk = max(truerng_analyze.CHUNK_SIZE // self.align, 1) * self.align
+        self.reset()
+
+    def reset(self):
+        self.states = [k.new() for k in self.kernels]
+        self.pending = bytearray()
+        self.repetition_failures = 0
+        self.proportion_failures = 0
+
+    def run(self, data, lookahead):
+        samples = np.frombuffer(data, dtype=np.uint8)
+        following = np.frombuffer(lookahead, dtype=np.uint8)
+        for i, k in enumerate(self.kernels):
+            self.states[i] = k.update(self.states[i], samples, following[:k.overlap])
+        if truerng_metrics.longest_run(samples) >= truerng_metrics.REPETITION_CUTOFF:
+            self.repetition_failures += 1
+        self.proportion_failures += truerng_metrics.proportion_failures(samples)
+
+    def feed(self, data):
+        self.pending += data
+        while len(self.pending) >= self.chunk + self.overlap:
+            self.run(bytes(self.pending[:self.chunk]), bytes(self.pending[self.chunk:self.chunk + self.overlap]))
+            del self.pending[:self.chunk]
+
+    # Analyzes what is left and returns the kernel states
+    def finish(self):
+        if self.pending:
+            self.run(bytes(self.pending), b'')
+            self.pending = bytearray()
+        return self.states
+
+    def results(self, states=None):
+        results = {k.name: k.result(s) for k, s in zip(self.kernels, states or self.states)}
+        results.get('histogram', {}).pop('counts', None)
+        return results
+
+
+##########################
+# Function: check_window #
+##########################
+# Returns the list of reasons a window failed (empty if it passed)
+def check_window(results, health, nbytes, expected):
+    reasons = []
+    if nbytes < expected:
+        reasons.append('short window (' + str(nbytes) + ' of ' + str(expected) + ' bytes)')
+    if nbytes == 0:
+        return reasons
+    if results['entropy']['entropy'] < MIN_ENTROPY:
+        reasons.append('entropy ' + '{:1.6f}'.format(results['entropy']['entropy']))
+    if abs(results['histogram']['mean'] - 127.5) > MAX_MEAN_ERROR:
+        reasons.append('mean ' + '{:1.4f}'.format(results['histogram']['mean']))
+    for name in ('histogram', 'ngram2'):
+        if results[name]['chisquare_p'] < MIN_CHISQUARE_P:
+            reasons.append(name + ' chi-square p ' + '{:1.2e}'.format(results[name]['chisquare_p']))
+    if results['pi']['error_percent'] > MAX_PI_ERROR:
+        reasons.append('pi error ' + '{:1.4f}'.format(results['pi']['error_percent']) + '%')
+    if abs(results['serial']['serial_correlation']) > MAX_SERIAL_CORRELATION:
+        reasons.append('serial correlation ' + '{:1.6f}'.format(results['serial']['serial_correlation']))
+    fips = results['fips']
+    failures = sum(fips[name] for name in ('monobit', 'poker', 'runs', 'long_run'))
+    if fips['blocks'] and failures > MAX_FIPS_FAILURE_RATE * fips['blocks']:
+        reasons.append('FIPS 140-2 failures ' + str(failures) + ' of ' + str(fips['blocks']) + ' blocks')
+    if health['repetition_failures'] or health['proportion_failures']:
+        reasons.append('health tests (repetition ' + str(health['repetition_failures']) +
+                       ', proportion ' + str(health['proportion_failures']) + ')')
+    return reasons
+
+
+####################
+# Class: RingStore #
+####################
+# The ring of capture files and the kept files of failed windows
+class RingStore:
+    def __init__(self, directory, slots, keep_failed):
+        self.directory = directory
+        self.slots = slots
+        self.keep_failed = keep_failed
+        os.makedirs(directory, exist_ok=True)
+
+    def slot_path(self, window):
+        return os.path.join(self.directory, 'ring_' + '{:02d}'.format(window % self.slots) + '.data')
+
+    # Kept files, oldest first
+    def failed_files(self):
+        names = [name for name in os.listdir(self.directory) if name.startswith('failed_') and name.endswith('.data')]
+        return sorted(names, key=lambda name: os.path.getmtime(os.path.join(self.directory, name)))
+
+    # Moves a window's capture out of the ring, deleting the oldest kept files
+    # beyond keep_failed.  Returns the new name or None if nothing is kept.
+    def keep(self, window):
+        if self.keep_failed <= 0:
+            return None
+        name = 'failed_' + time.strftime('%Y%m%d.%H%M%S') + '_' + str(window) + '.data'
+        os.replace(self.slot_path(window), os.path.join(self.directory, name))
+        for old in self.failed_files()[:-self.keep_failed]:
+            os.remove(os.path.join(self.directory, old))
+        return name
+
+
+#####################
+# Class: SummaryLog #
+#####################
+# JSON lines file rotated to .1 when it reaches max_bytes
+class SummaryLog:
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def write(self, record):
+        line = json.dumps(record, default=float) + '\n'
+        if os.path.exists(self.path) and os.path.getsize(self.path) + len(line) > self.max_bytes:
+            os.replace(self.path, self.path + '.1')
+        with open(self.path, 'a') as fp:
+            fp.write(line)
+
+
+# Opens the port with a TrueRNGpro / TrueRNGproV2 put in MODE_NORMAL (again after a
+# replug)
+def open_port(port, model=None):
+    mode = 'MODE_NORMAL' if model in ('TrueRNGpro', 'TrueRNGproV2') else None
+    return truerng_device.open_port(port, READ_TIMEOUT, mode)
+
+
+##################
+# Function: soak #
+##################
+# Captures windows until max_windows or the deadline (None for forever) and returns
+# (windows, failed windows), also when stopped with Ctrl-C (the window in progress
+# is dropped).  The port stays open between windows; it is reopened
+# on follower.port (a truerng_registry.DeviceFollower) if given.  Each window is
+# also recorded in result_store (a truerng_store.ResultStore) and its histogram
+# checked against drift (a truerng_drift.DriftStore) if they are given.
+def soak(port, model, store, log, window_bytes, max_windows=None, deadline=None, serial_number=None,
+         result_store=None, drift=None, follower=None):
+    analyzer = StreamAnalyzer()
+    window_bytes = max(window_bytes // analyzer.align, 1) * analyzer.align
+    totals = [k.new() for k in analyzer.kernels]
+    total_bytes = 0
+    windows = 0
+    failed = 0
+    ser = None
+    try:
+        while (max_windows is None or windows < max_windows) and (deadline is None or time.time() < deadline):
+            analyzer.reset()
+            stats = truerng_reader.ReadStats()
+            errors = 0
+            nbytes = 0
+            started = time.time()
+            with open(store.slot_path(windows), 'wb') as fp:
+                while nbytes < window_bytes:
+                    try:
+                        if ser is None:
+                            if follower is not None:
+                                port = follower.port
+                            ser = truerng_reader.InstrumentedReader(open_port(port, model), stats)
+                        data = ser.read(min(BLOCK_SIZE, window_bytes - nbytes))
+                        if not data:
+                            raise serial.SerialException('read timed out')
+                    except (OSError, serial.SerialException):
+                        # Timed out, unplugged or the port went away: reopen it, ending
+                        # the window short if that keeps failing
+                        errors += 1
+                        if ser is not None:
+                            ser.close()
+                        ser = None
+                        if errors >= MAX_PORT_ERRORS:
+                            break
+                        time.sleep(1)
+                        continue
+                    fp.write(data)
+                    analyzer.feed(data)
+                    nbytes += len(data)
+            elapsed = time.time() - started
+
+            states = analyzer.finish()
+            results = analyzer.results()
+            health = {'repetition_failures': analyzer.repetition_failures,
+                      'proportion_failures': analyzer.proportion_failures}
+            reasons = check_window(results, health, nbytes, window_bytes)
+            totals = [k.merge(t, s) for k, t, s in zip(analyzer.kernels, totals, states)]
+            total_bytes += nbytes
+
+            kept = store.keep(windows) if reasons else None
+            # Only complete windows go into the baseline (a short or empty one from port
+            # errors would count as a baseline run and dilute the recent histogram)
+            drifted = None
+            drift_results = None
+            if drift is not None and nbytes >= window_bytes and not errors:
+                histogram = [k.name for k in analyzer.kernels].index('histogram')
+                drift_results = drift.update(serial_number or port, {'normal': states[histogram]})
+                drift.save()
+                drifted = [name for name, values in drift_results.items() if values and values['drift']]
+            record = {'window': windows, 'time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started)),
+                      'port': port, 'model': model, 'serial': serial_number, 'bytes': nbytes, 'seconds': elapsed,
+                      'rate_mbits': nbytes * 8 / elapsed / 1e6 if elapsed else 0.0,
+                      'passed': not reasons, 'reasons': reasons, 'kept': kept, 'port_errors': errors,
+                      'results': results, 'health': health, 'reads': stats.summary(), 'drift': drifted}
+            log.write(record)
+            if result_store is not None:
+                result_store.add_soak_window(record, started)
+
+            windows += 1
+            failed += 1 if reasons else 0
+            cumulative = analyzer.results(totals)
+            print(record['time'] + ' window ' + str(windows) + ' : ' +
+                  '{:2.3f}'.format(record['rate_mbits']) + ' Mbits/s : entropy ' +
+                  '{:1.6f}'.format(results['entropy']['entropy']) + ' : pi error ' +
+                  '{:1.4f}'.format(results['pi']['error_percent']) + '% : ' +
+                  ('*** PASSED ***' if not reasons else '*** FAILED *** ' + ', '.join(reasons)))
+            print('    total ' + str(total_bytes) + ' bytes : entropy ' +
+                  '{:1.6f}'.format(cumulative['entropy']['entropy']) + ' : pi error ' +
+                  '{:1.4f}'.format(cumulative['pi']['error_percent']) + '% : ' +
+                  str(failed) + ' of ' + str(windows) + ' windows failed')
+            if drift_results is not None:
+                for line in truerng_drift.format_results(drift_results):
+                    print('    ' + line)
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        print('')
+    finally:
+        if ser is not None:
+            ser.close()
+    return windows, failed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Soak test a TrueRNG into a fixed size ring of capture files')
+    parser.add_argument('port', nargs='?', default=None, help='com port to read (default first TrueRNG found)')
+    parser.add_argument('--dir', default='soak', help='directory for the ring, kept failures and summary.jsonl')
+    parser.add_argument('--window-mb', type=float, default=64, help='MiB per window / ring file (default 64)')
+    parser.add_argument('--ring', type=int, default=4, help='capture files in the ring (default 4)')
+    parser.add_argument('--keep-failed', type=int, default=4, help='failed windows to keep (default 4)')
+    parser.add_argument('--summary-mb', type=float, default=16, help='rotate summary.jsonl at this size')
+    parser.add_argument('--windows', type=int, default=None, help='stop after this many windows')
+    parser.add_argument('--hours', type=float, default=None, help='stop after this many hours')
+    parser.add_argument('--db', help='also record every window in this results database (see truerng_store.py)')
+    parser.add_argument('--drift', help='compare every window with the baselines in this file (see truerng_drift.py)')
+    args = parser.parse_args()
+
+    ids = {'04D8:F5FE': 'TrueRNG', '16D0:0AA0': 'TrueRNGpro', '04D8:EBB5': 'TrueRNGproV2'}
+    port, model, serial_number = args.port, None, None
+    for temp in list_ports.comports():
+        for vidpid, name in ids.items():
+            if vidpid in temp[2] and (port is None or temp[0] == port):
+                port, model, serial_number = temp[0], name, temp.serial_number
+    if port is None:
+        print('No TrueRNG devices detected')
+        sys.exit(1)
+
+    window_bytes = int(args.window_mb * 1024 * 1024)
+    print('==================================================')
+    print('TrueRNG Soak Test on ' + port + ' (' + str(model) + ')')
+    print(str(args.ring) + ' x ' + '{:g}'.format(args.window_mb) + ' MiB ring in ' + args.dir +
+          ', up to ' + str(args.keep_failed) + ' failed windows kept')
+    print('==================================================')
+
+    store = RingStore(args.dir, args.ring, args.keep_failed)
+    log = SummaryLog(os.path.join(args.dir, 'summary.jsonl'), int(args.summary_mb * 1024 * 1024))
+    deadline = time.time() + args.hours * 3600 if args.hours else None
+    result_store = None
+    if args.db:
+        import truerng_store
+        result_store = truerng_store.ResultStore(args.db)
+    drift = None
+    if args.drift:
+        drift = truerng_drift.DriftStore(args.drift)
+
+    # Follow the device to its new port after a replug (Linux, devices with a serial number)
+    registry = None
+    follower = None
+    if sys.platform.startswith('linux') and serial_number:
+        import truerng_registry
+        registry = truerng_registry.DeviceRegistry()
+        try:
+            registry.start()
+            follower = truerng_registry.DeviceFollower(registry, port, serial_number)
+        except OSError as e:
+            print('Not following replugs (' + str(e) + ')')
+            registry = None
+
+    failed = 0
+    try:
+        windows, failed = soak(port, model, store, log, window_bytes, args.windows, deadline, serial_number,
+                               result_store, drift, follower)
+    except KeyboardInterrupt:
+        print('')
+    finally:
+        if registry is not None:
+            registry.stop()
+        if result_store is not None:
+            result_store.close()
+    sys.exit(1 if failed else 0)
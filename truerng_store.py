@@ -0,0 +1,422 @@
+#!/usr/bin/python3
+
+# TrueRNG Results Store
+# 10/19/2026
+#
+# Requires Python 3.8 (sqlite3 is part of the standard library)
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+#
+# Keeps every test run in one SQLite database keyed by device serial number, model,
+# firmware revision, mode and time: truerng_test.py --db, truerng_soak.py --db and
+# truerng_runtests.py --db write to it and JSON lines from truerng_test.py --json or
+# a soak summary.jsonl can be imported.  Rows are inserted in batches (one
+# transaction per batch, WAL journal) so long running processes don't pay for a
+# commit per result.  Every insert also updates a per serial, per day rollup so
+# fleet wide questions ("entropy of every device this month") read a few rows per
+# device per day instead of scanning millions of runs; per device trends use the
+# (serial, time) index.
+#
+# truerng_store.py [--db FILE] import FILE ...
+# truerng_store.py [--db FILE] trend SERIAL [--field entropy] [--since 2026-10-01] [--until 2026-10-31] [--daily]
+# truerng_store.py [--db FILE] fleet [--field entropy] [--since 2026-10-01]
+# truerng_store.py [--db FILE] latest
+# Linux example:  python3 truerng_store.py trend 1A2B3C4D --field ps_voltage --daily
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+# Database used when none is given
+DEFAULT_DB = 'truerng_results.db'
+
+# Measurements with their own columns (and rollup statistics); everything else in a
+# result goes to the details JSON
+FIELDS = ('entropy', 'rate', 'ps_voltage', 'pi_error', 'mean')
+
+# Rows buffered before they are written and the longest a row waits
+BATCH_SIZE = 500
+FLUSH_SECONDS = 5.0
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    serial TEXT NOT NULL,
+    model TEXT,
+    revision TEXT,
+    mode TEXT,
+    source TEXT NOT NULL,
+    passed INTEGER,
+    ''' + ',\n    '.join(field + ' REAL' for field in FIELDS) + ''',
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_serial_time ON runs (serial, time);
+CREATE INDEX IF NOT EXISTS runs_time ON runs (time);
+CREATE TABLE IF NOT EXISTS daily (
+    serial TEXT NOT NULL,
+    day TEXT NOT NULL,
+    model TEXT,
+    runs INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    ''' + ',\n    '.join('n_{0} INTEGER NOT NULL, sum_{0} REAL, min_{0} REAL, max_{0} REAL'.format(field)
+                         for field in FIELDS) + ''',
+    PRIMARY KEY (serial, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS daily_day ON daily (day);
+CREATE TABLE IF NOT EXISTS devices (
+    serial TEXT PRIMARY KEY,
+    model TEXT,
+    revision TEXT,
+    first_time REAL,
+    last_time REAL,
+    last_run INTEGER
+);
+'''
+
+# Adds a batch's per day totals to the rollup (min / max ignore NULLs)
+DAILY_UPSERT = ('INSERT INTO daily (serial, day, model, runs, failures, ' +
+                ', '.join('n_{0}, sum_{0}, min_{0}, max_{0}'.format(field) for field in FIELDS) + ') ' +
+                'VALUES (' + ', '.join(['?'] * (5 + 4 * len(FIELDS))) + ') ' +
+                'ON CONFLICT (serial, day) DO UPDATE SET model = coalesce(excluded.model, model), ' +
+                'runs = runs + excluded.runs, failures = failures + excluded.failures, ' +
+                ', '.join('n_{0} = n_{0} + excluded.n_{0}, '
+                          'sum_{0} = coalesce(sum_{0}, 0) + coalesce(excluded.sum_{0}, 0), '
+                          'min_{0} = coalesce(min(min_{0}, excluded.min_{0}), min_{0}, excluded.min_{0}), '
+                          'max_{0} = coalesce(max(max_{0}, excluded.max_{0}), max_{0}, excluded.max_{0})'
+                          .format(field) for field in FIELDS))
+
+DEVICE_UPSERT = ('INSERT INTO devices (serial, model, revision, first_time, last_time, last_run) '
+                 'VALUES (?, ?, ?, ?, ?, NULL) '
+                 'ON CONFLICT (serial) DO UPDATE SET '
+                 'model = coalesce(excluded.model, model), revision = coalesce(excluded.revision, revision), '
+                 'first_time = min(first_time, excluded.first_time), '
+                 'last_time = max(last_time, excluded.last_time)')
+
+
+# Local day of a unix time ('2026-10-19')
+def day_of(when):
+    return time.strftime('%Y-%m-%d', time.localtime(when))
+
+
+# Unix time from '2026-10-19', '2026-10-19 12:00:00' or '2026-10-19T12:00:00' (local
+# time like the JSON lines the other tools write), or a number of seconds
+def parse_time(text):
+    if text is None:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    text = text.replace('T', ' ')
+    for form in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+        try:
+            return time.mktime(time.strptime(text, form))
+        except ValueError:
+            continue
+    raise ValueError('Unknown time: ' + text)
+
+
+######################
+# Class: ResultStore #
+######################
+# The database.  add() buffers runs; they are written by flush(), which add() calls
+# when BATCH_SIZE runs are waiting or the oldest has waited FLUSH_SECONDS, and by
+# close().
+class ResultStore:
+    def __init__(self, path=DEFAULT_DB, batch_size=BATCH_SIZE, flush_seconds=FLUSH_SECONDS):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.pending = []
+        self.oldest = None
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode = WAL')
+        self.db.execute('PRAGMA synchronous = NORMAL')
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # serial falls back to the port (or 'unknown') for devices without one
+    def add(self, serial, model=None, revision=None, mode=None, source='test', passed=None, values=None,
+            when=None, details=None):
+        values = values or {}
+        row = ((time.time() if when is None else float(when)), str(serial), model, revision, mode, source,
+               None if passed is None else int(bool(passed))) + \
+            tuple(None if values.get(field) is None else float(values[field]) for field in FIELDS) + \
+            (json.dumps(details, default=float) if details else None,)
+        self.pending.append(row)
+        if self.oldest is None:
+            self.oldest = time.monotonic()
+        if len(self.pending) >= self.batch_size or time.monotonic() - self.oldest >= self.flush_seconds:
+            self.flush()
+
+    # A result dictionary from truerng_test.py (test_results)
+    def add_test_result(self, result, when=None):
+        values = {'entropy': result.get('entropy'), 'rate': result.get('normal_rate'),
+                  'ps_voltage': result.get('ps_voltage'), 'pi_error': result.get('pi_error'),
+                  'mean': result.get('mean')}
+        details = {key: value for key, value in result.items()
+                   if key not in ('serial', 'mode', 'revision', 'failed', 'entropy', 'normal_rate',
+                                  'ps_voltage', 'pi_error', 'mean')}
+        # Older interactive runs stored the string 'None' for devices without a serial
+        serial = result.get('serial') if result.get('serial') != 'None' else None
+        self.add(serial or result.get('port') or 'unknown', result.get('mode'),
+                 result.get('revision'), 'MODE_NORMAL', 'test', not result.get('failed'), values, when, details)
+
+    # A window record from truerng_soak.py (summary.jsonl)
+    def add_soak_window(self, record, when=None):
+        results = record.get('results', {})
+        values = {'entropy': results.get('entropy', {}).get('entropy'),
+                  'rate': record.get('rate_mbits'),
+                  'pi_error': results.get('pi', {}).get('error_percent'),
+                  'mean': results.get('histogram', {}).get('mean')}
+        details = {'window': record.get('window'), 'bytes': record.get('bytes'), 'reasons': record.get('reasons'),
+                   'kept': record.get('kept'), 'health': record.get('health'), 'reads': record.get('reads')}
+        self.add(record.get('serial') or record.get('port') or 'unknown', record.get('model'),
+                 record.get('revision'), 'MODE_NORMAL', 'soak', record.get('passed'), values, when, details)
+
+    def flush(self):
+        if not self.pending:
+            return
+        rows = self.pending
+        self.pending = []
+        self.oldest = None
+
+        # Per (serial, day) totals of the batch
+        rollup = {}
+        for row in rows:
+            key = (row[1], day_of(row[0]))
+            entry = rollup.get(key)
+            if entry is None:
+                entry = rollup[key] = [row[1], key[1], row[2], 0, 0] + [0, None, None, None] * len(FIELDS)
+            entry[2] = row[2] or entry[2]
+            entry[3] += 1
+            entry[4] += 1 if row[6] == 0 else 0
+            for i, value in enumerate(row[7:7 + len(FIELDS)]):
+                if value is None:
+                    continue
+                at = 5 + 4 * i
+                entry[at] += 1
+                entry[at + 1] = value if entry[at + 1] is None else entry[at + 1] + value
+                entry[at + 2] = value if entry[at + 2] is None else min(entry[at + 2], value)
+                entry[at + 3] = value if entry[at + 3] is None else max(entry[at + 3], value)
+        devices = {}
+        for row in rows:
+            device = devices.setdefault(row[1], [row[1], row[2], row[3], row[0], row[0]])
+            device[1] = row[2] or device[1]
+            device[2] = row[3] or device[2]
+            device[3] = min(device[3], row[0])
+            device[4] = max(device[4], row[0])
+
+        self.db.execute('BEGIN')
+        try:
+            self.db.executemany('INSERT INTO runs (time, serial, model, revision, mode, source, passed, ' +
+                                ', '.join(FIELDS) + ', details) VALUES (' +
+                                ', '.join(['?'] * (8 + len(FIELDS))) + ')', rows)
+            self.db.executemany(DAILY_UPSERT, list(rollup.values()))
+            self.db.executemany(DEVICE_UPSERT, list(devices.values()))
+            self.db.execute('UPDATE devices SET last_run = (SELECT id FROM runs WHERE runs.serial = devices.serial '
+                            'ORDER BY time DESC LIMIT 1) WHERE serial IN (' +
+                            ', '.join(['?'] * len(devices)) + ')', list(devices))
+            self.db.execute('COMMIT')
+        except Exception:
+            self.db.execute('ROLLBACK')
+            raise
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+    # (time, value, passed) of one device's runs, oldest first
+    def trend(self, serial, field='entropy', since=None, until=None):
+        if field not in FIELDS:
+            raise ValueError('Unknown field: ' + field)
+        self.flush()
+        return self.db.execute('SELECT time, ' + field + ', passed FROM runs WHERE serial = ? AND time >= ? '
+                               'AND time < ? ORDER BY time',
+                               (serial, since if since is not None else float('-inf'),
+                                until if until is not None else float('inf'))).fetchall()
+
+    # (day, runs, failures, mean, min, max) of one device from the rollup
+    def daily_trend(self, serial, field='entropy', since=None, until=None):
+        if field not in FIELDS:
+            raise ValueError('Unknown field: ' + field)
+        self.flush()
+        return self.db.execute('SELECT day, runs, failures, sum_{0} / nullif(n_{0}, 0), min_{0}, max_{0} '
+                               'FROM daily WHERE serial = ? AND day >= ? AND day <= ? ORDER BY day'.format(field),
+                               (serial, day_of(since) if since is not None else '',
+                                day_of(until) if until is not None else '9999')).fetchall()
+
+    # (serial, model, runs, failures, mean, min, max) of every device from the rollup
+    def fleet(self, field='entropy', since=None, until=None):
+        if field not in FIELDS:
+            raise ValueError('Unknown field: ' + field)
+        self.flush()
+        return self.db.execute('SELECT serial, max(model), sum(runs), sum(failures), '
+                               'sum(sum_{0}) / nullif(sum(n_{0}), 0), min(min_{0}), max(max_{0}) '
+                               'FROM daily WHERE day >= ? AND day <= ? GROUP BY serial ORDER BY serial'.format(field),
+                               (day_of(since) if since is not None else '',
+                                day_of(until) if until is not None else '9999')).fetchall()
+
+    # The last run of every device as dictionaries
+    def latest(self):
+        self.flush()
+        cursor = self.db.execute('SELECT devices.serial, devices.model, devices.revision, runs.time, runs.mode, '
+                                 'runs.source, runs.passed, ' + ', '.join('runs.' + field for field in FIELDS) +
+                                 ' FROM devices JOIN runs ON runs.id = devices.last_run ORDER BY devices.serial')
+        names = [description[0] for description in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+#######################
+# Function: parse_ent #
+#######################
+# Values from ent's output (the .ent.txt files written by truerng_runtests.py)
+def parse_ent(text):
+    patterns = {'entropy': r'Entropy = ([0-9.]+) bits per byte',
+                'chisquare': r'samples is ([0-9.]+)',
+                'chisquare_percent': r'exceed this value ([<>0-9.]+) percent',
+                'mean': r'mean value of data bytes is ([0-9.]+)',
+                'pi_error': r'error ([0-9.]+) percent',
+                'serial_correlation': r'coefficient is (-?[0-9.]+)'}
+    values = {}
+    for key, pattern in patterns.items():
+        match = re.search(pattern, text)
+        if match:
+            number = match.group(1).lstrip('<>')
+            values[key] = float(number)
+    return values
+
+
+# Counts from rngtest's output (.rngtest.txt)
+def parse_rngtest(text):
+    values = {}
+    for key, pattern in (('successes', r'FIPS 140-2 successes: ([0-9]+)'),
+                         ('failures', r'FIPS 140-2 failures: ([0-9]+)')):
+        match = re.search(pattern, text)
+        if match:
+            values[key] = int(match.group(1))
+    return values
+
+
+# Number of PASSED / WEAK / FAILED assessments in dieharder's output (.dieharder.txt)
+def parse_dieharder(text):
+    values = {'PASSED': 0, 'WEAK': 0, 'FAILED': 0}
+    for line in text.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) >= 6 and fields[-1] in values:
+            values[fields[-1]] += 1
+    return values
+
+
+#################################
+# Function: add_capture_results #
+#################################
+# Stores the ent, rngtest and dieharder results of a capture file under serial
+# ('unknown' if not given; the file name is kept in the details, not used as a
+# device).  Returns the parsed values.
+def add_capture_results(store, filename, serial=None, model=None, revision=None):
+    results = {}
+    for suffix, parser in (('.ent.txt', parse_ent), ('.rngtest.txt', parse_rngtest),
+                           ('.dieharder.txt', parse_dieharder)):
+        try:
+            with open(filename + suffix) as fp:
+                results[suffix[1:-4]] = parser(fp.read())
+        except OSError:
+            pass
+    ent = results.get('ent', {})
+    passed = None
+    if 'dieharder' in results or 'rngtest' in results:
+        passed = results.get('dieharder', {}).get('FAILED', 0) == 0 and \
+            results.get('rngtest', {}).get('failures', 0) <= results.get('rngtest', {}).get('successes', 0) // 1000
+    details = dict(results, file=os.path.basename(filename))
+    store.add(serial or 'unknown', model, revision, 'MODE_NORMAL', 'runtests', passed,
+              {'entropy': ent.get('entropy'), 'pi_error': ent.get('pi_error'), 'mean': ent.get('mean')},
+              os.path.getmtime(filename) if os.path.exists(filename) else None, details)
+    return results
+
+
+# Imports JSON lines from truerng_test.py --json or truerng_soak.py and returns the
+# number of rows
+def import_json_lines(store, filename):
+    count = 0
+    with open(filename) as fp:
+        for line in fp:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            when = parse_time(record['time']) if record.get('time') else None
+            if 'window' in record:
+                store.add_soak_window(record, when)
+            else:
+                store.add_test_result(record, when)
+            count += 1
+    return count
+
+
+def format_value(value, form='{:1.6f}'):
+    return '-' if value is None else form.format(value)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Store and query TrueRNG test results')
+    parser.add_argument('--db', default=DEFAULT_DB, help='database file (default ' + DEFAULT_DB + ')')
+    sub = parser.add_subparsers(dest='command')
+    imports = sub.add_parser('import', help='import JSON lines from truerng_test.py --json or truerng_soak.py')
+    imports.add_argument('files', nargs='+')
+    trend = sub.add_parser('trend', help='one value of a device over time')
+    trend.add_argument('serial')
+    trend.add_argument('--daily', action='store_true', help='one line per day from the rollup')
+    fleet = sub.add_parser('fleet', help='one value for every device')
+    for command in (trend, fleet):
+        command.add_argument('--field', choices=FIELDS, default='entropy')
+        command.add_argument('--since', help='start (2026-10-01 or 2026-10-01 12:00:00)')
+        command.add_argument('--until', help='end')
+    sub.add_parser('latest', help='the last run of every device')
+    args = parser.parse_args()
+
+    if args.command is None:
+        parser.print_help()
+        sys.exit(1)
+
+    with ResultStore(args.db) as store:
+        before = time.perf_counter()
+        if args.command == 'import':
+            for filename in args.files:
+                print(filename + ': ' + str(import_json_lines(store, filename)) + ' runs')
+        elif args.command == 'trend' and args.daily:
+            for day, runs, failures, mean, low, high in store.daily_trend(
+                    args.serial, args.field, parse_time(args.since), parse_time(args.until)):
+                print(day + '  runs ' + str(runs).rjust(6) + '  failed ' + str(failures).rjust(5) + '  ' +
+                      args.field + ' mean ' + format_value(mean) + '  min ' + format_value(low) +
+                      '  max ' + format_value(high))
+        elif args.command == 'trend':
+            for when, value, passed in store.trend(args.serial, args.field, parse_time(args.since),
+                                                   parse_time(args.until)):
+                print(time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(when)) + '  ' + format_value(value) +
+                      ('' if passed is None else '  PASSED' if passed else '  FAILED'))
+        elif args.command == 'fleet':
+            for serial, model, runs, failures, mean, low, high in store.fleet(
+                    args.field, parse_time(args.since), parse_time(args.until)):
+                print(serial.ljust(16) + ' ' + str(model).ljust(12) + '  runs ' + str(runs).rjust(7) +
+                      '  failed ' + str(failures).rjust(6) + '  ' + args.field + ' mean ' + format_value(mean) +
+                      '  min ' + format_value(low) + '  max ' + format_value(high))
+        elif args.command == 'latest':
+            for run in store.latest():
+                print(run['serial'].ljust(16) + ' ' + str(run['model']).ljust(12) + ' Rev ' +
+                      str(run['revision']).ljust(5) + ' ' +
+                      time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run['time'])) + ' ' + run['source'].ljust(8) +
+                      ' ' + ('-' if run['passed'] is None else 'PASSED' if run['passed'] else 'FAILED') +
+                      '  entropy ' + format_value(run['entropy']) + '  rate ' + format_value(run['rate'], '{:2.3f}') +
+                      '  PS ' + format_value(run['ps_voltage'], '{:2.2f}'))
+        after = time.perf_counter()
+    print('(' + '{:2.2f}'.format(1000.0 * (after - before)) + ' ms)')
@@ -0,0 +1,174 @@
+#!/usr/bin/python3
+
+# TrueRNG Linux sysfs Device Discovery
+# 10/19/2026
+#
+# Requires Python 3.8 (Linux only)
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+#
+# Finds TrueRNG devices by walking /sys/class/tty/*/device up to the USB device each
+# tty belongs to and reading idVendor, idProduct, bcdDevice, serial and the bus
+# position from there.  This replaces running "lsusb -d VID:PID -v | grep bcdDevice"
+# through a shell, which needs lsusb installed, takes tens of milliseconds per call and
+# returns the firmware of whichever matching device lsusb lists first, not the one on
+# the port being tested.  Results are cached for a short time.
+#
+# Every function takes the sysfs root so it can be pointed at a copy or a fake tree.
+#
+# truerng_sysfs.py [--all] [--root DIR]
+# Linux example:  python3 truerng_sysfs.py
+
+import argparse
+import os
+import time
+
+# Where sysfs is mounted
+SYSFS_ROOT = '/sys'
+
+# USB (idVendor, idProduct) of each TrueRNG model
+TRUERNG_IDS = {('04d8', 'f5fe'): 'TrueRNG',
+               ('16d0', '0aa0'): 'TrueRNGpro',
+               ('04d8', 'ebb5'): 'TrueRNGproV2'}
+
+# Seconds a scan is reused before sysfs is read again
+CACHE_SECONDS = 2.0
+
+# Scans by (root, all devices): (time, devices)
+_cache = {}
+
+
+def read_attribute(path, name):
+    try:
+        with open(os.path.join(path, name)) as fp:
+            return fp.read().strip()
+    except OSError:
+        return None
+
+
+##########################
+# Function: bcd_revision #
+##########################
+# Formats bcdDevice the way lsusb does ("0100" -> "1.00")
+def bcd_revision(bcd):
+    if not bcd:
+        return None
+    value = int(bcd, 16)
+    return '{:x}.{:02x}'.format(value >> 8, value & 0xFF)
+
+
+#############################
+# Function: find_usb_device #
+#############################
+# Returns the sysfs directory of the USB device a tty belongs to (the first parent
+# with an idVendor file) or None for ttys that aren't on USB
+def find_usb_device(tty_path, root=SYSFS_ROOT):
+    device = os.path.join(tty_path, 'device')
+    if not os.path.exists(device):
+        return None
+    path = os.path.realpath(device)
+    top = os.path.realpath(root)
+    while path.startswith(top) and path != top:
+        if os.path.isfile(os.path.join(path, 'idVendor')):
+            return path
+        path = os.path.dirname(path)
+    return None
+
+
+##################
+# Function: scan #
+##################
+# Reads sysfs and returns a list of dictionaries, one per USB tty, sorted by port.
+# Only TrueRNG devices are returned unless all_devices is True.
+def scan(root=SYSFS_ROOT, all_devices=False):
+    found = []
+    tty_class = os.path.join(root, 'class', 'tty')
+    try:
+        names = os.listdir(tty_class)
+    except OSError:
+        return found
+    for name in names:
+        tty_path = os.path.join(tty_class, name)
+        usb_path = find_usb_device(tty_path, root)
+        if usb_path is None:
+            continue
+        vid = read_attribute(usb_path, 'idVendor')
+        pid = read_attribute(usb_path, 'idProduct')
+        model = TRUERNG_IDS.get((vid, pid))
+        if model is None and not all_devices:
+            continue
+        found.append({'port': '/dev/' + name,
+                      'model': model,
+                      'vid': vid,
+                      'pid': pid,
+                      'revision': bcd_revision(read_attribute(usb_path, 'bcdDevice')),
+                      'serial': read_attribute(usb_path, 'serial'),
+                      'manufacturer': read_attribute(usb_path, 'manufacturer'),
+                      'product': read_attribute(usb_path, 'product'),
+                      'busnum': read_attribute(usb_path, 'busnum'),
+                      'devnum': read_attribute(usb_path, 'devnum'),
+                      'usb_path': os.path.basename(usb_path),
+                      'sysfs': usb_path})
+    found.sort(key=lambda device: device['port'])
+    return found
+
+
+#####################
+# Function: devices #
+#####################
+# Cached scan().  The cache is dropped after max_age seconds or by invalidate().
+def devices(root=SYSFS_ROOT, all_devices=False, max_age=CACHE_SECONDS):
+    key = (root, all_devices)
+    now = time.monotonic()
+    cached = _cache.get(key)
+    if cached is None or now - cached[0] > max_age:
+        cached = (now, scan(root, all_devices))
+        _cache[key] = cached
+    return cached[1]
+
+
+def invalidate():
+    _cache.clear()
+
+
+#############################
+# Function: device_for_port #
+#############################
+# Information about the device on a port (/dev/ttyACM0, ttyACM0 or a symlink like
+# /dev/serial/by-id/...) or None if it isn't a USB tty
+def device_for_port(port, root=SYSFS_ROOT):
+    name = os.path.basename(os.path.realpath(port))
+    for device in devices(root, all_devices=True):
+        if os.path.basename(device['port']) == name:
+            return device
+    return None
+
+
+###############################
+# Function: firmware_revision #
+###############################
+# Firmware revision (bcdDevice) of the device on a port or None
+def firmware_revision(port, root=SYSFS_ROOT):
+    device = device_for_port(port, root)
+    return device['revision'] if device else None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='List TrueRNG devices from sysfs')
+    parser.add_argument('--all', action='store_true', help='list every USB serial device')
+    parser.add_argument('--root', default=SYSFS_ROOT, help='sysfs root (default /sys)')
+    args = parser.parse_args()
+
+    before = time.perf_counter()
+    found = scan(args.root, args.all)
+    after = time.perf_counter()
+
+    print('====================================================')
+    for device in found:
+        print(device['port'] + ' : ' + str(device['model'] or device['vid'] + ':' + device['pid']).ljust(12) +
+              ' : SN ' + str(device['serial']) + ' : Rev ' + str(device['revision']) +
+              ' : USB ' + device['usb_path'])
+    if not found:
+        print('No TrueRNG devices detected')
+    print('====================================================')
+    print('Scanned sysfs in ' + '{:2.2f}'.format(1000.0 * (after - before)) + ' ms')
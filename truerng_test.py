@@ -10,34 +10,48 @@
 #
 # Python 3.8.xx is available here: https://www.python.org/downloads/
 # Install Pyserial package with:   python -m pip install pyserial
-# Install Pyserial package with:   python -m pip install pyusb
 # Install Matplotlib package with:   python -m pip install matplotlib
 # Install Numpy package with:   python -m pip install numpy
 # Install Winregistry package with:   python -m pip install winregistry
 # Run this Python Script from the Windows command line:  py Truerng_test.py OR Truerng_test.py
 #
 # You may enter the com port identification as a command line option:  py Truerng_test.py COM1
-
-print('====================================================')
-print('= TrueRNG Testing                                  =')
-print('= for TrueRNG, TrueRNGV2, TrueRNGpro, TrueRNGproV2 =')
-print('= http://ubld.it                                   =')
-print('====================================================')
-
+# Test every connected TrueRNG at the same time:  py Truerng_test.py --all
+# Headless (no windows or prompts, exit code 1 on failure):
+#   python3 truerng_test.py --headless --iterations 100 --json results.jsonl --plot-every 10 --plot-dir plots
+# Against the simulator (no hardware):
+#   python3 truerng_test.py /tmp/ttyTrueRNG --model TrueRNGproV2 --headless
+# Record every test by serial number for trends (see truerng_store.py):
+#   python3 truerng_test.py --all --db truerng_results.db
+# Compare every test with the device's baseline histograms (see truerng_drift.py):
+#   python3 truerng_test.py --headless --iterations 100 --drift truerng_baselines.json
+
+if __name__ == '__main__':
+    print('====================================================')
+    print('= TrueRNG Testing                                  =')
+    print('= for TrueRNG, TrueRNGV2, TrueRNGpro, TrueRNGproV2 =')
+    print('= http://ubld.it                                   =')
+    print('====================================================')
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
 import time
 import serial
 import sys
 import math
 import os
 import numpy as np
-import matplotlib
-import subprocess
-from matplotlib import pyplot
+import truerng_analyze
+import truerng_device
+import truerng_reader
 from serial.tools import list_ports
 
+# If we're on Linux
 if os.name == 'posix':
-    import usb.core
-    import usb.util
+    import truerng_sysfs
 
 # If we're on Windows
 if os.name == 'nt':
@@ -80,12 +94,19 @@ TrueRNGproV2_W_Mean_Max = 256+32
 TrueRNGproV2_W_Std_Min = 20
 TrueRNGproV2_W_Std_Max = 90
 
+# Works for all devices
+NGram_Min_P_Value = 0.0001                   # Minimum chi-square p-value for 2-gram / 3-gram tests
+Read_Deadline = 10                           # Seconds for each test read (short reads retried until then)
+
 # Create output file
 output_file = False
 
 # Define test failed flag
 test_failed = False
 
+# Measurements from the last test run (printed in the --all table)
+test_results = {}
+
 ########################
 # Function: modeChange #
 ########################
@@ -147,7 +168,8 @@ def ps_voltage_test(comport):
     # Open the serial port if it isn't open
     if(ser.isOpen() == False):
         ser.open()
-    ser.setDTR(True)
+    # Set Data Terminal Ready to start flow
+    truerng_device.set_dtr(ser)
     ser.flushInput()
 
     try:
@@ -163,6 +185,7 @@ def ps_voltage_test(comport):
         except:
             del voltage_list[i]
     average_voltage=sum(voltage_list) / len(voltage_list)
+    test_results['ps_voltage'] = average_voltage/1000
     if average_voltage>Min_PS_Voltage and average_voltage<Max_PS_Voltage:
         print('*** PASSED *** Power Supply Voltage = ' + '{:2.2f}'.format(average_voltage/1000) + ' Volts')
     else:
@@ -195,19 +218,23 @@ def normal_mode_test(comport):
         ser.open()
 
     # Set Data Terminal Ready to start flow
-    ser.setDTR(True)
+    truerng_device.set_dtr(ser)
 
     # This clears the receive buffer so we aren't using buffered data
     ser.flushInput()
 
     # Try to read the port and record the time before and after
     try:
-        before = time.time()    # in microseconds
-        x=ser.read(Normal_Test_Size)   # read bytes from serial port
-        after = time.time()     # in microseconds
+        before = time.perf_counter()    # in seconds
+        x=truerng_reader.read_deadline(ser, Normal_Test_Size, Read_Deadline)   # read bytes from serial port
+        after = time.perf_counter()     # in seconds
     except:
         print('*** Read Failed!!!')
 
+    # The deadline passed before all of the bytes arrived
+    if isinstance(x, truerng_reader.PartialRead):
+        print('*** Short Read *** NORMAL Mode ' + x.describe())
+
     samples=x
     lengthRead=len(x)
 
@@ -223,6 +250,9 @@ def normal_mode_test(comport):
     # Calculate the rate
     rate=float(lengthRead) / ((after-before)*1000000.0) *8
 
+    test_results['normal_rate'] = rate
+    test_results['normal_bytes'] = lengthRead
+
     # Check to see if the rate is fast enough
     if rate >= 1.0:
         if rate > Min_Rate:
@@ -254,12 +284,25 @@ def normal_mode_test(comport):
         if freqList[b] > 0:
             ent = ent + freqList[b] * math.log(freqList[b], 2)
 
+    test_results['entropy'] = -ent
     if (-ent) > 7.99:
         print('*** PASSED *** NORMAL Mode Entropy: ' + '{:2.6f}'.format(-ent) + ' bits/byte')
     else:
         print('*** FAILED *** NORMAL Mode Entropy: ' +str(-ent) + ' bits/byte')
         test_failed=True
 
+    # Check the distribution of byte pairs and triples (catches correlated
+    # consecutive bytes that still give a flat single byte histogram)
+    ngrams = truerng_analyze.analyze_buffer(x, 'ngram2,ngram3')
+    for name in ('ngram2', 'ngram3'):
+        pvalue = ngrams[name]['chisquare_p']
+        test_results[name + '_p'] = pvalue
+        if pvalue > NGram_Min_P_Value:
+            print('*** PASSED *** NORMAL Mode ' + name[-1] + '-gram Chi-Square p-value: ' + '{:1.4f}'.format(pvalue))
+        else:
+            print('*** FAILED *** NORMAL Mode ' + name[-1] + '-gram Chi-Square p-value: ' + '{:1.4f}'.format(pvalue))
+            test_failed=True
+
     # Do ent functions here on x
 
     ################################
@@ -299,6 +342,8 @@ def normal_mode_test(comport):
     pierror= 100.0 * math.fabs(calcpi - math.pi) / math.pi
 
     meanvalue=sumx/square_points/12
+    test_results['mean'] = meanvalue
+    test_results['pi_error'] = pierror
     if math.fabs(meanvalue-127.5) < Max_Mean_Error:
         print('*** PASSED *** Mean is ' + '{:1.3f}'.format(meanvalue) + '(127.500 = random)')
     else:
@@ -332,22 +377,27 @@ def raw_asc_mode_test(comport):
         ser.open()
 
     # Set Data Terminal Ready to start flow
-    ser.setDTR(True)
+    truerng_device.set_dtr(ser)
 
     # This clears the receive buffer so we aren't using buffered data
     ser.flushInput()
 
     # Try to read the port and record the time before and after
     try:
-        before = time.time()    # in microseconds
-        x=ser.read(Normal_Test_Size)   # read bytes from serial port
-        after = time.time()     # in microseconds
+        before = time.perf_counter()    # in seconds
+        x=truerng_reader.read_deadline(ser, Normal_Test_Size, Read_Deadline)   # read bytes from serial port
+        after = time.perf_counter()     # in seconds
     except:
         print('*** Read Failed!!!')
 
+    # The deadline passed before all of the bytes arrived
+    if isinstance(x, truerng_reader.PartialRead):
+        print('*** Short Read *** RAW ASCII Mode ' + x.describe())
 
     # Calculate the rate
-    rate=float(Normal_Test_Size) / ((after-before)*1000000.0) *8
+    rate=float(len(x)) / ((after-before)*1000000.0) *8
+
+    test_results['raw_asc_rate'] = rate
 
     # Check to see if the rate is fast enough
     print('*** PASSED *** RAW ASCII Mode '+ str(len(x)) + ' Bytes Read at ' + '{:2.3f}'.format(rate) + ' Mbits/s')
@@ -387,6 +437,8 @@ def raw_asc_mode_test(comport):
     # Print out the mean of each generator
     gen1_mean=sum_gen1/len(raw_asc_list)
     gen2_mean=sum_gen2/len(raw_asc_list)
+    test_results['gen1_mean'] = gen1_mean
+    test_results['gen2_mean'] = gen2_mean
 
     if gen1_mean > Min_Mean and gen1_mean < Max_Mean:
         print('*** PASSED *** Gen1 Mean = '+ '{:3.2f}'.format(gen1_mean))
@@ -401,6 +453,8 @@ def raw_asc_mode_test(comport):
 
     gen1std=np.std(gen1samples)
     gen2std=np.std(gen2samples)
+    test_results['gen1_std'] = float(gen1std)
+    test_results['gen2_std'] = float(gen2std)
     if gen1std > Min_Std and gen1std < Max_Std:
         print('*** PASSED *** Gen1 Standard Deviation = '+ '{:3.2f}'.format(gen1std))
     else:
@@ -430,21 +484,27 @@ def unwhitened_mode_test(comport):
         ser.open()
 
     # Set Data Terminal Ready to start flow
-    ser.setDTR(True)
+    truerng_device.set_dtr(ser)
 
     # This clears the receive buffer so we aren't using buffered data
     ser.flushInput()
 
     # Try to read the port and record the time before and after
     try:
-        before = time.time()    # in microseconds
-        k=ser.read(Normal_Test_Size)   # read bytes from serial port
-        after = time.time()     # in microseconds
+        before = time.perf_counter()    # in seconds
+        k=truerng_reader.read_deadline(ser, Normal_Test_Size, Read_Deadline)   # read bytes from serial port
+        after = time.perf_counter()     # in seconds
     except:
         print('*** Read Failed!!!')
 
+    # The deadline passed before all of the bytes arrived
+    if isinstance(k, truerng_reader.PartialRead):
+        print('*** Short Read *** UNWHITENED Mode ' + k.describe())
+
     # Calculate the rate
-    rate=float(Normal_Test_Size) / ((after-before)*1000000.0) *8
+    rate=float(len(k)) / ((after-before)*1000000.0) *8
+
+    test_results['unwhitened_rate'] = rate
 
     # Check to see if the rate is fast enough
     print('*** PASSED *** UNWHITENED Mode '+ str(len(k)) + ' Bytes Read at ' + '{:2.3f}'.format(rate) + ' Mbits/s')
@@ -471,6 +531,7 @@ def unwhitened_mode_test(comport):
 
     # Print out the mean of each generator
     whitened_mean=whitened_sum/len(whitened_list)
+    test_results['whitened_mean'] = whitened_mean
 
     if whitened_mean > TrueRNGproV2_W_Mean_Min and whitened_mean < TrueRNGproV2_W_Mean_Max:
         print('*** PASSED *** Whitened Mean = '+ '{:3.2f}'.format(whitened_mean))
@@ -479,6 +540,7 @@ def unwhitened_mode_test(comport):
         test_failed=True
 
     whitenedstd=np.std(whitened_samples)
+    test_results['whitened_std'] = float(whitenedstd)
     if whitenedstd > TrueRNGproV2_W_Std_Min and whitenedstd < TrueRNGproV2_W_Std_Max:
         print('*** PASSED *** Whitened Standard Deviation = '+ '{:3.2f}'.format(whitenedstd))
     else:
@@ -487,6 +549,21 @@ def unwhitened_mode_test(comport):
 
     return freqList
 
+#########################
+# Function: load_pyplot #
+#########################
+# matplotlib takes longer to import than everything else here, so it is only loaded
+# once there is something to plot.  backend='Agg' draws off screen (headless mode).
+matplotlib = None
+pyplot = None
+def load_pyplot(backend=None):
+    global matplotlib, pyplot
+    if pyplot is None:
+        import matplotlib
+        if backend:
+            matplotlib.use(backend)
+        from matplotlib import pyplot
+
 def move_figure(f, x, y):
     """Move figure's upper left corner to pixel (x, y)"""
     backend = matplotlib.get_backend()
@@ -499,6 +576,142 @@ def move_figure(f, x, y):
         # You can also use window.setGeometry
         f.canvas.manager.window.move(x, y)
 
+#########################
+# Function: make_figure #
+#########################
+# Performance plots for the lists returned by run_device_tests (red if failed)
+def make_figure(lists, comport, device_mode, failed):
+    # TrueRNG V1/V2/V3
+    if device_mode=='TrueRNG':
+        normal_freq_list = lists['normal']
+
+        ###########################
+        # This is the figure size #
+        ###########################
+        fig = pyplot.figure(figsize=(8,4),dpi=100)
+        fig.suptitle('TrueRNG V1/V2/V3 Performance Plots ('+comport+')', fontsize=16)
+        plt1 = fig.add_subplot(111)
+        plt1.bar(np.arange(len(normal_freq_list)), normal_freq_list, 1)
+        plt1.set_xlim([0,len(normal_freq_list)])
+        plt1.set_title('Normal Mode Frequency Distribution')
+
+        if failed:
+            plt1.set_facecolor((1.0,0.0,0.0))
+        else:
+            plt1.set_facecolor((1.0,1.0,1.0))
+
+    # TrueRNGpro (V1)
+    if device_mode=='TrueRNGpro':
+        ps_voltage_list = lists['ps_voltage']
+        normal_freq_list = lists['normal']
+        raw_asc_freq_list = lists['raw_asc']
+
+        #############
+        # Plot Data #
+        #############
+
+        ###########################
+        # This is the figure size #
+        ###########################
+        fig = pyplot.figure(figsize=(11,7),dpi=100)
+
+        fig.suptitle('TrueRNGpro (V1) Performance Plots ('+comport+')', fontsize=16)
+        plt1 = fig.add_subplot(221)
+        plt1.plot(np.arange(len(ps_voltage_list)), ps_voltage_list, '-')
+        plt1.set_xlim(0,len(ps_voltage_list))
+        plt1.set_ylim(Min_PS_Voltage, Max_PS_Voltage)
+        plt1.set_title('Power Supply Voltage')
+        plt1.set_facecolor((1.0,0.0,0.0))
+
+        plt2 = fig.add_subplot(222)
+        plt2.bar(np.arange(len(normal_freq_list)), normal_freq_list, 1)
+        plt2.set_xlim([0,len(normal_freq_list)])
+        plt2.set_title('Normal Mode Frequency Distribution')
+
+        plt3 = fig.add_subplot(223)
+        plt3.bar(np.arange(1023), raw_asc_freq_list[0:1023:1], 1)
+        plt3.set_xlim([0,len(raw_asc_freq_list)/2])
+        plt3.set_ylim(0,Normal_Test_Size/768)
+        plt3.set_title('Generator 1 Raw ASCII Mode Frequency Distribution')
+
+        plt4 = fig.add_subplot(224)
+        plt4.bar(np.arange(1023), raw_asc_freq_list[1024:2047:1], 1)
+        plt4.set_xlim([0,len(raw_asc_freq_list)/2])
+        plt4.set_ylim(0,Normal_Test_Size/768)
+        plt4.set_title('Generator 2 Raw ASCII Mode Frequency Distribution')
+
+        if failed:
+            plt1.set_facecolor((1.0,0.0,0.0))
+            plt2.set_facecolor((1.0,0.0,0.0))
+            plt3.set_facecolor((1.0,0.0,0.0))
+            plt4.set_facecolor((1.0,0.0,0.0))
+        else:
+            plt1.set_facecolor((1.0,1.0,1.0))
+            plt2.set_facecolor((1.0,1.0,1.0))
+            plt3.set_facecolor((1.0,1.0,1.0))
+            plt4.set_facecolor((1.0,1.0,1.0))
+
+    # TrueRNGproV2
+    if device_mode=='TrueRNGproV2':
+        ps_voltage_list = lists['ps_voltage']
+        normal_freq_list = lists['normal']
+        raw_asc_freq_list = lists['raw_asc']
+        unwhitened_freq_list = lists['unwhitened']
+
+        #############
+        # Plot Data #
+        #############
+
+        ###########################
+        # This is the figure size #
+        ###########################
+        fig = pyplot.figure(figsize=(11,9),dpi=100)
+
+        fig.suptitle('TrueRNGproV2 Performance Plots ('+comport+')', fontsize=16)
+        plt1 = fig.add_subplot(321)
+        plt1.plot(np.arange(len(ps_voltage_list)), ps_voltage_list, '-')
+        plt1.set_xlim(0,len(ps_voltage_list))
+        plt1.set_ylim(Min_PS_Voltage, Max_PS_Voltage)
+        plt1.set_title('Power Supply Voltage')
+
+        plt2 = fig.add_subplot(322)
+        plt2.bar(np.arange(len(normal_freq_list)), normal_freq_list, 1)
+        plt2.set_xlim([0,len(normal_freq_list)])
+        plt2.set_title('Normal Mode Frequency Distribution')
+
+        plt3 = fig.add_subplot(323)
+        plt3.bar(np.arange(1023), raw_asc_freq_list[0:1023:1], 1)
+        plt3.set_xlim([0,len(raw_asc_freq_list)/2])
+        plt3.set_ylim(0,Normal_Test_Size/1024)
+        plt3.set_title('Generator 1 Raw ASCII Mode Frequency Distribution')
+
+        plt4 = fig.add_subplot(324)
+        plt4.bar(np.arange(1023), raw_asc_freq_list[1024:2047:1], 1)
+        plt4.set_xlim([0,len(raw_asc_freq_list)/2])
+        plt4.set_ylim(0,Normal_Test_Size/1024)
+        plt4.set_title('Generator 2 Raw ASCII Mode Frequency Distribution')
+
+        plt5 = fig.add_subplot(3,2,(5,6))
+        plt5.bar(np.arange(len(unwhitened_freq_list)), unwhitened_freq_list, 1)
+        plt5.set_xlim([0,len(unwhitened_freq_list)])
+        plt5.set_ylim(0,Normal_Test_Size/256)
+        plt5.set_title('Unwhitened Mode Frequency Distribution')
+
+        if failed:
+            plt1.set_facecolor((1.0,0.0,0.0))
+            plt2.set_facecolor((1.0,0.0,0.0))
+            plt3.set_facecolor((1.0,0.0,0.0))
+            plt4.set_facecolor((1.0,0.0,0.0))
+            plt5.set_facecolor((1.0,0.0,0.0))
+        else:
+            plt1.set_facecolor((1.0,1.0,1.0))
+            plt2.set_facecolor((1.0,1.0,1.0))
+            plt3.set_facecolor((1.0,1.0,1.0))
+            plt4.set_facecolor((1.0,1.0,1.0))
+            plt5.set_facecolor((1.0,1.0,1.0))
+
+    return fig
+
 
 if os.name == 'nt':
     def get_Truerngs_from_registry():
@@ -607,287 +820,388 @@ if os.name == 'nt':
         return devicesFound
 
 
-try:
-    while True:
-        fig=0
-        # Reset test failed
-        test_failed = False
-
-        # Set com port to default None
-        rng_com_port = None
-
-        # Set mode to default None
-        mode = None
-
-        # Set serial number to None
-        serial_number = 'None'
-
-        #########################
-        # Get list of Com ports #
-        #########################
-
-        # Call list_ports to get com port info
-        ports_available = list_ports.comports()
-
-        # Loop on all available ports to find TrueRNG
-        # Uses the first TrueRNG, TrueRNGpro, or TrueRNGproV2 found
-        for temp in ports_available:
-         #   print(temp[1] + ' : ' + temp[2])
-            if '04D8:F5FE' in temp[2]:
-                print(temp[0] + ' : TrueRNG')
-                if rng_com_port==None:
-                    rng_com_port=temp[0];
-                    serial_number=temp.serial_number
-                    mode='TrueRNG'
-                else:
-                    if len(sys.argv)==2:
-                        if temp[0]==str(sys.argv[1]):
-                            rng_com_port=temp[0];
-                            serial_number=temp.serial_number
-                            mode='TrueRNG'
-            if '16D0:0AA0' in temp[2]:
-                print(temp[0] + ' : TrueRNGpro')
-                if rng_com_port==None:
-                    rng_com_port=temp[0];
-                    serial_number=temp.serial_number
-                    mode='TrueRNGpro'
-                else:
-                    if len(sys.argv)==2:
-                        if temp[0]==str(sys.argv[1]):
-                            rng_com_port=temp[0];
-                            serial_number=temp.serial_number
-                            mode='TrueRNGpro'
-            if '04D8:EBB5' in temp[2]:
-                print(temp[0] + ' : TrueRNGpro V2')
-
-                if rng_com_port==None:
-                    rng_com_port=temp[0];
-                    serial_number=temp.serial_number
-                    mode='TrueRNGproV2'
-                else:
-                    if len(sys.argv)==2:
-                        if temp[0]==str(sys.argv[1]):
-                            rng_com_port=temp[0];
-                            serial_number=temp.serial_number
-                            mode='TrueRNGproV2'
-
-        # Print if we detect no compatible devices
-        if rng_com_port==None:
-            print('No TrueRNG devices detected!')
-
-        print('====================================================')
+# Names printed for each mode
+DEVICE_NAMES = {'TrueRNG': 'TrueRNG', 'TrueRNGpro': 'TrueRNGpro', 'TrueRNGproV2': 'TrueRNGpro V2'}
+
+##########################
+# Function: find_devices #
+##########################
+# Returns a list of the connected TrueRNGs (port, mode and serial number).  If a
+# model is given, port is added as that model when it isn't detected (for example
+# a pty made by truerng_simulator.py).
+def find_devices(port=None, model=None, registry=None):
+    devices = []
+    if registry is not None:
+        for device in sorted(registry.snapshot().values(), key=lambda device: device['port']):
+            devices.append({'port': device['port'], 'mode': device['model'], 'serial': device['serial']})
+    for temp in list_ports.comports() if registry is None else []:
+        if '04D8:F5FE' in temp[2]:
+            devices.append({'port': temp[0], 'mode': 'TrueRNG', 'serial': temp.serial_number})
+        if '16D0:0AA0' in temp[2]:
+            devices.append({'port': temp[0], 'mode': 'TrueRNGpro', 'serial': temp.serial_number})
+        if '04D8:EBB5' in temp[2]:
+            devices.append({'port': temp[0], 'mode': 'TrueRNGproV2', 'serial': temp.serial_number})
+    if port and model and port not in [device['port'] for device in devices]:
+        devices.append({'port': port, 'mode': model, 'serial': None})
+    return devices
 
-        # Print out which port we are using
-        if len(sys.argv) == 2:
-            rng_com_port = str(sys.argv[1])
-            print('Using ' + mode + ' on ' + rng_com_port + ' (from command line)')
-        else:
-            print('Using ' + mode + ' on ' + rng_com_port + ' (first detected)')
-
-        # If we're on Windows
-        if os.name == 'nt':
-            devices=get_Truerngs_from_registry()
-            tempportname='(' + rng_com_port + ')'
-            for n in devices:
-                if tempportname in n:
-                    print(n)
+########################
+# Function: set_limits #
+########################
+# Set Defaults for the Current Mode / Device
+def set_limits(device_mode):
+    global Min_Rate, Min_Entropy, Max_Pi_Error, Max_Mean_Error, Normal_Test_Size
+    global Min_PS_Voltage, Max_PS_Voltage, Min_Mean, Max_Mean, Min_Std, Max_Std
+    if device_mode=='TrueRNG':
+        Min_Rate = TrueRNG_Min_Rate
+        Min_Entropy = TrueRNG_Min_Entropy
+        Max_Pi_Error = TrueRNG_Max_Pi_Error
+        Max_Mean_Error = TrueRNG_Max_Mean_Error
+        Normal_Test_Size = TrueRNG_Normal_Test_Size
+    if device_mode=='TrueRNGpro':
+        Min_Rate = TrueRNGpro_Min_Rate
+        Min_Entropy = TrueRNGpro_Min_Entropy
+        Max_Pi_Error = TrueRNGpro_Max_Pi_Error
+        Max_Mean_Error = TrueRNGpro_Max_Mean_Error
+        Normal_Test_Size = TrueRNGpro_Normal_Test_Size
+        Min_PS_Voltage = TrueRNGpro_Min_PS_Voltage
+        Max_PS_Voltage = TrueRNGpro_Max_PS_Voltage
+        Min_Mean = TrueRNGpro_Mean_Min
+        Max_Mean = TrueRNGpro_Mean_Max
+        Min_Std = TrueRNGpro_Std_Min
+        Max_Std = TrueRNGpro_Std_Max
+    if device_mode=='TrueRNGproV2':
+        Min_Rate = TrueRNGproV2_Min_Rate
+        Min_Entropy = TrueRNGproV2_Min_Entropy
+        Max_Pi_Error = TrueRNGproV2_Max_Pi_Error
+        Max_Mean_Error = TrueRNG_Max_Mean_Error
+        Normal_Test_Size = TrueRNGproV2_Normal_Test_Size
+        Min_PS_Voltage = TrueRNGproV2_Min_PS_Voltage
+        Max_PS_Voltage = TrueRNGproV2_Max_PS_Voltage
+        Min_Mean = TrueRNGproV2_Mean_Min
+        Max_Mean = TrueRNGproV2_Mean_Max
+        Min_Std = TrueRNGproV2_Std_Min
+        Max_Std = TrueRNGproV2_Std_Max
+
+##############################
+# Function: run_device_tests #
+##############################
+# Runs the tests for this model (PS voltage, normal, raw ASCII, unwhitened) on one
+# port.  Returns the lists used for the plots; the measurements and the pass / fail
+# result are left in test_results.
+def run_device_tests(comport, device_mode):
+    global rng_com_port, mode, test_failed, test_results
+    rng_com_port = comport
+    mode = device_mode
+    test_failed = False
+    test_results = {'port': comport, 'mode': device_mode}
+    if os.name == 'posix':
+        test_results['revision'] = truerng_sysfs.firmware_revision(comport)
+    set_limits(device_mode)
+
+    lists = {}
+    if mode=='TrueRNGpro' or mode=='TrueRNGproV2':
+        lists['ps_voltage'] = ps_voltage_test(comport)
+    lists['normal'] = normal_mode_test(comport)
+    if mode=='TrueRNGpro' or mode=='TrueRNGproV2':
+        lists['raw_asc'] = raw_asc_mode_test(comport)
+    if mode=='TrueRNGproV2':
+        lists['unwhitened'] = unwhitened_mode_test(comport)
+
+    test_results['failed'] = test_failed
+    return lists
+
+# Runs in a worker process for --all.  The output is captured so the devices
+# don't print over each other.
+def _test_device(device):
+    global test_results
+    output = io.StringIO()
+    lists = {}
+    with contextlib.redirect_stdout(output):
+        try:
+            lists = run_device_tests(device['port'], device['mode'])
+        except Exception as error:
+            print('*** FAILED *** ' + type(error).__name__ + ': ' + str(error))
+            test_results['failed'] = True
+    test_results['serial'] = device['serial']
+    return test_results, lists, output.getvalue()
+
+##############################
+# Function: test_all_devices #
+##############################
+# Tests every device at the same time, one process each, and returns
+# (results, lists) in the order of devices
+def test_all_devices(devices):
+    results = []
+    all_lists = []
+    with multiprocessing.Pool(len(devices)) as pool:
+        for result, lists, output in pool.imap(_test_device, devices):
+            print(result['port'] + ' : ' + DEVICE_NAMES[result['mode']] + ' : SN ' + str(result['serial']))
+            print(output, end='')
+            print('====================================================')
+            results.append(result)
+            all_lists.append(lists)
+    return results, all_lists
+
+#########################
+# Function: check_drift #
+#########################
+# Compares a test's histograms with the baselines of its serial number (its port for
+# devices without one, as truerng_soak.py does), prints a line per channel and sets
+# result['drift'] to the channels that drifted.  Drift doesn't fail the test; it
+# means the device no longer looks like it did when the baseline was taken.
+def check_drift(drift, result, lists):
+    import truerng_drift
+    serial = result.get('serial')
+    key = serial if serial and serial != 'None' else result.get('port')
+    results = drift.update(key, truerng_drift.channels_from_lists(lists, result.get('normal_bytes')))
+    for line in truerng_drift.format_results(results):
+        print(line)
+    result['drift'] = [name for name, values in results.items() if values and values['drift']]
+    drift.save()
+
+##########################
+# Function: run_headless #
+##########################
+# Runs iterations tests without windows or prompts.  Each device's measurements are
+# written as a JSON line per iteration and the plots are saved as PNG files when a
+# test fails or every plot_every iterations.  Results also go to the results store
+# and are checked against the drift baselines if they are given.  Returns (tests run,
+# tests failed).
+def run_headless(devices, iterations, json_file, plot_every, plot_dir, store=None, drift=None):
+    tests = 0
+    failures = 0
+    for iteration in range(1, iterations+1):
+        print('================= ITERATION ' + str(iteration) + ' of ' + str(iterations))
+        if len(devices) > 1:
+            results, all_lists = test_all_devices(devices)
         else:
-            print('Serial Number: ' + str(serial_number))
-
-        # If we're on Linux
-        if os.name == 'posix':
-            if mode=='TrueRNG':
-                command='lsusb -d 04d8:f5fe -v 2> /dev/null | grep bcdDevice'
-            if mode=='TrueRNGpro':
-                command='lsusb -d 16d0:0aa0 -v 2> /dev/null | grep bcdDevice'
-            if mode=='TrueRNGproV2':
-                command='lsusb -d 04d8:ebb5 -v 2> /dev/null | grep bcdDevice'
-            result=subprocess.check_output(command, shell=True)
-            print('Firmware Rev : ' + str(result).split('  ')[-1].split('\\')[0])
-
-        # Set Defaults for the Current Mode / Device
-        if mode=='TrueRNG':
-            Min_Rate = TrueRNG_Min_Rate
-            Min_Entropy = TrueRNG_Min_Entropy
-            Max_Pi_Error = TrueRNG_Max_Pi_Error
-            Max_Mean_Error = TrueRNG_Max_Mean_Error
-            Normal_Test_Size = TrueRNG_Normal_Test_Size
-        if mode=='TrueRNGpro':
-            Min_Rate = TrueRNGpro_Min_Rate
-            Min_Entropy = TrueRNGpro_Min_Entropy
-            Max_Pi_Error = TrueRNGpro_Max_Pi_Error
-            Max_Mean_Error = TrueRNGpro_Max_Mean_Error
-            Normal_Test_Size = TrueRNGpro_Normal_Test_Size
-            Min_PS_Voltage = TrueRNGpro_Min_PS_Voltage
-            Max_PS_Voltage = TrueRNGpro_Max_PS_Voltage
-            Min_Mean = TrueRNGpro_Mean_Min
-            Max_Mean = TrueRNGpro_Mean_Max
-            Min_Std = TrueRNGpro_Std_Min
-            Max_Std = TrueRNGpro_Std_Max
-        if mode=='TrueRNGproV2':
-            Min_Rate = TrueRNGproV2_Min_Rate
-            Min_Entropy = TrueRNGproV2_Min_Entropy
-            Max_Pi_Error = TrueRNGproV2_Max_Pi_Error
-            Max_Mean_Error = TrueRNG_Max_Mean_Error
-            Normal_Test_Size = TrueRNGproV2_Normal_Test_Size
-            Min_PS_Voltage = TrueRNGproV2_Min_PS_Voltage
-            Max_PS_Voltage = TrueRNGproV2_Max_PS_Voltage
-            Min_Mean = TrueRNGproV2_Mean_Min
-            Max_Mean = TrueRNGproV2_Mean_Max
-            Min_Std = TrueRNGproV2_Std_Min
-            Max_Std = TrueRNGproV2_Std_Max
-
-        if rng_com_port==None:
-            print('No TrueRNG devices detected')
+            # A serial error fails this test like it does in the --all workers
+            try:
+                all_lists = [run_device_tests(devices[0]['port'], devices[0]['mode'])]
+            except Exception as error:
+                print('*** FAILED *** ' + type(error).__name__ + ': ' + str(error))
+                test_results['failed'] = True
+                all_lists = [{}]
+            test_results['serial'] = devices[0]['serial']
+            results = [test_results]
+
+        for result, lists in zip(results, all_lists):
+            if drift and lists:
+                check_drift(drift, result, lists)
+            record = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'iteration': iteration}
+            record.update(result)
+            if lists and (result['failed'] or (plot_every > 0 and iteration % plot_every == 0)):
+                load_pyplot('Agg')
+                set_limits(result['mode'])
+                fig = make_figure(lists, result['port'], result['mode'], result['failed'])
+                record['plot'] = os.path.join(plot_dir, 'truerng_' + os.path.basename(result['port']) + '_' +
+                                              time.strftime('%Y%m%d.%H%M%S') + '_' + str(iteration) +
+                                              ('_FAILED' if result['failed'] else '') + '.png')
+                fig.savefig(record['plot'])
+                pyplot.close(fig)
+            if json_file:
+                json_file.write(json.dumps(record, default=float) + '\n')
+                json_file.flush()
+            if store:
+                store.add_test_result(result)
+            tests += 1
+            if result['failed']:
+                failures += 1
+    return tests, failures
+
+#################################
+# Function: print_results_table #
+#################################
+def print_results_table(results):
+    columns = (('Port', 'port', '{}'), ('Device', 'mode', '{}'), ('Serial', 'serial', '{}'),
+               ('Mbits/s', 'normal_rate', '{:2.3f}'), ('Entropy', 'entropy', '{:1.6f}'),
+               ('Pi Err %', 'pi_error', '{:1.4f}'), ('PS Volts', 'ps_voltage', '{:2.2f}'))
+    rows = [[title for title, key, form in columns] + ['Result']]
+    for result in results:
+        row = [form.format(result[key]) if result.get(key) is not None else '-' for title, key, form in columns]
+        row.append('FAILED' if result['failed'] else 'PASSED')
+        rows.append(row)
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Find and test connected TrueRNG devices')
+    parser.add_argument('port', nargs='?', default=None, help='com port to test (default first TrueRNG found)')
+    parser.add_argument('--model', choices=list(DEVICE_NAMES),
+                        help='model of the device on PORT if it isn\'t detected (for example truerng_simulator.py)')
+    parser.add_argument('--all', action='store_true',
+                        help='test every connected TrueRNG at the same time and print a table of results')
+    parser.add_argument('--headless', action='store_true',
+                        help='no windows or prompts: run --iterations tests and exit 1 if any failed')
+    parser.add_argument('--iterations', type=int, default=1, help='number of tests in headless mode')
+    parser.add_argument('--json', help='headless mode: append a JSON line per device per iteration to this file')
+    parser.add_argument('--plot-every', type=int, default=0,
+                        help='headless mode: also save plots every K iterations (failed tests are always saved)')
+    parser.add_argument('--plot-dir', default='.', help='headless mode: directory for the PNG plots')
+    parser.add_argument('--db', help='also record every test in this results database (see truerng_store.py)')
+    parser.add_argument('--drift', help='compare every test with the baselines in this file (see truerng_drift.py)')
+    args = parser.parse_args()
+
+    json_file = None
+    if args.json:
+        json_file = open(args.json, 'a')
+
+    store = None
+    if args.db:
+        import truerng_store
+        store = truerng_store.ResultStore(args.db)
+
+    drift = None
+    if args.drift:
+        import truerng_drift
+        drift = truerng_drift.DriftStore(args.drift)
+
+    #################
+    # Headless Mode #
+    #################
+    if args.headless:
+        devices = find_devices(args.port, args.model)
+        for device in devices:
+            print(device['port'] + ' : ' + DEVICE_NAMES[device['mode']])
+        if not args.all:
+            if args.port and args.port not in [device['port'] for device in devices]:
+                print('No TrueRNG device detected on ' + args.port + ' (give --model to test it anyway)')
+                sys.exit(1)
+            devices = [device for device in devices if device['port']==args.port][:1] or devices[:1]
+        if len(devices)==0:
+            print('No TrueRNG devices detected!')
+            sys.exit(1)
+        print('====================================================')
+        tests, failures = run_headless(devices, args.iterations, json_file, args.plot_every, args.plot_dir,
+                                       store, drift)
+        if store:
+            store.close()
+        print('====================================================')
+        if failures:
+            print('*** FAILED *** ' + str(failures) + ' of ' + str(tests) + ' tests failed')
         else:
-            print('====================================================')
+            print('*** PASSED *** ' + str(tests) + ' tests passed')
+        sys.exit(1 if failures else 0)
+
+    #################
+    # Test All Mode #
+    #################
+    if args.all:
+        devices = find_devices(args.port, args.model)
+        for device in devices:
+            print(device['port'] + ' : ' + DEVICE_NAMES[device['mode']])
+        if len(devices)==0:
+            print('No TrueRNG devices detected!')
+            sys.exit(1)
+        print('====================================================')
+        before = time.time()
+        results, all_lists = test_all_devices(devices)
+        after = time.time()
+        print_results_table(results)
+        if drift:
+            for result, lists in zip(results, all_lists):
+                if lists:
+                    print(result['port'] + ':')
+                    check_drift(drift, result, lists)
+        if store:
+            for result in results:
+                store.add_test_result(result)
+            store.close()
+        print('====================================================')
+        print('Tested ' + str(len(devices)) + ' devices in ' + '{:2.1f}'.format(after-before) + ' seconds')
+        sys.exit(1 if any(result['failed'] for result in results) else 0)
+
+    # Keep the device list from hotplug events instead of scanning the ports before
+    # every test (Linux)
+    registry = None
+    if os.name == 'posix':
+        import truerng_registry
+        registry = truerng_registry.DeviceRegistry()
+        try:
+            registry.start()
+            registry.on_attach(lambda device: print('Attached ' + truerng_registry.describe(device)))
+            registry.on_detach(lambda device: print('Detached ' + truerng_registry.describe(device)))
+        except OSError:
+            registry = None
 
-            # Do tests for TrueRNG V1/V2/V3
-            if mode=='TrueRNG':
-                normal_freq_list = normal_mode_test(rng_com_port)
-
-                ###########################
-                # This is the figure size #
-                ###########################
-                fig = pyplot.figure(figsize=(8,4),dpi=100)
-                fig.suptitle('TrueRNG V1/V2/V3 Performance Plots ('+rng_com_port+')', fontsize=16)
-                plt1 = fig.add_subplot(111)
-                plt1.bar(np.arange(len(normal_freq_list)), normal_freq_list, 1)
-                plt1.set_xlim([0,len(normal_freq_list)])
-                plt1.set_title('Normal Mode Frequency Distribution')
-
-                if test_failed:
-                    plt1.set_facecolor((1.0,0.0,0.0))
-                else:
-                    plt1.set_facecolor((1.0,1.0,1.0))
+    try:
+        while True:
+            fig=0
+            # Reset test failed
+            test_failed = False
 
-                move_figure(fig, 0, 0)
-                pyplot.draw()
-                pyplot.pause(1)
-                input("Press enter for another test or Ctrl-C to end.")
-                pyplot.close(fig)
+            # Set com port to default None
+            rng_com_port = None
 
-            # Do tests for TrueRNGpro (V1)
-            if mode=='TrueRNGpro':
-                ps_voltage_list = ps_voltage_test(rng_com_port)
-                normal_freq_list = normal_mode_test(rng_com_port)
-                raw_asc_freq_list = raw_asc_mode_test(rng_com_port)
-
-                #############
-                # Plot Data #
-                #############
-
-                ###########################
-                # This is the figure size #
-                ###########################
-                fig = pyplot.figure(figsize=(11,7),dpi=100)
-
-                fig.suptitle('TrueRNGpro (V1) Performance Plots ('+rng_com_port+')', fontsize=16)
-                plt1 = fig.add_subplot(221)
-                plt1.plot(np.arange(len(ps_voltage_list)), ps_voltage_list, '-')
-                plt1.set_xlim(0,len(ps_voltage_list))
-                plt1.set_ylim(Min_PS_Voltage, Max_PS_Voltage)
-                plt1.set_title('Power Supply Voltage')
-                plt1.set_facecolor((1.0,0.0,0.0))
-
-                plt2 = fig.add_subplot(222)
-                plt2.bar(np.arange(len(normal_freq_list)), normal_freq_list, 1)
-                plt2.set_xlim([0,len(normal_freq_list)])
-                plt2.set_title('Normal Mode Frequency Distribution')
-
-                plt3 = fig.add_subplot(223)
-                plt3.bar(np.arange(1023), raw_asc_freq_list[0:1023:1], 1)
-                plt3.set_xlim([0,len(raw_asc_freq_list)/2])
-                plt3.set_ylim(0,Normal_Test_Size/768)
-                plt3.set_title('Generator 1 Raw ASCII Mode Frequency Distribution')
-
-                plt4 = fig.add_subplot(224)
-                plt4.bar(np.arange(1023), raw_asc_freq_list[1024:2047:1], 1)
-                plt4.set_xlim([0,len(raw_asc_freq_list)/2])
-                plt4.set_ylim(0,Normal_Test_Size/768)
-                plt4.set_title('Generator 2 Raw ASCII Mode Frequency Distribution')
-
-
-                if test_failed:
-                    plt1.set_facecolor((1.0,0.0,0.0))
-                    plt2.set_facecolor((1.0,0.0,0.0))
-                    plt3.set_facecolor((1.0,0.0,0.0))
-                    plt4.set_facecolor((1.0,0.0,0.0))
-                else:
-                    plt1.set_facecolor((1.0,1.0,1.0))
-                    plt2.set_facecolor((1.0,1.0,1.0))
-                    plt3.set_facecolor((1.0,1.0,1.0))
-                    plt4.set_facecolor((1.0,1.0,1.0))
+            # Set mode to default None
+            mode = None
 
-                ###############################
-                # This is the figure location #
-                # 0,0 = upper left            #
-                ###############################
-                move_figure(fig, 0, 0)
+            # Set serial number to None
+            serial_number = None
 
-                pyplot.draw()
-                pyplot.pause(1)
-                input("Press enter for another test or Ctrl-C to end.")
-                pyplot.close(fig)
+            #########################
+            # Get list of Com ports #
+            #########################
 
-            # Do tests for TrueRNGproV2
-            if mode=='TrueRNGproV2':
-                ps_voltage_list = ps_voltage_test(rng_com_port)
-                normal_freq_list = normal_mode_test(rng_com_port)
-                raw_asc_freq_list = raw_asc_mode_test(rng_com_port)
-                unwhitened_freq_list = unwhitened_mode_test(rng_com_port)
-
-                #############
-                # Plot Data #
-                #############
-
-                ###########################
-                # This is the figure size #
-                ###########################
-                fig = pyplot.figure(figsize=(11,9),dpi=100)
-
-                fig.suptitle('TrueRNGproV2 Performance Plots ('+rng_com_port+')', fontsize=16)
-                plt1 = fig.add_subplot(321)
-                plt1.plot(np.arange(len(ps_voltage_list)), ps_voltage_list, '-')
-                plt1.set_xlim(0,len(ps_voltage_list))
-                plt1.set_ylim(Min_PS_Voltage, Max_PS_Voltage)
-                plt1.set_title('Power Supply Voltage')
-
-                plt2 = fig.add_subplot(322)
-                plt2.bar(np.arange(len(normal_freq_list)), normal_freq_list, 1)
-                plt2.set_xlim([0,len(normal_freq_list)])
-                plt2.set_title('Normal Mode Frequency Distribution')
-
-                plt3 = fig.add_subplot(323)
-                plt3.bar(np.arange(1023), raw_asc_freq_list[0:1023:1], 1)
-                plt3.set_xlim([0,len(raw_asc_freq_list)/2])
-                plt3.set_ylim(0,Normal_Test_Size/1024)
-                plt3.set_title('Generator 1 Raw ASCII Mode Frequency Distribution')
-
-                plt4 = fig.add_subplot(324)
-                plt4.bar(np.arange(1023), raw_asc_freq_list[1024:2047:1], 1)
-                plt4.set_xlim([0,len(raw_asc_freq_list)/2])
-                plt4.set_ylim(0,Normal_Test_Size/1024)
-                plt4.set_title('Generator 2 Raw ASCII Mode Frequency Distribution')
-
-                plt5 = fig.add_subplot(3,2,(5,6))
-                plt5.bar(np.arange(len(unwhitened_freq_list)), unwhitened_freq_list, 1)
-                plt5.set_xlim([0,len(unwhitened_freq_list)])
-                plt5.set_ylim(0,Normal_Test_Size/256)
-                plt5.set_title('Unwhitened Mode Frequency Distribution')
-
-                if test_failed:
-                    plt1.set_facecolor((1.0,0.0,0.0))
-                    plt2.set_facecolor((1.0,0.0,0.0))
-                    plt3.set_facecolor((1.0,0.0,0.0))
-                    plt4.set_facecolor((1.0,0.0,0.0))
-                    plt5.set_facecolor((1.0,0.0,0.0))
-                else:
-                    plt1.set_facecolor((1.0,1.0,1.0))
-                    plt2.set_facecolor((1.0,1.0,1.0))
-                    plt3.set_facecolor((1.0,1.0,1.0))
-                    plt4.set_facecolor((1.0,1.0,1.0))
-                    plt5.set_facecolor((1.0,1.0,1.0))
+            # Loop on all detected devices
+            # Uses the first TrueRNG, TrueRNGpro, or TrueRNGproV2 found
+            for device in find_devices(args.port, args.model, registry):
+                print(device['port'] + ' : ' + DEVICE_NAMES[device['mode']])
+                if rng_com_port==None or device['port']==args.port:
+                    rng_com_port=device['port']
+                    serial_number=device['serial']
+                    mode=device['mode']
+
+            # Print if we detect no compatible devices
+            if rng_com_port==None:
+                print('No TrueRNG devices detected!')
+
+            print('====================================================')
+
+            # Print out which port we are using
+            if args.port:
+                rng_com_port = args.port
+                print('Using ' + mode + ' on ' + rng_com_port + ' (from command line)')
+            else:
+                print('Using ' + mode + ' on ' + rng_com_port + ' (first detected)')
+
+            # If we're on Windows
+            if os.name == 'nt':
+                devices=get_Truerngs_from_registry()
+                tempportname='(' + rng_com_port + ')'
+                for n in devices:
+                    if tempportname in n:
+                        print(n)
+            else:
+                print('Serial Number: ' + str(serial_number))
+
+            # If we're on Linux
+            if os.name == 'posix':
+                # Read from sysfs for the device on this port
+                print('Firmware Rev : ' + str(truerng_sysfs.firmware_revision(rng_com_port)))
+
+            # Set Defaults for the Current Mode / Device
+            set_limits(mode)
+
+            if rng_com_port==None:
+                print('No TrueRNG devices detected')
+            else:
+                print('====================================================')
+
+                # Do tests for this model and plot the results
+                lists = run_device_tests(rng_com_port, mode)
+                test_results['serial'] = serial_number
+                if drift:
+                    check_drift(drift, test_results, lists)
+                if store:
+                    store.add_test_result(test_results)
+                    store.flush()
+
+                load_pyplot()
+                fig = make_figure(lists, rng_com_port, mode, test_failed)
 
                 ###############################
                 # This is the figure location #
@@ -900,16 +1214,19 @@ try:
                 input("Press enter for another test or Ctrl-C to end.")
                 pyplot.close(fig)
 
-            print('====================================================')
-            print('================= NEW TEST =========================')
-            print('====================================================')
+                print('====================================================')
+                print('================= NEW TEST =========================')
+                print('====================================================')
 
-except:
-    if fig:
-        pyplot.close(fig)
-    print('Exiting now!')
+    except:
+        if fig:
+            pyplot.close(fig)
+        print('Exiting now!')
 
-# If we're on Linux set min on com port back to 1
-# Pyserial screws this up
-if os.name == 'posix':
-    os.system('stty -F '+rng_com_port+' min 1')
+    if registry is not None:
+        registry.stop()
+
+    # If we're on Linux set min on com port back to 1
+    # Pyserial screws this up
+    if os.name == 'posix':
+        os.system('stty -F '+rng_com_port+' min 1')
@@ -0,0 +1,233 @@
+#!/usr/bin/python3
+
+# TrueRNG Toeplitz Extractor
+# 10/19/2026
+#
+# Requires Python 3.8, numpy (pyserial to read a device)
+#
+# On Linux - may need to be root or set /dev/tty port permissions to 666
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install Numpy package with:   python -m pip install numpy
+# Install Pyserial package with:   python -m pip install pyserial
+#
+# Seeded Toeplitz hashing of RAW ADC samples into near uniform bits.  Toeplitz
+# matrices are a universal hash family, so by the leftover hash lemma an m x n
+# matrix turns n input bits holding k bits of min-entropy into m = k - 2*security
+# bits that are within 2^-security of uniform, for any source with that much
+# min-entropy.  The seed (the n + m - 1 bits of the first row and column) has to be
+# uniform and independent of the device but may be public and is reused for every
+# block; it is kept in a seed file.
+#
+# The product of an m x n Toeplitz matrix and a bit vector is a slice of the
+# convolution of the seed with the input, so each block is one FFT of the input,
+# a multiply by the (cached) FFT of the seed and one inverse FFT: O(n log n) instead
+# of the O(n m) of the matrix product.  Bits are the parity of the rounded sums.
+#
+# The input bits are the 10 ADC bits of each sample (--format as in
+# truerng_condition.py) and k comes from the most common value min-entropy estimate,
+# taken per generator for the RAW modes (which interleave gen1 and gen2) with the
+# lower one used, so the offset between the generators isn't counted as entropy.
+#
+# truerng_toeplitz.py [PORT] [--format raw_bin] [--block-samples 16384] [--security 64] [--seed-file FILE]
+#                     [--bytes N] [--out FILE]
+# truerng_toeplitz.py --input CAPTUREFILE --format raw_asc
+# Linux example:  python3 truerng_toeplitz.py /dev/ttyACM0 --bytes 1048576 --out extracted.bin
+
+import argparse
+import math
+import os
+import secrets
+import sys
+import time
+
+import numpy as np
+
+import truerng_condition
+import truerng_device
+
+# Samples hashed per block
+BLOCK_SAMPLES = 16384
+
+# Output is within 2^-SECURITY of uniform (statistical distance)
+SECURITY = 64
+
+# Seed file used when none is given
+DEFAULT_SEED_FILE = 'truerng_toeplitz.seed'
+
+
+########################
+# Function: fft_length #
+########################
+# Smallest power of two at least n
+def fft_length(n):
+    return 1 << max(0, int(n - 1).bit_length())
+
+
+#########################
+# Function: sample_bits #
+#########################
+# The low bits of each sample as a 0 / 1 array (least significant bit first)
+def sample_bits(samples, bits):
+    words = np.asarray(samples, dtype='<u2')
+    return np.unpackbits(words.view(np.uint8).reshape(-1, 2), axis=1,
+                         bitorder='little')[:, :bits].reshape(-1)
+
+
+###############################
+# Function: toeplitz_multiply #
+###############################
+# Direct m x n Toeplitz product over GF(2) for checking the FFT version.  Row i of
+# the matrix is seed[i:i+n] reversed, so T[i][j] = seed[i + n - 1 - j].
+def toeplitz_multiply(seed, x, m):
+    n = len(x)
+    return np.array([int(np.dot(seed[i:i + n][::-1].astype(np.int64), x)) & 1 for i in range(m)],
+                    dtype=np.uint8)
+
+
+############################
+# Class: ToeplitzExtractor #
+############################
+# m x n Toeplitz hash over GF(2) with the FFT of its seed computed once
+class ToeplitzExtractor:
+    def __init__(self, seed_bits, input_bits, output_bits):
+        if output_bits <= 0:
+            raise ValueError('not enough min-entropy for any output (use a larger block)')
+        if len(seed_bits) < input_bits + output_bits - 1:
+            raise ValueError('seed has ' + str(len(seed_bits)) + ' bits, needs ' +
+                             str(input_bits + output_bits - 1))
+        self.n = input_bits
+        self.m = output_bits
+        self.size = fft_length(self.n + self.m - 1)
+        self.seed_fft = np.fft.rfft(np.asarray(seed_bits[:self.n + self.m - 1], dtype=np.float64), self.size)
+
+    # m output bits (0 / 1 array) from n input bits
+    def extract(self, bits):
+        convolution = np.fft.irfft(np.fft.rfft(np.asarray(bits, dtype=np.float64), self.size) * self.seed_fft,
+                                   self.size)
+        # y_i = sum_j seed[i + n - 1 - j] x_j is term i + n - 1 of the convolution
+        return (np.rint(convolution[self.n - 1:self.n - 1 + self.m]).astype(np.int64) & 1).astype(np.uint8)
+
+
+#######################################
+# Function: extractor_for_min_entropy #
+#######################################
+# Extractor for blocks of block_samples samples of bits_per_sample bits each holding
+# entropy_per_sample bits of min-entropy (seed bits from seed_file)
+def extractor_for_min_entropy(entropy_per_sample, block_samples=BLOCK_SAMPLES, bits_per_sample=10,
+                              security=SECURITY, seed_file=DEFAULT_SEED_FILE):
+    n = block_samples * bits_per_sample
+    m = int(math.floor(block_samples * entropy_per_sample)) - 2 * security
+    m -= m % 8
+    seed = load_seed(seed_file, n + max(m, 1) - 1)
+    return ToeplitzExtractor(seed, n, m)
+
+
+#######################
+# Function: load_seed #
+#######################
+# Seed bits from seed_file, which is created (or extended) from the OS random source
+# when it is missing or too short
+def load_seed(seed_file, nbits):
+    nbytes = (nbits + 7) // 8
+    data = b''
+    if os.path.exists(seed_file):
+        with open(seed_file, 'rb') as fp:
+            data = fp.read()
+    if len(data) < nbytes:
+        data += secrets.token_bytes(nbytes - len(data))
+        with open(seed_file, 'wb') as fp:
+            fp.write(data)
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8))[:nbits]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Toeplitz hash extractor for raw TrueRNG samples')
+    parser.add_argument('port', nargs='?', default=None, help='com port to read (default first TrueRNGpro / V2)')
+    parser.add_argument('--input', help='extract from this capture file instead of reading a device')
+    parser.add_argument('--format', choices=['raw_bin', 'raw_asc'], default='raw_bin')
+    parser.add_argument('--block-samples', type=int, default=BLOCK_SAMPLES, help='samples per block')
+    parser.add_argument('--security', type=int, default=SECURITY,
+                        help='output within 2^-SECURITY of uniform (default ' + str(SECURITY) + ')')
+    parser.add_argument('--min-entropy', type=float, default=None,
+                        help='bits of min-entropy per sample (default estimated from the first samples)')
+    parser.add_argument('--seed-file', default=DEFAULT_SEED_FILE, help='seed bits (created if missing)')
+    parser.add_argument('--bytes', type=int, default=1048576, help='output bytes (device only)')
+    parser.add_argument('--out', default='extracted.bin', help='output file')
+    args = parser.parse_args()
+
+    form = truerng_condition.FORMATS[args.format]
+    ser = None
+    fp_in = None
+    if args.input:
+        fp_in = open(args.input, 'rb')
+        read = fp_in.read
+    else:
+        from serial.tools import list_ports
+        port = args.port
+        if port is None:
+            for temp in list_ports.comports():
+                if '16D0:0AA0' in temp[2] or '04D8:EBB5' in temp[2]:
+                    port = temp[0]
+                    break
+        if port is None:
+            print('No TrueRNGpro or TrueRNGproV2 detected (the TrueRNG has no raw modes)')
+            sys.exit(1)
+        ser = truerng_device.open_port(port, 10, form['mode'])
+        read = ser.read
+
+    # Calibration samples (also extracted)
+    leftover = b''
+    samples = np.zeros(0, dtype=np.int64)
+    while len(samples) < truerng_condition.CALIBRATION_SAMPLES:
+        data = read(truerng_condition.READ_SIZE)
+        if not data:
+            break
+        new, leftover = truerng_condition.parse_samples(leftover + data, args.format)
+        samples = np.concatenate((samples, new))
+    entropy = args.min_entropy if args.min_entropy is not None else truerng_condition.min_entropy(samples, form['generators'])
+    try:
+        extractor = extractor_for_min_entropy(entropy, args.block_samples, form['bits'], args.security,
+                                              args.seed_file)
+    except ValueError as e:
+        print('*** FAILED *** ' + str(e))
+        sys.exit(1)
+
+    print('==================================================')
+    print('Toeplitz extraction of ' + (args.input or port) + ' (' + args.format + ')')
+    print('Min-entropy:    ' + '{:1.3f}'.format(entropy) + ' of ' + str(form['bits']) + ' bits per sample')
+    print('Block:          ' + str(extractor.n) + ' bits in, ' + str(extractor.m) + ' bits out (' +
+          '{:1.3f}'.format(extractor.m / float(extractor.n)) + '), FFT size ' + str(extractor.size))
+    print('Seed:           ' + args.seed_file)
+    print('==================================================')
+
+    block = args.block_samples
+    total_in = 0
+    total_out = 0
+    before = time.perf_counter()
+    with open(args.out, 'wb') as fp:
+        while True:
+            while len(samples) >= block and (args.input or total_out < args.bytes):
+                out = np.packbits(extractor.extract(sample_bits(samples[:block], form['bits']))).tobytes()
+                if not args.input:
+                    out = out[:args.bytes - total_out]
+                fp.write(out)
+                samples = samples[block:]
+                total_in += block
+                total_out += len(out)
+            if not args.input and total_out >= args.bytes:
+                break
+            data = read(truerng_condition.READ_SIZE)
+            if not data:
+                break
+            new, leftover = truerng_condition.parse_samples(leftover + data, args.format)
+            samples = np.concatenate((samples, new))
+    elapsed = time.perf_counter() - before
+
+    if ser is not None:
+        ser.close()
+    if fp_in is not None:
+        fp_in.close()
+    print(str(total_in) + ' samples -> ' + str(total_out) + ' bytes to ' + args.out + ' in ' +
+          '{:2.2f}'.format(elapsed) + ' seconds (' +
+          '{:2.0f}'.format(total_in / elapsed if elapsed else 0.0) + ' samples/s)')
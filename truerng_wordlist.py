@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+
+# TrueRNG Precompiled Wordlist
+# 10/19/2026
+#
+# Requires Python 3.8 (nltk only for building from the nltk corpus)
+#
+# Python 3.8.xx is available here: https://www.python.org/downloads/
+# Install nltk package with:   python -m pip install nltk
+#
+# Loading nltk.corpus.words.words() builds a list of 230k+ Python strings every run,
+# which takes much longer than generating the words.  This builds the filtered
+# wordlist once into a compact index file (offsets + text) that the generator memory
+# maps and indexes directly.
+#
+# Build from nltk (words of 3 to 9 letters):   python3 truerng_wordlist.py build
+# Build from a diceware / one word per line list (every word is kept unless
+# --min-length / --max-length are given, so the entropy per word stays exact):
+#                                               python3 truerng_wordlist.py build --source diceware.wordlist.asc -o diceware.idx
+# Show information about an index:              python3 truerng_wordlist.py info wordlist.idx
+#
+# File format (little endian):
+#   8 bytes  'TRNGWRD1'
+#   uint32   number of words (N)
+#   uint32   reserved (0)
+#   uint32   N+1 offsets into the text (relative to the start of the text)
+#   text     UTF-8 words back to back
+
+import argparse
+import mmap
+import os
+import re
+import struct
+import sys
+
+MAGIC = b'TRNGWRD1'
+HEADER = struct.Struct('<8sII')
+
+# Default index next to the scripts
+DEFAULT_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wordlist.idx')
+
+# Word lengths taken from the nltk corpus for truerng_generate_words.py
+DEFAULT_MIN_LENGTH = 3
+DEFAULT_MAX_LENGTH = 9
+
+# Diceware lines look like "11111	abacus"
+DICEWARE_LINE = re.compile(r'^\s*[1-6]{4,6}\s+(\S+)\s*$')
+
+
+###########################
+# Function: read_wordfile #
+###########################
+# Reads a diceware list (dice rolls and a word per line, PGP armor is skipped) or a
+# plain list with one word per line
+def read_wordfile(path):
+    with open(path, encoding='utf-8', errors='replace') as fp:
+        lines = fp.read().splitlines()
+    lines = [line.strip() for line in lines if line.strip()]
+    dice = [m.group(1) for m in (DICEWARE_LINE.match(line) for line in lines) if m]
+    if dice and len(dice) >= len(lines) // 2:
+        return dice
+    return [line for line in lines if not line.startswith('#')]
+
+
+def read_nltk_words():
+    import nltk
+    return nltk.corpus.words.words()
+
+
+#########################
+# Function: build_index #
+#########################
+# Writes the words (duplicates removed, and filtered by length if min_length or
+# max_length is given) to an index file and returns the number of words written
+def build_index(words, path, min_length=None, max_length=None):
+    min_length = min_length or 0
+    max_length = max_length or float('inf')
+    seen = set()
+    selected = []
+    for word in words:
+        if min_length <= len(word) <= max_length and word not in seen:
+            seen.add(word)
+            selected.append(word)
+
+    text = b''.join(word.encode('utf-8') for word in selected)
+    offsets = [0]
+    for word in selected:
+        offsets.append(offsets[-1] + len(word.encode('utf-8')))
+
+    # Write to a temporary name first so a running generator never sees half a file
+    temp = path + '.tmp'
+    with open(temp, 'wb') as fp:
+        fp.write(HEADER.pack(MAGIC, len(selected), 0))
+        fp.write(struct.pack('<' + str(len(offsets)) + 'I', *offsets))
+        fp.write(text)
+    os.replace(temp, path)
+    return len(selected)
+
+
+###################
+# Class: Wordlist #
+###################
+# Read only, memory mapped view of an index file.  Nothing is parsed up front so
+# opening it costs the same for 7,776 or 230,000 words.
+class Wordlist:
+    def __init__(self, path=DEFAULT_INDEX):
+        self.fp = open(path, 'rb')
+        self.map = mmap.mmap(self.fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, _ = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(path + ' is not a TrueRNG wordlist index')
+        self.offsets = HEADER.size
+        self.text = HEADER.size + 4 * (self.count + 1)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if index < 0 or index >= self.count:
+            raise IndexError('word index out of range')
+        start, end = struct.unpack_from('<II', self.map, self.offsets + 4 * index)
+        return self.map[self.text + start:self.text + end].decode('utf-8')
+
+    def close(self):
+        self.map.close()
+        self.fp.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build or inspect a precompiled wordlist index')
+    sub = parser.add_subparsers(dest='command')
+    build = sub.add_parser('build', help='build an index file')
+    build.add_argument('--source', default='nltk',
+                       help='"nltk" (default) or a diceware / one word per line file')
+    build.add_argument('-o', '--output', default=DEFAULT_INDEX)
+    build.add_argument('--min-length', type=int, default=None,
+                       help='shortest word to keep (default ' + str(DEFAULT_MIN_LENGTH) + ' for nltk, none for a file)')
+    build.add_argument('--max-length', type=int, default=None,
+                       help='longest word to keep (default ' + str(DEFAULT_MAX_LENGTH) + ' for nltk, none for a file)')
+    info = sub.add_parser('info', help='show the size of an index file')
+    info.add_argument('index', nargs='?', default=DEFAULT_INDEX)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        min_length, max_length = args.min_length, args.max_length
+        if args.source == 'nltk':
+            words = read_nltk_words()
+            min_length = min_length or DEFAULT_MIN_LENGTH
+            max_length = max_length or DEFAULT_MAX_LENGTH
+        else:
+            words = read_wordfile(args.source)
+        count = build_index(words, args.output, min_length, max_length)
+        print('Wrote ' + str(count) + ' words to ' + args.output +
+              ' (' + str(os.path.getsize(args.output)) + ' bytes)')
+        if count < len(words):
+            print('Dropped ' + str(len(words) - count) + ' of ' + str(len(words)) +
+                  ' source words (duplicates or outside the length limits)')
+    elif args.command == 'info':
+        wordlist = Wordlist(args.index)
+        print(args.index + ': ' + str(len(wordlist)) + ' words')
+        if len(wordlist):
+            print('First: ' + wordlist[0] + '  Last: ' + wordlist[-1])
+        wordlist.close()
+    else:
+        parser.print_help()
+        sys.exit(1)